@@ -0,0 +1,61 @@
+"""
+Caption download time of the two fetch modes of get_transcript: "file",
+where yt-dlp writes the track to a scratch directory that is read back,
+and "memory", where the track is read from its URL in yt-dlp's info dict.
+
+Calls the fetchers directly, so neither the transcript cache nor the
+worker pool is involved. Needs network access; run from the repository
+root with the app's environment (.env):
+
+    python benchmarks/caption_fetch.py https://youtu.be/aircAruvnKk --repeat 5
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.tools.youtube_transcriber.captions import parse_captions  # noqa: E402
+from src.tools.youtube_transcriber.transcriber import CAPTION_FETCHERS  # noqa: E402
+
+
+def measure(fetch, video_url: str, language: str, repeat: int):
+    """Median seconds per fetch and the captions of the last one."""
+    samples, captions = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        captions = fetch(video_url, language)
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples), captions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("videos", nargs="+", help="YouTube video URLs")
+    parser.add_argument("--language", default="en")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'video':14} {'mode':7} {'median':>9} {'KiB':>7} {'segments':>9}")
+    for video_url in args.videos:
+        results = {}
+        for mode, fetch in CAPTION_FETCHERS.items():
+            results[mode] = measure(fetch, video_url, args.language, args.repeat)
+            seconds, captions = results[mode]
+            if captions is None:
+                print(f"{video_url[-11:]:14} {mode:7} {'no captions':>9}")
+                continue
+            print(
+                f"{video_url[-11:]:14} {mode:7} {seconds * 1000:7.0f}ms "
+                f"{len(captions.encode()) / 1024:7.0f} "
+                f"{len(parse_captions(captions)):9d}"
+            )
+        (file_seconds, _), (memory_seconds, _) = results["file"], results["memory"]
+        print(f"{'':14} memory speedup {file_seconds / memory_seconds:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
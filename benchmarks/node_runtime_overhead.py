@@ -0,0 +1,135 @@
+"""
+Per-invocation overhead of preparing the chat nodes' chains: building the
+prompt, chain or agent executor on every call, as the nodes used to, versus
+taking it from the node runtime compiled once with the graph.
+
+Only the preparation is timed; no LLM is called. Run from the repository
+root with the app's environment (.env):
+
+    python benchmarks/node_runtime_overhead.py --iterations 2000
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+from langchain.agents import AgentExecutor, create_tool_calling_agent  # noqa: E402
+from langchain_core.output_parsers import JsonOutputParser  # noqa: E402
+from langchain_core.output_parsers import StrOutputParser  # noqa: E402
+from langchain_core.prompts import ChatPromptTemplate  # noqa: E402
+from src.domain.chat import prompts  # noqa: E402
+from src.domain.chat.runtime import RESPONSE_MODEL, NodeRuntime  # noqa: E402
+from src.services.llm.client_pool import get_chat_model  # noqa: E402
+
+ROLES = {
+    "SystemMessagePromptTemplate": "system",
+    "HumanMessagePromptTemplate": "user",
+    "AIMessagePromptTemplate": "assistant",
+}
+RESPONSE_SECTIONS = ("history", "yt_scraped_data")
+
+
+def raw_messages(prompt: ChatPromptTemplate) -> list[tuple[str, str]]:
+    """The ``(role, template)`` pairs a node used to build ``prompt`` from."""
+    return [
+        (ROLES[type(message).__name__], message.prompt.template)
+        for message in prompt.messages
+    ]
+
+
+def per_call_json_chain(messages, model: str):
+    prompt = ChatPromptTemplate.from_messages(messages)
+    return prompt | get_chat_model(model) | JsonOutputParser()
+
+
+def per_call_response_chain():
+    system_prompt = prompts.RESPONSE_SYSTEM_PROMPT
+    for name in RESPONSE_SECTIONS:
+        system_prompt += prompts.RESPONSE_SECTION_PROMPTS[name]
+    prompt = ChatPromptTemplate.from_messages(
+        [("system", system_prompt), ("user", "{query}")]
+    )
+    return prompt | get_chat_model(RESPONSE_MODEL, streaming=True) | StrOutputParser()
+
+
+def per_call_scheduler(messages):
+    llm = get_chat_model("gpt-4o", temperature=0)
+    agent = create_tool_calling_agent(
+        llm, [], ChatPromptTemplate.from_messages(messages)
+    )
+    return AgentExecutor(
+        agent=agent,
+        tools=[],
+        verbose=True,
+        max_iterations=3,
+        early_stopping_method="force",
+        handle_parsing_errors=True,
+        max_execution_time=30,
+    )
+
+
+def measure(build, iterations: int) -> list[float]:
+    """Microseconds per call of ``build``, after a short warm-up."""
+    for _ in range(min(iterations // 10, 100)):
+        build()
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        build()
+        samples.append((time.perf_counter() - started) * 1e6)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    runtime = NodeRuntime()
+    compile_ms = (time.perf_counter() - started) * 1000
+    if runtime.scheduler_executor is None:
+        # The scheduled-action tools are not available in every checkout;
+        # time the agent without tools instead.
+        runtime.scheduler_executor = per_call_scheduler(
+            raw_messages(prompts.SCHEDULED_ACTION_PROMPT)
+        ).model_copy(update={"verbose": False})
+
+    intent_messages = raw_messages(prompts.INTENT_PROMPT)
+    scheduler_messages = raw_messages(prompts.SCHEDULED_ACTION_PROMPT)
+    cases = [
+        (
+            "intent chain (user_node)",
+            lambda: per_call_json_chain(intent_messages, "gpt-4o-mini"),
+            lambda: runtime.intent_chain,
+        ),
+        (
+            "answer chain (response_node)",
+            per_call_response_chain,
+            lambda: runtime.response_chain(RESPONSE_SECTIONS),
+        ),
+        (
+            "agent executor (scheduler_node)",
+            lambda: per_call_scheduler(scheduler_messages),
+            lambda: runtime.scheduler_agent(30),
+        ),
+    ]
+
+    print(f"Node runtime compiled in {compile_ms:.1f} ms (once per process)\n")
+    print(f"{'case':34} {'per call':>12} {'compiled':>12} {'speedup':>9}")
+    for name, before, after in cases:
+        per_call = statistics.median(measure(before, args.iterations))
+        compiled = statistics.median(measure(after, args.iterations))
+        print(
+            f"{name:34} {per_call:10.1f}us {compiled:10.1f}us "
+            f"{per_call / max(compiled, 1e-3):8.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Token volume and parse time of lecture transcripts: the raw SRT that used
+to go into prompts versus the compact renderings of the parsed segments,
+and the streaming caption parser versus the block-splitting parser it
+replaced.
+
+Without arguments a synthetic lecture in the style of YouTube's rolling
+auto-generated captions is used; pass .srt or .vtt files to measure real
+ones. Run from the repository root with the app's environment (.env):
+
+    python benchmarks/transcript_parsing.py --minutes 120
+    python benchmarks/transcript_parsing.py captions/*.srt
+"""
+
+import argparse
+import os
+import random
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.configs import LECTURE_CHUNK_CHARS  # noqa: E402
+from src.tools.context_assembler.tokens import count_tokens  # noqa: E402
+from src.tools.youtube_transcriber.captions import (  # noqa: E402
+    Cue,
+    chunk_segments,
+    coarse_timestamps,
+    format_timestamp,
+    parse_captions,
+    plain_text,
+    render_chunks,
+)
+
+WORDS = (
+    "the gradient of a function points in the direction of steepest ascent so "
+    "we step against it with a learning rate that controls how far each update "
+    "moves the parameters and if it is too large training diverges while a "
+    "small one converges slowly which is why schedules decay it over epochs"
+).split()
+
+_TIMING = re.compile(
+    r"(\d+):(\d{2}):(\d{2})[,.](\d{3})\s*-->\s*(\d+):(\d{2}):(\d{2})[,.](\d{3})"
+)
+_TAG = re.compile(r"<[^>]+>")
+
+
+def block_parser(srt: str) -> list[Cue]:
+    """The caption parser before the streaming one, for comparison."""
+
+    def seconds(hours, minutes, secs, millis):
+        return int(hours) * 3600 + int(minutes) * 60 + int(secs) + int(millis) / 1000
+
+    cues = []
+    last_line = None
+    for block in re.split(r"\n\s*\n", srt.replace("\r\n", "\n")):
+        lines = block.strip().split("\n")
+        timing = next((m for m in map(_TIMING.search, lines[:2]) if m), None)
+        if timing is None:
+            continue
+        kept = []
+        for line in lines[lines.index(timing.string) + 1 :]:
+            line = _TAG.sub("", line).strip()
+            if line and line != last_line:
+                kept.append(line)
+                last_line = line
+        if kept:
+            groups = timing.groups()
+            cues.append(Cue(seconds(*groups[:4]), seconds(*groups[4:]), " ".join(kept)))
+    return cues
+
+
+def srt_time(value: float) -> str:
+    millis = round(value * 1000)
+    hours, millis = divmod(millis, 3_600_000)
+    minutes, millis = divmod(millis, 60_000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
+
+
+def synthetic_lecture(minutes: int, seed: int = 7) -> str:
+    """
+    Rolling auto-captions: every cue shows the previous line above the new
+    one, followed by a 10 ms cue holding just the new line.
+    """
+    rng = random.Random(seed)
+    blocks, previous, now, number = [], "", 0.0, 1
+    while now < minutes * 60:
+        line = " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 10)))
+        duration = rng.uniform(2.0, 3.5)
+        text = f"{previous}\n{line}" if previous else line
+        blocks.append(
+            f"{number}\n{srt_time(now)} --> {srt_time(now + duration)}\n{text}"
+        )
+        blocks.append(
+            f"{number + 1}\n{srt_time(now + duration)} --> "
+            f"{srt_time(now + duration + 0.01)}\n{line}"
+        )
+        previous, now, number = line, now + duration + 0.01, number + 2
+    return "\n\n".join(blocks) + "\n"
+
+
+def median_ms(parse, text: str, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        parse(text)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def retained_kib(build) -> float:
+    """Memory still held by the result of ``build()``."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()  # noqa: F841
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / 1024
+
+
+def report(name: str, captions: str, repeat: int):
+    segments = parse_captions(captions)
+    duration = format_timestamp(segments.ends[-1]) if len(segments) else "0:00"
+    renderings = {
+        "raw captions": captions,
+        "plain text": plain_text(segments),
+        "coarse timestamps (60s)": coarse_timestamps(segments),
+        "timestamped chunks": render_chunks(
+            chunk_segments(segments, LECTURE_CHUNK_CHARS)
+        ),
+    }
+    print(
+        f"\n{name}: {len(captions) / 1024:.0f} KiB, {duration}, "
+        f"{len(segments)} segments"
+    )
+
+    raw_tokens = count_tokens(captions)
+    print(f"  {'rendering':26} {'tokens':>9} {'vs raw':>8}")
+    for rendering, text in renderings.items():
+        tokens = count_tokens(text)
+        print(f"  {rendering:26} {tokens:9d} {tokens / max(raw_tokens, 1):7.0%}")
+
+    before = median_ms(block_parser, captions, repeat)
+    after = median_ms(parse_captions, captions, repeat)
+    print(f"  {'parser':26} {'median':>9}")
+    print(f"  {'block parser (before)':26} {before:7.1f}ms")
+    speedup = before / max(after, 1e-6)
+    print(f"  {'streaming parser':26} {after:7.1f}ms  ({speedup:.1f}x)")
+
+    print(f"  {'parsed storage':26} {'KiB':>9}")
+    cues = retained_kib(lambda: block_parser(captions))
+    arrays = retained_kib(lambda: parse_captions(captions))
+    print(f"  {'cue objects (before)':26} {cues:9.0f}")
+    print(f"  {'segment arrays':26} {arrays:9.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("files", nargs="*", help=".srt or .vtt caption files")
+    parser.add_argument("--minutes", type=int, default=90)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    if not args.files:
+        report(
+            f"synthetic {args.minutes} min lecture",
+            synthetic_lecture(args.minutes),
+            args.repeat,
+        )
+    for path in args.files:
+        with open(path, "r", encoding="utf-8") as f:
+            report(os.path.basename(path), f.read(), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,9 @@ from dotenv import load_dotenv
 import firebase_admin
 from firebase_admin import credentials, firestore
 from fastapi.middleware.cors import CORSMiddleware
+from src.services.llm.client_pool import warm_llm_pool, close_llm_pool
+from src.services.conversation.store import close_conversation_store
+from src.tools.youtube_transcriber.worker_pool import close_ytdlp_pool
 
 load_dotenv()
 
@@ -14,6 +17,8 @@ db_user = None
 db_teacher = None
 teacher_store = None
 lecture_store = None
+response_cache = None
+lecture_chunk_store = None
 user_store = None
 chat_graph = None
 desc_graph = None
@@ -22,6 +27,7 @@ desc_graph = None
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     global db_user, db_teacher, teacher_store, lecture_store, user_store, chat_graph, desc_graph
+    global response_cache, lecture_chunk_store
 
     try:
         try:
@@ -38,14 +44,19 @@ async def lifespan(app: FastAPI):
         teacher_store = await setup_teacher_store()
         user_store = await setup_user_store()
         lecture_store = await setup_lecture_store()
+        response_cache = await setup_response_cache()
+        lecture_chunk_store = await setup_lecture_chunk_store()
         chat_graph = await get_chat_graph()
         desc_graph = await get_desc_graph()
+        await warm_llm_pool()
 
         yield
     except Exception as e:
         raise e
     finally:
-        pass
+        await close_llm_pool()
+        await close_conversation_store()
+        close_ytdlp_pool()
 
 
 # FastAPI application
@@ -66,7 +77,7 @@ app.add_middleware(
 )
 
 
-for router in [auth.router, teachers.router, chat.router]:
+for router in [auth.router, teachers.router, chat.router, metrics.router]:
     app.include_router(router)
 
 if __name__ == "__main__":
@@ -1,8 +1,10 @@
 from src.core.utility.logging_utils import get_logger
 from src.core.configs import *
-from src.app.routers.v1 import auth, teachers, chat
+from src.app.routers.v1 import auth, teachers, chat, metrics
 from src.services.qdrant.setup_qdrant import setup_teacher_store, setup_user_store
 from src.services.qdrant.setup_qdrant import setup_lecture_store
+from src.services.qdrant.setup_qdrant import setup_response_cache
+from src.services.qdrant.setup_qdrant import setup_lecture_chunk_store
 from src.domain.chat.graph import get_chat_graph
 from src.domain.desc_agent.graph import get_desc_graph
 
@@ -10,6 +12,7 @@ __all__ = [
     "auth",
     "teachers",
     "chat",
+    "metrics",
     "CREDENTIALS",
     "USER_DATABASE_NAME",
     "TEACHER_DATABASE_NAME",
@@ -17,6 +20,8 @@ __all__ = [
     "setup_teacher_store",
     "setup_user_store",
     "setup_lecture_store",
+    "setup_response_cache",
+    "setup_lecture_chunk_store",
     "get_chat_graph",
     "get_desc_graph",
 ]
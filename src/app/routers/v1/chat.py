@@ -1,50 +1,182 @@
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Request,
+    WebSocket,
+    status,
+)
 from fastapi.responses import StreamingResponse
 from src.core.utility.logging_utils import get_logger
+from src.model.routes.chat_models import ChatRequest
 from src.tools.chat_runner.runner import run_graph
-from src.services.auth.verify_token import verify_token
-from pydantic import BaseModel
+from src.tools.chat_runner.run_context import RunContext
+from src.tools.chat_runner.admission import (
+    AdmissionRejected,
+    admission_controller,
+    release_when_done,
+)
+from src.tools.chat_runner.stream_registry import (
+    RunStream,
+    stream_registry,
+    parse_event_id,
+    singleflight_key,
+)
+from src.tools.chat_runner.ws_session import ChatSocketSession
+from src.services.auth.verify_token import decode_token, verify_token
+from src.services.conversation.history import conversation_id_for, load_history
 
 logger = get_logger(__name__)
 
 router = APIRouter(tags=["Chat"])
 
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "Content-Type": "text/event-stream",
+    "X-Accel-Buffering": "no",
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Headers": "Content-Type, Last-Event-ID",
+    "Access-Control-Expose-Headers": "X-Run-ID",
+    "Transfer-Encoding": "chunked",
+}
 
-class ChatRequest(BaseModel):
-    query: str
-    video_url: Optional[str] = None
-    lecture_id: Optional[str] = None
+
+def follow_run(run: RunStream, request: Request, after_seq: int = 0):
+    """Stream a run's frames after ``after_seq`` as an SSE response."""
+    return StreamingResponse(
+        run.subscribe(after_seq=after_seq, is_disconnected=request.is_disconnected),
+        media_type="text/event-stream",
+        headers={**SSE_HEADERS, "X-Run-ID": run.run_id},
+    )
 
 
 @router.post("/chat")
 async def chat(
+    request: Request,
     chat_request: ChatRequest,
     token_data: dict = Depends(verify_token),
+    last_event_id: Optional[str] = Header(None),
 ):
-    """Chat with the chat bot"""
+    """
+    Chat with the chat bot.
+
+    Every frame carries an ``id: <run_id>:<seq>`` line. Sending that id back
+    as ``Last-Event-ID`` reattaches to the same run (still running or
+    recently finished) and replays the frames after it instead of running
+    the graph again. A run with no attached client is cancelled after a
+    short grace period.
+
+    Identical lecture chats (same lecture and normalized query, no earlier
+    turns in the conversation) share a single run: later requests subscribe to the
+    running one, or replay it shortly after it finished. New runs go through
+    admission control and get a 429 with Retry-After when the user is at
+    their concurrency cap or the run queue is full.
+    """
     user_id = token_data.get("sub")
     user_type = token_data.get("user_type")
+
+    if last_event_id:
+        parsed = parse_event_id(last_event_id)
+        run = stream_registry.get(parsed[0]) if parsed else None
+        if run is not None and user_id in run.user_ids:
+            logger.info(f"Resuming run {run.run_id} after event {parsed[1]}")
+            return follow_run(run, request, after_seq=parsed[1])
+        logger.info(f"Cannot resume from {last_event_id!r}, starting a new run")
+
+    conversation_id = conversation_id_for(
+        user_id, chat_request.lecture_id, chat_request.video_url
+    )
+    try:
+        history = await load_history(conversation_id)
+    except Exception as e:
+        logger.warning(f"Could not load history for {conversation_id}: {e}")
+        history = ""
+
+    flight_key = singleflight_key(
+        user_type,
+        chat_request.query,
+        lecture_id=chat_request.lecture_id,
+        video_url=chat_request.video_url,
+        history=history,
+    )
+    run = stream_registry.join_flight(flight_key, user_id)
+    if run is not None:
+        return follow_run(run, request)
+
+    try:
+        ticket = await admission_controller.acquire(user_id)
+    except AdmissionRejected as e:
+        logger.warning(f"Chat rejected for user {user_id}: {e.reason}")
+        raise HTTPException(
+            status_code=429,
+            detail=f"Too many chat requests ({e.reason})",
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
+    # An identical run may have started while this one was queued.
+    run = stream_registry.join_flight(flight_key, user_id)
+    if run is not None:
+        ticket.release()
+        return follow_run(run, request)
+
     try:
-        return StreamingResponse(
-            run_graph(
-                user_id=user_id,
-                query=chat_request.query,
-                lecture_id=chat_request.lecture_id,
-                video_url=chat_request.video_url,
-                user_type=user_type,
+        run_context = RunContext()
+        run = stream_registry.start(
+            release_when_done(
+                run_graph(
+                    user_id=user_id,
+                    query=chat_request.query,
+                    lecture_id=chat_request.lecture_id,
+                    video_url=chat_request.video_url,
+                    user_type=user_type,
+                    run_context=run_context,
+                    history=history,
+                ),
+                ticket,
             ),
-            media_type="text/event-stream",
-            headers={
-                "Cache-Control": "no-cache",
-                "Connection": "keep-alive",
-                "Content-Type": "text/event-stream",
-                "X-Accel-Buffering": "no",
-                "Access-Control-Allow-Origin": "*",
-                "Access-Control-Allow-Headers": "Content-Type",
-                "Transfer-Encoding": "chunked",
-            },
+            user_id=user_id,
+            run_context=run_context,
+            flight_key=flight_key,
         )
+        return follow_run(run, request)
     except Exception as e:
+        ticket.release()
         logger.error(f"Error chatting: {e}")
         raise HTTPException(status_code=500, detail=f"Error chatting: {e}")
+
+
+@router.websocket("/ws/chat")
+async def chat_socket(
+    websocket: WebSocket,
+    token: Optional[str] = None,
+    device_id: str = "default",
+):
+    """
+    Chat over a single authenticated WebSocket.
+
+    The token is checked once, from the ``token`` query parameter or the
+    Authorization header. Clients send ``{"type": "chat", "request_id", "query",
+    ...}`` to start a stream and ``{"type": "cancel", "request_id"}`` to stop
+    one; several streams can run at once. A newer connection from the same
+    ``device_id`` replaces the older one.
+    """
+    try:
+        token_data = decode_token(token or websocket.headers.get("authorization"))
+    except HTTPException as e:
+        # Close reasons are limited to 123 bytes
+        await websocket.close(
+            code=status.WS_1008_POLICY_VIOLATION, reason=str(e.detail)[:120]
+        )
+        return
+
+    await websocket.accept()
+    session = ChatSocketSession(
+        websocket,
+        user_id=token_data.get("sub"),
+        user_type=token_data.get("user_type"),
+        device_id=device_id,
+    )
+    await session.serve()
@@ -0,0 +1,18 @@
+from typing import Optional
+from fastapi import APIRouter, Depends
+from src.core.utility.metrics import metrics
+from src.services.auth.verify_token import verify_token
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get("/metrics")
+async def get_metrics(
+    prefix: Optional[str] = None,
+    token_data: dict = Depends(verify_token),
+):
+    """Get a snapshot of the in-process metrics"""
+    return {
+        "message": "Metrics fetched successfully",
+        "metrics": metrics.snapshot(prefix),
+    }
@@ -6,6 +6,8 @@ from src.services.qdrant.course import add_course_to_qdrant
 from src.models.desc_agent.descstate import DESCSTATE
 from src.services.qdrant.course import add_lecture_to_qdrant
 from src.services.qdrant.course import get_courses_from_qdrant
+from src.services.qdrant.course import get_course_payload, get_lecture_payload
+from src.domain.lecture.ingestion import schedule_lecture_ingestion
 
 logger = get_logger(__name__)
 
@@ -71,21 +73,56 @@ async def create_lecture(
     user_type = token_data.get("user_type")
     if user_type != "teacher":
         raise HTTPException(status_code=403, detail="Forbidden")
-    teacher_id = token_data.get("sub")
 
     lecture_id = await add_lecture_to_qdrant(
         lecture_title=lecture_title,
         lecture_description=lecture_description,
         lecture_video_url=lecture_video_url,
         course_id=course_id,
-        teacher_id=teacher_id,
     )
+    # Transcript and quiz bank are prepared in the background
+    schedule_lecture_ingestion(lecture_id, lecture_video_url)
     return {
         "message": "Lecture created successfully",
         "lecture_id": lecture_id,
     }
 
 
+@router.post("/regenerate-quiz-bank")
+async def regenerate_quiz_bank(
+    lecture_id: str,
+    token_data: dict = Depends(verify_token),
+):
+    """Re-run a lecture's ingestion (quiz bank, chunks, digest) in the background"""
+    from main import response_cache
+
+    user_type = token_data.get("user_type")
+    if user_type != "teacher":
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+    lecture = await get_lecture_payload(lecture_id)
+    if lecture is None:
+        raise HTTPException(status_code=404, detail=f"Lecture {lecture_id} not found")
+    course = await get_course_payload(lecture["metadata"]["course_id"])
+    if course is None or course["metadata"].get("teacher_id") != token_data.get("sub"):
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+    if response_cache is not None:
+        try:
+            await response_cache.invalidate_lecture(lecture_id)
+        except Exception as e:
+            logger.warning(f"Could not invalidate cached answers of {lecture_id}: {e}")
+    scheduled = schedule_lecture_ingestion(lecture_id)
+    return {
+        "message": (
+            "Quiz bank regeneration started"
+            if scheduled
+            else "Quiz bank is already being generated"
+        ),
+        "lecture_id": lecture_id,
+    }
+
+
 @router.get("/get-courses")
 async def get_courses(token_data: dict = Depends(verify_token)):
     """Get all courses"""
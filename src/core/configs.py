@@ -27,3 +27,144 @@ GOOGLE_REDIRECT_URI = os.getenv("GOOGLE_REDIRECT_URI")
 CALENDAR_SCOPES = [
     "https://www.googleapis.com/auth/calendar",
 ]
+
+# Chat streaming
+STREAM_COALESCE_WINDOW_MS = float(os.getenv("STREAM_COALESCE_WINDOW_MS", "20"))
+STREAM_COALESCE_MAX_BYTES = int(os.getenv("STREAM_COALESCE_MAX_BYTES", "256"))
+
+# Resumable chat streams (Last-Event-ID replay)
+CHAT_STREAM_BUFFER_FRAMES = int(os.getenv("CHAT_STREAM_BUFFER_FRAMES", "2048"))
+CHAT_STREAM_RETENTION_SECONDS = float(os.getenv("CHAT_STREAM_RETENTION_SECONDS", "300"))
+
+# Chat run cancellation on client disconnect
+CHAT_DISCONNECT_GRACE_SECONDS = float(os.getenv("CHAT_DISCONNECT_GRACE_SECONDS", "10"))
+CHAT_DISCONNECT_POLL_SECONDS = float(os.getenv("CHAT_DISCONNECT_POLL_SECONDS", "1"))
+# Rough completion size of a chat answer, used to estimate tokens saved on cancel
+CHAT_EXPECTED_COMPLETION_TOKENS = int(os.getenv("CHAT_EXPECTED_COMPLETION_TOKENS", "600"))
+
+# End-to-end time budget of a chat run. Each node may use its share of
+# the time left when it starts (1.0 for nodes not listed) and degrades,
+# e.g. answers without the transcript, once that runs out
+CHAT_DEADLINE_SECONDS = float(os.getenv("CHAT_DEADLINE_SECONDS", "45"))
+CHAT_NODE_TIME_SLICES = json.loads(
+    os.getenv(
+        "CHAT_NODE_TIME_SLICES",
+        '{"user_node": 0.2, "teacher_node": 0.2, "course_scrapper_node": 0.4, '
+        '"course_planner_node": 0.6, "scheduler_node": 0.8, "calendar_node": 0.8}',
+    )
+)
+
+# WebSocket chat transport
+WS_CHAT_MAX_STREAMS = int(os.getenv("WS_CHAT_MAX_STREAMS", "8"))
+WS_CHAT_OUTBOX_SIZE = int(os.getenv("WS_CHAT_OUTBOX_SIZE", "256"))
+
+# Chat admission control
+CHAT_MAX_CONCURRENT_RUNS = int(os.getenv("CHAT_MAX_CONCURRENT_RUNS", "32"))
+CHAT_MAX_QUEUED_RUNS = int(os.getenv("CHAT_MAX_QUEUED_RUNS", "64"))
+CHAT_QUEUE_MAX_WAIT_SECONDS = float(os.getenv("CHAT_QUEUE_MAX_WAIT_SECONDS", "10"))
+CHAT_MAX_RUNS_PER_USER = int(os.getenv("CHAT_MAX_RUNS_PER_USER", "3"))
+CHAT_RETRY_AFTER_SECONDS = int(os.getenv("CHAT_RETRY_AFTER_SECONDS", "5"))
+# How long a finished lecture chat can be replayed to identical requests
+CHAT_SINGLEFLIGHT_REPLAY_SECONDS = float(os.getenv("CHAT_SINGLEFLIGHT_REPLAY_SECONDS", "30"))
+
+# Shared LLM HTTP connection pool
+LLM_POOL_MAX_CONNECTIONS = int(os.getenv("LLM_POOL_MAX_CONNECTIONS", "64"))
+LLM_POOL_MAX_KEEPALIVE = int(os.getenv("LLM_POOL_MAX_KEEPALIVE", "32"))
+LLM_POOL_KEEPALIVE_EXPIRY = float(os.getenv("LLM_POOL_KEEPALIVE_EXPIRY", "120"))
+LLM_POOL_PREWARM_CONNECTIONS = int(os.getenv("LLM_POOL_PREWARM_CONNECTIONS", "4"))
+LLM_HTTP_TIMEOUT = float(os.getenv("LLM_HTTP_TIMEOUT", "120"))
+
+# Local intent classifier (user_node fast path)
+INTENT_MODEL_PATH = os.getenv("INTENT_MODEL_PATH", "intent_model.json")
+INTENT_LOG_PATH = os.getenv("INTENT_LOG_PATH", "intent_log.jsonl")
+INTENT_LOG_MAX_BYTES = int(os.getenv("INTENT_LOG_MAX_BYTES", str(16 * 1024 * 1024)))
+INTENT_CONFIDENCE_THRESHOLD = float(os.getenv("INTENT_CONFIDENCE_THRESHOLD", "0.8"))
+INTENT_SHADOW_SAMPLE_RATE = float(os.getenv("INTENT_SHADOW_SAMPLE_RATE", "0.05"))
+
+# Speculative response generation: routing nodes allowed to start
+# response_node's answer while they are still classifying
+SPECULATIVE_ROUTES = {
+    route.strip()
+    for route in os.getenv("SPECULATIVE_ROUTES", "user_node,teacher_node").split(",")
+    if route.strip()
+}
+
+# Conversation history: storage backend ("sqlite" or "redis") and the
+# window of past turns fed back into prompts
+CONVERSATION_BACKEND = os.getenv("CONVERSATION_BACKEND", "sqlite")
+CONVERSATION_SQLITE_PATH = os.getenv("CONVERSATION_SQLITE_PATH", "conversations.db")
+CONVERSATION_REDIS_URL = os.getenv("CONVERSATION_REDIS_URL", "redis://localhost:6379/0")
+CONVERSATION_WINDOW_TURNS = int(os.getenv("CONVERSATION_WINDOW_TURNS", "6"))
+CONVERSATION_TURN_MAX_CHARS = int(os.getenv("CONVERSATION_TURN_MAX_CHARS", "1500"))
+CONVERSATION_SUMMARY_MAX_WORDS = int(os.getenv("CONVERSATION_SUMMARY_MAX_WORDS", "200"))
+
+# Course planner research deadlines, in seconds from the start of the
+# fan-out; sources that are not ready by then are dropped
+COURSE_PLANNER_TOPIC_TIMEOUT = float(os.getenv("COURSE_PLANNER_TOPIC_TIMEOUT", "6"))
+COURSE_PLANNER_WEB_TIMEOUT = float(os.getenv("COURSE_PLANNER_WEB_TIMEOUT", "8"))
+COURSE_PLANNER_YOUTUBE_TIMEOUT = float(os.getenv("COURSE_PLANNER_YOUTUBE_TIMEOUT", "10"))
+COURSE_PLANNER_TRANSCRIPT_TIMEOUT = float(
+    os.getenv("COURSE_PLANNER_TRANSCRIPT_TIMEOUT", "15")
+)
+# Share of course_planner_node's time slice research may use, the rest is
+# left for generating the plan
+COURSE_PLANNER_RESEARCH_SHARE = float(os.getenv("COURSE_PLANNER_RESEARCH_SHARE", "0.5"))
+
+# Semantic response cache in front of response_node
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+RESPONSE_CACHE_COLLECTION_NAME = "response_cache"
+RESPONSE_CACHE_THRESHOLD = float(os.getenv("RESPONSE_CACHE_THRESHOLD", "0.93"))
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "604800"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "50000"))
+RESPONSE_CACHE_SWEEP_EVERY = int(os.getenv("RESPONSE_CACHE_SWEEP_EVERY", "100"))
+RESPONSE_CACHE_REPLAY_CHARS = int(os.getenv("RESPONSE_CACHE_REPLAY_CHARS", "32"))
+
+# Study plan cache (per normalized topic and level): plans are fresh for
+# the TTL, then served stale while a background refresh runs
+STUDY_PLAN_CACHE_TTL_SECONDS = float(os.getenv("STUDY_PLAN_CACHE_TTL_SECONDS", "21600"))
+STUDY_PLAN_CACHE_STALE_SECONDS = float(
+    os.getenv("STUDY_PLAN_CACHE_STALE_SECONDS", "604800")
+)
+STUDY_PLAN_CACHE_MAX_ENTRIES = int(os.getenv("STUDY_PLAN_CACHE_MAX_ENTRIES", "512"))
+
+# Per-lecture quiz bank generated at ingestion; quiz requests sample from it
+QUIZ_BANK_SIZE = int(os.getenv("QUIZ_BANK_SIZE", "20"))
+QUIZ_SAMPLE_SIZE = int(os.getenv("QUIZ_SAMPLE_SIZE", "5"))
+
+# Token budget for the context (history, lecture, search results, course
+# plan) response_node puts in its prompt, per model
+RESPONSE_CONTEXT_BUDGETS = json.loads(
+    os.getenv("RESPONSE_CONTEXT_BUDGETS", '{"gpt-4o": 6000, "default": 4000}')
+)
+
+# Timestamped transcript chunks embedded at lecture ingestion; lecture
+# questions retrieve the top-k instead of sending the whole transcript
+LECTURE_CHUNK_COLLECTION_NAME = "lecture_chunks"
+LECTURE_CHUNK_CHARS = int(os.getenv("LECTURE_CHUNK_CHARS", "1200"))
+LECTURE_CHUNK_TOP_K = int(os.getenv("LECTURE_CHUNK_TOP_K", "6"))
+
+# How course_scrapper_node handles lecture questions: "fused" sends the
+# transcript material straight to the answering node (one gpt-4o call);
+# "extract" has gpt-4o condense it into context first
+LECTURE_ANSWER_MODE = os.getenv("LECTURE_ANSWER_MODE", "fused").lower()
+
+# Worker pool for the blocking yt-dlp jobs (caption downloads, YouTube
+# search): concurrent jobs, jobs allowed to wait for a worker before new
+# ones are rejected, and the default per-job timeout in seconds
+YTDLP_MAX_WORKERS = int(os.getenv("YTDLP_MAX_WORKERS", "4"))
+YTDLP_MAX_QUEUE = int(os.getenv("YTDLP_MAX_QUEUE", "32"))
+YTDLP_JOB_TIMEOUT = float(os.getenv("YTDLP_JOB_TIMEOUT", "30"))
+
+# Transcript cache: an in-memory LRU over a directory of transcripts with a
+# manifest keyed by (video_id, language); entries expire after the TTL and
+# the least recently used are evicted beyond the size limit
+TRANSCRIPT_CACHE_DIR = os.getenv("TRANSCRIPT_CACHE_DIR", "transcript_cache")
+TRANSCRIPT_CACHE_MEMORY_ENTRIES = int(os.getenv("TRANSCRIPT_CACHE_MEMORY_ENTRIES", "64"))
+TRANSCRIPT_CACHE_MAX_BYTES = int(os.getenv("TRANSCRIPT_CACHE_MAX_BYTES", "536870912"))
+TRANSCRIPT_CACHE_TTL_SECONDS = float(
+    os.getenv("TRANSCRIPT_CACHE_TTL_SECONDS", "2592000")
+)
+
+# How transcripts are downloaded: "memory" reads the caption track from its
+# URL without touching the disk, "file" has yt-dlp write it to a scratch file
+CAPTION_FETCH_MODE = os.getenv("CAPTION_FETCH_MODE", "memory").lower()
@@ -0,0 +1,112 @@
+import threading
+from typing import Optional
+
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted(labels.items()))
+
+
+class Counter:
+    """Monotonically increasing value, optionally split by labels."""
+
+    def __init__(self, name: str, description: str = ""):
+        self.name = name
+        self.description = description
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(_label_key(labels), 0)
+
+    def snapshot(self) -> dict:
+        return {
+            "type": "counter",
+            "description": self.description,
+            "values": [
+                {"labels": dict(key), "value": value}
+                for key, value in self._values.items()
+            ],
+        }
+
+
+class Gauge(Counter):
+    """Value that can go up and down."""
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def snapshot(self) -> dict:
+        return {**super().snapshot(), "type": "gauge"}
+
+
+class Histogram:
+    """Count, sum and max of observed values, optionally split by labels."""
+
+    def __init__(self, name: str, description: str = ""):
+        self.name = name
+        self.description = description
+        self._values: dict[tuple, dict] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            stats = self._values.setdefault(key, {"count": 0, "sum": 0.0, "max": 0.0})
+            stats["count"] += 1
+            stats["sum"] += value
+            stats["max"] = max(stats["max"], value)
+
+    def snapshot(self) -> dict:
+        values = []
+        for key, stats in self._values.items():
+            mean = stats["sum"] / stats["count"] if stats["count"] else 0.0
+            values.append({"labels": dict(key), **stats, "mean": mean})
+        return {"type": "histogram", "description": self.description, "values": values}
+
+
+class MetricsRegistry:
+    """Process-wide registry of named metrics."""
+
+    def __init__(self):
+        self._metrics: dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, description: str):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, description)
+            elif type(metric) is not cls:
+                raise TypeError(f"Metric {name} is already a {type(metric).__name__}")
+            return metric
+
+    def counter(self, name: str, description: str = "") -> Counter:
+        return self._get_or_create(Counter, name, description)
+
+    def gauge(self, name: str, description: str = "") -> Gauge:
+        return self._get_or_create(Gauge, name, description)
+
+    def histogram(self, name: str, description: str = "") -> Histogram:
+        return self._get_or_create(Histogram, name, description)
+
+    def snapshot(self, prefix: Optional[str] = None) -> dict:
+        """Return all metrics (optionally only those starting with ``prefix``)."""
+        return {
+            name: metric.snapshot()
+            for name, metric in sorted(self._metrics.items())
+            if prefix is None or name.startswith(prefix)
+        }
+
+
+metrics = MetricsRegistry()
+
+__all__ = ["metrics", "MetricsRegistry", "Counter", "Gauge", "Histogram"]
@@ -0,0 +1,20 @@
+import asyncio
+import contextvars
+from typing import Coroutine
+
+# Keeps detached tasks referenced until they finish.
+_detached: set[asyncio.Task] = set()
+
+
+def spawn_detached(coro: Coroutine) -> asyncio.Task:
+    """
+    Run ``coro`` as a background task in a fresh context, so it is not
+    traced as part of the caller's run, and keep it alive until it finishes.
+    """
+    task = asyncio.create_task(coro, context=contextvars.Context())
+    _detached.add(task)
+    task.add_done_callback(_detached.discard)
+    return task
+
+
+__all__ = ["spawn_detached"]
@@ -0,0 +1,70 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional
+from src.core.utility.logging_utils import get_logger
+from src.core.utility.tasks import spawn_detached
+
+logger = get_logger(__name__)
+
+
+class TTLCache:
+    """
+    In-process LRU cache whose entries are fresh for ``ttl`` seconds and may
+    still be served, stale, for up to ``stale_ttl`` seconds while a
+    background refresh replaces them (stale-while-revalidate).
+    """
+
+    def __init__(self, ttl: float, stale_ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.stale_ttl = max(stale_ttl, ttl)
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._refreshing: dict[Hashable, asyncio.Task] = {}
+
+    def get(self, key: Hashable) -> tuple[Optional[Any], bool]:
+        """Return ``(value, fresh)``, or ``(None, False)`` on a miss."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None, False
+        stored_at, value = entry
+        age = time.monotonic() - stored_at
+        if age > self.stale_ttl:
+            del self._entries[key]
+            return None, False
+        self._entries.move_to_end(key)
+        return value, age <= self.ttl
+
+    def set(self, key: Hashable, value: Any):
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def refresh(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> bool:
+        """
+        Recompute ``key`` with ``load()`` in the background and store the
+        result unless it is ``None``. Returns ``False`` if a refresh for
+        ``key`` is already running.
+        """
+        if key in self._refreshing:
+            return False
+
+        async def run():
+            try:
+                value = await load()
+                if value is not None:
+                    self.set(key, value)
+            except Exception as e:
+                logger.warning(f"Background refresh of {key!r} failed: {e}")
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = spawn_detached(run())
+        return True
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+__all__ = ["TTLCache"]
@@ -1,9 +1,44 @@
+import inspect
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import StateGraph, START
 from src.model.chat.state import ChatState
 from src.domain.chat.nodes import *
+from src.domain.chat.runtime import compile_node_runtime
+from src.tools.chat_runner.run_context import get_cancel_token, get_run_context
+
+
+def cancellable(node):
+    """
+    Wrap a node so it refuses to start once its run has been cancelled and
+    receives the run config when it asks for one. The node gets its slice
+    of the run deadline and is counted as an overrun if it takes longer.
+    """
+    wants_config = "config" in inspect.signature(node).parameters
+
+    async def run_node(state: ChatState, config: RunnableConfig):
+        cancel_token = get_cancel_token(config)
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+        run_context = get_run_context(config)
+        if run_context is None:
+            return await node(state, config) if wants_config else await node(state)
+
+        run_context.start_node(node.__name__)
+        try:
+            if wants_config:
+                return await node(state, config)
+            return await node(state)
+        finally:
+            run_context.end_node(node.__name__)
+
+    run_node.__name__ = node.__name__
+    run_node.__doc__ = node.__doc__
+    return run_node
 
 
 async def get_chat_graph():
+    # Prompts, chains and agents are compiled once here, not per request
+    compile_node_runtime()
     graph = StateGraph(ChatState)
 
     def start_router(state: ChatState) -> str:
@@ -15,14 +50,14 @@ async def get_chat_graph():
         else:
             return "teacher_node"
 
-    graph.add_node("user_node", user_node)
-    graph.add_node("teacher_node", teacher_node)
-    graph.add_node("scheduler_node", scheduler_node)
-    graph.add_node("course_scrapper_node", course_scrapper_node)
-    graph.add_node("calendar_node", calendar_node)
-    graph.add_node("response_node", response_node)
-    graph.add_node("quiz_node", quiz_node)
-    graph.add_node("course_planner_node", course_planner_node)
+    graph.add_node("user_node", cancellable(user_node))
+    graph.add_node("teacher_node", cancellable(teacher_node))
+    graph.add_node("scheduler_node", cancellable(scheduler_node))
+    graph.add_node("course_scrapper_node", cancellable(course_scrapper_node))
+    graph.add_node("calendar_node", cancellable(calendar_node))
+    graph.add_node("response_node", cancellable(response_node))
+    graph.add_node("quiz_node", cancellable(quiz_node))
+    graph.add_node("course_planner_node", cancellable(course_planner_node))
 
     graph.add_conditional_edges(
         START,
@@ -5,9 +5,11 @@ from langchain.agents import AgentExecutor, create_tool_calling_agent
 # )
 
 from src.services.auth.get_calendar_service import get_calendar_service
+from langchain_core.runnables import RunnableConfig
 from src.model.chat.state import ChatState
-from langchain_openai import ChatOpenAI
+from src.services.llm.client_pool import get_chat_model
 from langgraph.types import Command
+from src.tools.chat_runner.run_context import time_left
 from src.core.utility.logging_utils import get_logger
 from datetime import datetime
 import pytz
@@ -15,7 +17,7 @@ import pytz
 logger = get_logger(__name__)
 
 
-async def calendar_node(state: ChatState) -> Command:
+async def calendar_node(state: ChatState, config: RunnableConfig) -> Command:
     """Enhanced Calendar Agent with proper error handling and service injection."""
 
     try:
@@ -28,7 +30,7 @@ async def calendar_node(state: ChatState) -> Command:
         # tools = create_calendar_tools(service)
 
         # 3. Initialize LLM
-        llm = ChatOpenAI(model="gpt-4o", streaming=False, temperature=0)
+        llm = get_chat_model("gpt-4o", temperature=0)
 
         try:
             user_tz = pytz.timezone(state.get("timezone", "UTC"))
@@ -43,14 +45,15 @@ async def calendar_node(state: ChatState) -> Command:
         # 5. Create and execute agent
         # agent = create_tool_calling_agent(llm, tools, CALENDAR_AGENT_PROMPT)
         agent = create_tool_calling_agent(llm, [], "")
+        # Stop the agent at the end of the node's slice of the run deadline
+        left = time_left(config)
         executor = AgentExecutor(
             agent=agent,
             # tools=tools,
-            verbose=True,
             max_iterations=2,
             early_stopping_method="force",
             handle_parsing_errors=True,
-            max_execution_time=60,
+            max_execution_time=60 if left is None else min(left, 60),
             return_intermediate_steps=True,
         )
 
@@ -1,130 +1,199 @@
+import asyncio
+import math
+from typing import Optional
 from src.model.chat.state import ChatState
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import END
 from langgraph.types import Command
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import JsonOutputParser
 from src.tools.web_search import web_search, search_youtube_videos
+from src.tools.youtube_transcriber.captions import parse_captions, plain_text
 from src.tools.youtube_transcriber.transcriber import get_transcript
 from src.core.utility.logging_utils import get_logger
+from src.core.utility.metrics import metrics
+from src.core.configs import (
+    COURSE_PLANNER_TOPIC_TIMEOUT,
+    COURSE_PLANNER_WEB_TIMEOUT,
+    COURSE_PLANNER_YOUTUBE_TIMEOUT,
+    COURSE_PLANNER_TRANSCRIPT_TIMEOUT,
+    COURSE_PLANNER_RESEARCH_SHARE,
+    STUDY_PLAN_CACHE_TTL_SECONDS,
+    STUDY_PLAN_CACHE_STALE_SECONDS,
+    STUDY_PLAN_CACHE_MAX_ENTRIES,
+)
+from src.core.utility.ttl_cache import TTLCache
+from src.domain.chat.runtime import get_node_runtime
+from src.tools.chat_runner.run_context import (
+    CancelToken,
+    RunCancelled,
+    get_cancel_token,
+    time_left,
+    within_time_left,
+)
+from src.tools.chat_runner.stream_registry import normalize_query
 
 logger = get_logger(__name__)
 
+research_sources = metrics.counter(
+    "course_planner_sources_total",
+    "Course planner research sources by outcome (ok, late, error)",
+)
+research_seconds = metrics.histogram(
+    "course_planner_research_seconds", "Wall-clock time of the research fan-out"
+)
+plan_cache_events = metrics.counter(
+    "study_plan_cache_total",
+    "Study plan cache lookups (fresh, stale, miss) and background refreshes",
+)
 
-async def course_planner_node(state: ChatState):
+study_plan_cache = TTLCache(
+    ttl=STUDY_PLAN_CACHE_TTL_SECONDS,
+    stale_ttl=STUDY_PLAN_CACHE_STALE_SECONDS,
+    max_entries=STUDY_PLAN_CACHE_MAX_ENTRIES,
+)
+# Normalized query -> extracted topic and level, so a repeated query finds
+# its cached plan without calling the topic LLM again
+topic_memo = TTLCache(
+    ttl=STUDY_PLAN_CACHE_STALE_SECONDS,
+    stale_ttl=STUDY_PLAN_CACHE_STALE_SECONDS,
+    max_entries=STUDY_PLAN_CACHE_MAX_ENTRIES,
+)
+
+
+async def collect(source: str, task: asyncio.Task, deadline: float, default):
     """
-    Course planner node that creates a comprehensive study plan.
-    Uses web search and YouTube resources to gather information.
+    Return ``task``'s result if it finishes before ``deadline`` (event loop
+    time), otherwise cancel it and return ``default``. Failed sources also
+    fall back to ``default``.
     """
-    llm = ChatOpenAI(
-        model="gpt-4o",
-        temperature=0.3,
-        streaming=False,
-    )
+    timeout = max(deadline - asyncio.get_running_loop().time(), 0)
+    done, _ = await asyncio.wait({task}, timeout=timeout)
+    if not done or task.cancelled():
+        task.cancel()
+        research_sources.inc(source=source, outcome="late")
+        logger.warning(f"Dropping {source}: not ready within its deadline")
+        return default
+    try:
+        result = task.result()
+    except RunCancelled:
+        raise
+    except Exception as e:
+        research_sources.inc(source=source, outcome="error")
+        logger.error(f"{source} failed: {e}")
+        return default
+    research_sources.inc(source=source, outcome="ok")
+    return result
 
-    query = state["query"]
 
-    # Step 1: Extract topic and search intent
-    topic_prompt = ChatPromptTemplate.from_messages(
-        [
-            (
-                "system",
-                "Extract the main topic/subject the user wants to learn about. Return only the topic name.",
-            ),
-            ("user", "{query}"),
-        ]
-    )
-    topic_chain = topic_prompt | llm
-    topic_response = await topic_chain.ainvoke({"query": query})
-    topic = topic_response.content.strip()
+def plan_cache_key(topic: str, level: Optional[str]) -> str:
+    """Cache key for a study plan: normalized topic plus optional level."""
+    return f"{normalize_query(topic)}|{normalize_query(level or '')}"
 
-    logger.info(f"Extracted topic: {topic}")
 
-    # Step 2: Perform web search for course resources
-    try:
-        search_results = await web_search(
-            f"{topic} tutorial course learning resources", max_results=5
-        )
-        logger.info(f"Found {len(search_results)} web search results")
-    except Exception as e:
-        logger.error(f"Web search failed: {e}")
-        search_results = []
+def cached_plan(
+    key: str, query: str, topic: str, level: Optional[str]
+) -> Optional[dict]:
+    """The cached plan for ``key``, refreshed in the background if stale."""
+    plan, fresh = study_plan_cache.get(key)
+    if plan is not None:
+        plan_cache_events.inc(outcome="fresh" if fresh else "stale")
+        if not fresh:
+            study_plan_cache.refresh(key, lambda: refresh_plan(query, topic, level))
+    return plan
 
-    # Step 3: Search for YouTube videos
-    try:
-        youtube_results = await search_youtube_videos(
-            f"{topic} tutorial course", max_results=3
+
+async def extract_topic(query: str) -> dict:
+    """Extract the topic, and the learner level if stated, from the query."""
+    topic_chain = get_node_runtime().topic_chain
+    response = await topic_chain.ainvoke({"query": query})
+    return {
+        "topic": str(response.get("topic") or query).strip(),
+        "level": response.get("level"),
+    }
+
+
+def start_research(
+    query: str, cancel_token: Optional[CancelToken] = None
+) -> dict[str, asyncio.Task]:
+    """
+    Start web search, YouTube search and the top video's transcript fetch.
+    The transcript fetch begins as soon as the YouTube results arrive.
+    """
+
+    async def fetch_top_transcript() -> Optional[str]:
+        videos = await youtube_task
+        if not videos:
+            return None
+        top_video_url = videos[0]["url"]
+        logger.info(f"Fetching transcript from: {top_video_url}")
+        captions = await get_transcript(top_video_url, cancel_token=cancel_token)
+        video_context = plain_text(parse_captions(captions)) or captions
+        # Limit context length
+        if video_context and len(video_context) > 3000:
+            video_context = video_context[:3000] + "..."
+        return video_context
+
+    web_task = asyncio.create_task(
+        web_search(f"{query} tutorial course learning resources", max_results=5)
+    )
+    youtube_task = asyncio.create_task(
+        search_youtube_videos(
+            f"{query} tutorial course", max_results=3, cancel_token=cancel_token
         )
-        logger.info(f"Found {len(youtube_results)} YouTube videos")
-    except Exception as e:
-        logger.error(f"YouTube search failed: {e}")
-        youtube_results = []
-
-    # Step 4: Optionally fetch transcript from top video
-    video_context = None
-    if youtube_results and len(youtube_results) > 0:
-        try:
-            top_video_url = youtube_results[0]["url"]
-            logger.info(f"Fetching transcript from: {top_video_url}")
-            video_context = await get_transcript(top_video_url)
-            # Limit context length
-            if video_context and len(video_context) > 3000:
-                video_context = video_context[:3000] + "..."
-        except Exception as e:
-            logger.warning(f"Could not fetch video transcript: {e}")
-            video_context = None
-
-    # Step 5: Generate comprehensive study plan
-    planner_prompt = ChatPromptTemplate.from_messages(
-        [
-            (
-                "system",
-                """You are an expert course planner and educational advisor.
-        Create a comprehensive, structured study plan based on available resources.
-        
-        Return a JSON object with the following structure:
-        {{
-            "study_plan": {{
-                "topic": "Main topic name",
-                "overview": "Brief overview of what will be learned",
-                "learning_path": [
-                    {{
-                        "phase": "Phase name (e.g., Beginner, Intermediate, Advanced)",
-                        "duration": "Estimated time (e.g., 2 weeks)",
-                        "topics": ["Topic 1", "Topic 2", ...],
-                        "key_concepts": ["Concept 1", "Concept 2", ...]
-                    }}
-                ],
-                "recommended_resources": {{
-                    "articles": ["Resource 1", "Resource 2"],
-                    "videos": ["Video 1", "Video 2"]
-                }},
-                "practice_suggestions": ["Suggestion 1", "Suggestion 2"],
-                "learning_tips": ["Tip 1", "Tip 2"]
-            }}
-        }}
-        """,
-            ),
-            (
-                "user",
-                """Create a study plan for: {topic}
-        
-        User Query: {query}
-        
-        Available Web Resources:
-        {web_resources}
-        
-        Available YouTube Videos:
-        {youtube_videos}
-        
-        {video_context_section}
-        
-        Create a detailed, actionable study plan that incorporates these resources.
-        """,
-            ),
-        ]
     )
+    transcript_task = asyncio.create_task(fetch_top_transcript())
+    return {
+        "web_search": web_task,
+        "youtube_search": youtube_task,
+        "transcript": transcript_task,
+    }
+
+
+async def gather_research(
+    tasks: dict[str, asyncio.Task], started: float, limit: float = math.inf
+) -> tuple[list[dict], list[dict], Optional[str]]:
+    """
+    Collect research results within their deadlines from ``started``, and
+    in any case by ``limit`` (event loop time).
+    """
+    search_results = await collect(
+        "web_search",
+        tasks["web_search"],
+        min(started + COURSE_PLANNER_WEB_TIMEOUT, limit),
+        [],
+    )
+    youtube_results = await collect(
+        "youtube_search",
+        tasks["youtube_search"],
+        min(started + COURSE_PLANNER_YOUTUBE_TIMEOUT, limit),
+        [],
+    )
+    video_context = await collect(
+        "transcript",
+        tasks["transcript"],
+        min(started + COURSE_PLANNER_TRANSCRIPT_TIMEOUT, limit),
+        None,
+    )
+    research_seconds.observe(asyncio.get_running_loop().time() - started)
+    logger.info(
+        f"Research: {len(search_results)} web results, {len(youtube_results)} "
+        f"videos, transcript={'yes' if video_context else 'no'}"
+    )
+    return search_results, youtube_results, video_context
+
 
+async def generate_plan(
+    topic: str,
+    level: Optional[str],
+    query: str,
+    search_results: list[dict],
+    youtube_results: list[dict],
+    video_context: Optional[str],
+) -> dict:
+    """
+    Generate the study plan. Returns the ``course_data``, ``search_results``
+    and ``yt_scraped_data`` to put in the state; ``course_data`` holds an
+    error when generation failed.
+    """
     # Format resources
     web_resources_text = (
         "\n".join(
@@ -153,35 +222,147 @@ async def course_planner_node(state: ChatState):
         video_context_section = f"Sample Video Content (from {youtube_results[0]['title']}):\n{video_context}"
 
     # Generate study plan
-    planner_chain = planner_prompt | llm | JsonOutputParser()
+    planner_chain = get_node_runtime().planner_chain
 
     try:
         course_data = await planner_chain.ainvoke(
             {
                 "topic": topic,
+                "level": level or "not specified",
                 "query": query,
                 "web_resources": web_resources_text,
                 "youtube_videos": youtube_videos_text,
                 "video_context_section": video_context_section,
             }
         )
+        logger.info("Course plan generated successfully")
+    except Exception as e:
+        logger.error(f"Failed to generate course plan: {e}")
+        return fallback_plan(topic, search_results, youtube_results, video_context)
 
-        # Store all relevant data in state
-        state["course_data"] = course_data
-        state["search_results"] = search_results
-        state["yt_scraped_data"] = {
+    return {
+        "course_data": course_data,
+        "search_results": search_results,
+        "yt_scraped_data": {
             "videos": youtube_results,
             "transcript": video_context,
-        }
+        },
+    }
 
-        logger.info("Course plan generated successfully")
 
-    except Exception as e:
-        logger.error(f"Failed to generate course plan: {e}")
-        state["course_data"] = {
+def fallback_plan(
+    topic: str,
+    search_results: list[dict],
+    youtube_results: list[dict],
+    video_context: Optional[str],
+) -> dict:
+    """State update when no plan could be generated: just the research."""
+    return {
+        "course_data": {
             "error": "Failed to generate study plan",
             "topic": topic,
             "resources": {"web": search_results, "videos": youtube_results},
-        }
+        },
+        "search_results": search_results,
+        "yt_scraped_data": {
+            "videos": youtube_results,
+            "transcript": video_context,
+        },
+    }
+
+
+async def refresh_plan(query: str, topic: str, level: Optional[str]) -> Optional[dict]:
+    """Research and plan from scratch; ``None`` if generation failed."""
+    tasks = start_research(query)
+    try:
+        research = await gather_research(tasks, asyncio.get_running_loop().time())
+    finally:
+        for task in tasks.values():
+            task.cancel()
+    plan = await generate_plan(topic, level, query, *research)
+    if "error" in plan["course_data"]:
+        return None
+    plan_cache_events.inc(outcome="refreshed")
+    return plan
+
+
+async def course_planner_node(state: ChatState, config: RunnableConfig):
+    """
+    Course planner node that creates a comprehensive study plan.
+    Uses web search and YouTube resources to gather information.
+
+    The research sources run concurrently: web and YouTube search start
+    from the raw query while the topic is extracted, and the top video's
+    transcript is fetched as soon as YouTube results arrive. Each source
+    has its own deadline; sources that miss it are left out of the plan.
+    Research stops early enough to leave part of the node's slice of the
+    run deadline for planning; if planning runs out of time too, the
+    research results are answered with as they are.
+
+    Plans are cached per normalized topic and level. A cached plan is
+    returned straight away (research is cancelled); a stale one is also
+    refreshed in the background. Queries seen before skip topic extraction.
+    """
+    query = state["query"]
+    cancel_token = get_cancel_token(config)
+
+    memo_key = normalize_query(query)
+    topic_info, _ = topic_memo.get(memo_key)
+    if topic_info is not None:
+        topic, level = topic_info["topic"], topic_info["level"]
+        key = plan_cache_key(topic, level)
+        plan = cached_plan(key, query, topic, level)
+        if plan is not None:
+            state.update(plan)
+            return Command(goto="response_node", update=state)
+
+    started = asyncio.get_running_loop().time()
+    left = time_left(config)
+    # Research must leave part of the node's time slice for planning
+    limit = math.inf
+    if left is not None:
+        limit = started + left * COURSE_PLANNER_RESEARCH_SHARE
+    topic_task = None
+    if topic_info is None:
+        topic_task = asyncio.create_task(extract_topic(query))
+    tasks = start_research(query, cancel_token)
+
+    try:
+        if topic_task is not None:
+            topic_info = await collect(
+                "topic",
+                topic_task,
+                min(started + COURSE_PLANNER_TOPIC_TIMEOUT, limit),
+                None,
+            )
+            if topic_info is None:
+                topic, level = query, None
+            else:
+                topic, level = topic_info["topic"], topic_info["level"]
+                topic_memo.set(memo_key, topic_info)
+            logger.info(f"Extracted topic: {topic} (level: {level})")
+
+            key = plan_cache_key(topic, level)
+            plan = cached_plan(key, query, topic, level)
+            if plan is not None:
+                state.update(plan)
+                return Command(goto="response_node", update=state)
+
+        plan_cache_events.inc(outcome="miss")
+        research = await gather_research(tasks, started, limit)
+    finally:
+        if topic_task is not None:
+            topic_task.cancel()
+        for task in tasks.values():
+            task.cancel()
+
+    plan = await within_time_left(
+        generate_plan(topic, level, query, *research), config, "study_plan"
+    )
+    if plan is None:
+        plan = fallback_plan(topic, *research)
+    if "error" not in plan["course_data"]:
+        study_plan_cache.set(key, plan)
+    state.update(plan)
 
     return Command(goto="response_node", update=state)
@@ -1,70 +1,196 @@
-from langchain_core.output_parsers import JsonOutputParser
+import asyncio
+from typing import Optional
+from langchain_core.runnables import RunnableConfig
 from src.model.chat.state import ChatState
 from langgraph.types import Command
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate
+from src.core.configs import (
+    INTENT_CONFIDENCE_THRESHOLD,
+    LECTURE_ANSWER_MODE,
+    LECTURE_CHUNK_CHARS,
+)
+from src.core.utility.logging_utils import get_logger
+from src.core.utility.metrics import metrics
+from src.domain.chat.runtime import get_node_runtime
+from src.domain.lecture.digest import load_digest, render_digest, transcript_hash
+from src.domain.lecture.ingestion import schedule_lecture_ingestion
 from src.services.qdrant.course import get_youtube_url
+from src.tools.intent_classifier import classify_quiz_intent
+from src.tools.youtube_transcriber.captions import (
+    chunk_segments,
+    parse_captions,
+    render_chunks,
+)
 from src.tools.youtube_transcriber.transcriber import get_transcript
+from src.tools.chat_runner.run_context import (
+    RunCancelled,
+    get_cancel_token,
+    within_time_left,
+)
 
+logger = get_logger(__name__)
 
-async def course_scrapper_node(state: ChatState):
+lecture_contexts = metrics.counter(
+    "lecture_context_source_total",
+    "Where course_scrapper_node got lecture context from",
+)
+quiz_intent_decisions = metrics.counter(
+    "quiz_intent_decisions_total",
+    "Quiz intent decisions for lecture questions by path (fast, llm)",
+)
+
+
+async def retrieve_lecture_chunks(lecture_id: str, query: str) -> str:
     """
-    Calendar node for the chat bot.
+    The transcript chunks of an ingested lecture that are relevant to
+    ``query``, or an empty string if the lecture has no chunks yet.
     """
-    llm = ChatOpenAI(
-        model="gpt-4o",
-        streaming=False,
-    )
+    from main import lecture_chunk_store
+
+    try:
+        chunks = await lecture_chunk_store.search(lecture_id, query)
+    except Exception as e:
+        logger.warning(f"Chunk search failed for lecture {lecture_id}: {e}")
+        return ""
+    return render_chunks(chunks)
+
 
+async def load_lecture_digest(lecture_id: str) -> Optional[dict]:
+    """The digest of an ingested lecture, or ``None`` if it has none."""
+    try:
+        return await load_digest(lecture_id)
+    except Exception as e:
+        logger.warning(f"Could not load digest for lecture {lecture_id}: {e}")
+        return None
+
+
+async def load_lecture_material(
+    state: ChatState, config: RunnableConfig
+) -> Optional[str]:
+    """
+    Transcript material for the lecture or video of ``state``: the digest
+    and the relevant chunks of an ingested lecture, or else the whole
+    transcript as timestamped chunks. ``None`` if no captions could be
+    fetched. Sets the transcript hash the material comes from as
+    ``lecture_version`` when it is known.
+    """
     if state["lecture_id"]:
+        # Ingested lectures never touch the full transcript
+        digest, passages = await asyncio.gather(
+            load_lecture_digest(state["lecture_id"]),
+            retrieve_lecture_chunks(state["lecture_id"], state["query"]),
+        )
+        if digest:
+            state["lecture_version"] = digest.get("transcript_hash")
+        sections = {
+            "digest": f"Lecture digest:\n{render_digest(digest)}" if digest else "",
+            "chunks": f"Relevant transcript passages:\n{passages}" if passages else "",
+        }
+        found = [name for name, text in sections.items() if text]
+        if found:
+            lecture_contexts.inc(source="+".join(found))
+            return "\n\n".join(sections[name] for name in found)
+        schedule_lecture_ingestion(state["lecture_id"])
         youtube_url = await get_youtube_url(state["lecture_id"])
-    elif state["video_url"]:
-        youtube_url = state["video_url"]
     else:
-        return Command(goto="response_node", update=state)
+        youtube_url = state["video_url"]
 
     try:
-        youtube_video_context = await get_transcript(
-            "https://youtu.be/" + str(youtube_url)
+        transcript = await get_transcript(
+            "https://youtu.be/" + str(youtube_url),
+            cancel_token=get_cancel_token(config),
         )
+    except RunCancelled:
+        raise
     except Exception as e:
-        # Log and fallback to default flow without context
-        from src import get_logger
-
-        logger = get_logger(__name__)
         logger.error(f"Failed to fetch captions: {e}")
+        return None
+    lecture_contexts.inc(source="transcript")
+    state["lecture_version"] = transcript_hash(transcript)
 
-        state["yt_scraped_data"] = None
-        # Continue without video context → normal response node
-        return Command(goto="response_node", update=state)
+    chunks = chunk_segments(parse_captions(transcript), LECTURE_CHUNK_CHARS)
+    return render_chunks(chunks) if chunks else transcript
 
-    prompt = ChatPromptTemplate.from_messages(
-        [
-            (
-                "system",
-                """You are a context retrieval assistant that can retrieve the context of a given lecture based on the youtube url and user query. You will be returning a json Object with the following fields: 
-                {{
-                    "context": "The context of the lecture",
-                    "need_quiz": "True if the user wants to take a quiz on the lecture, False otherwise"
-                }}
-                """,
-            ),
-            (
-                "user",
-                "Youtube Video Context : {youtube_video_context}\nUser Query: {query} # Give Priority to the User Query for the verification of the quiz.",
-            ),
-        ]
-    )
-    chain = prompt | llm | JsonOutputParser()
-    context = await chain.ainvoke(
+
+async def classify_quiz_with_llm(query: str) -> bool:
+    """Ask gpt-4o-mini whether a lecture question asks for a quiz."""
+    response = await get_node_runtime().quiz_intent_chain.ainvoke({"query": query})
+
+    return bool(response.get("need_quiz"))
+
+
+async def wants_quiz(query: str) -> bool:
+    """
+    Quiz intent of a lecture question, from the local rules when they are
+    confident enough and from gpt-4o-mini otherwise.
+    """
+    prediction = classify_quiz_intent(query)
+    if prediction.confidence >= INTENT_CONFIDENCE_THRESHOLD:
+        quiz_intent_decisions.inc(path="fast")
+        return prediction.intent == "quiz"
+
+    quiz_intent_decisions.inc(path="llm")
+    try:
+        return await classify_quiz_with_llm(query)
+    except Exception as e:
+        logger.warning(f"Quiz intent classification failed: {e}")
+        return False
+
+
+async def extract_context(youtube_video_context: str, query: str) -> dict:
+    """Have gpt-4o condense the lecture material and decide on a quiz."""
+    return await get_node_runtime().extract_context_chain.ainvoke(
         {
             "youtube_video_context": youtube_video_context,
-            "query": state["query"],
+            "query": query,
         }
     )
 
-    state["yt_scraped_data"] = context.get("context")
-    state["need_quiz"] = context.get("need_quiz")
+
+async def course_scrapper_node(state: ChatState, config: RunnableConfig):
+    """
+    Lecture node for the chat bot.
+
+    In "fused" mode the quiz intent is classified locally (gpt-4o-mini when
+    the rules are unsure) while the transcript material loads, and the
+    material goes straight to response_node or quiz_node, so a lecture
+    question costs a single gpt-4o call. In "extract" mode gpt-4o first
+    condenses the material and decides on the quiz.
+
+    Steps that do not finish within the node's time slice are skipped: the
+    question is answered without the transcript, or without a quiz.
+    """
+    if not state["lecture_id"] and not state["video_url"]:
+        return Command(goto="response_node", update=state)
+
+    fused = LECTURE_ANSWER_MODE == "fused"
+    quiz_intent = asyncio.create_task(wants_quiz(state["query"])) if fused else None
+    try:
+        material = await within_time_left(
+            load_lecture_material(state, config), config, "lecture_material"
+        )
+    except BaseException:
+        if quiz_intent is not None:
+            quiz_intent.cancel()
+        raise
+
+    if material is None:
+        if quiz_intent is not None:
+            quiz_intent.cancel()
+        # Continue without video context → normal response node
+        state["yt_scraped_data"] = None
+        return Command(goto="response_node", update=state)
+
+    if fused:
+        state["yt_scraped_data"] = material
+        state["need_quiz"] = await within_time_left(
+            quiz_intent, config, "quiz_intent", False
+        )
+    else:
+        context = await within_time_left(
+            extract_context(material, state["query"]), config, "extract_context", {}
+        )
+        state["yt_scraped_data"] = context.get("context") or material
+        state["need_quiz"] = context.get("need_quiz")
 
     if state["need_quiz"]:
         return Command(goto="quiz_node", update=state)
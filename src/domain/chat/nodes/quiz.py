@@ -1,48 +1,44 @@
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import JsonOutputParser
+import json
+from langchain_core.runnables import RunnableConfig
 from langgraph.types import Command
 from src.model.chat.state import ChatState
 from src.core.utility.logging_utils import get_logger
+from src.core.utility.metrics import metrics
+from src.domain.chat.runtime import get_node_runtime
+from src.domain.lecture.ingestion import schedule_lecture_ingestion
+from src.domain.lecture.quiz_bank import load_quiz_bank, sample_quiz
+from src.tools.chat_runner.run_context import emit_chunk
 from langgraph.graph import END
 
 logger = get_logger(__name__)
 
+quiz_bank_lookups = metrics.counter(
+    "quiz_bank_lookups_total", "Lecture quiz requests by quiz bank outcome (hit, miss)"
+)
 
-async def quiz_node(state: ChatState) -> Command:
-    """Quiz node for the chat bot."""
-    llm = ChatOpenAI(
-        model="gpt-4o",
-        temperature=0.1,
-        streaming=True,
-    )
-    prompt = ChatPromptTemplate.from_messages(
-        [
-            (
-                "system",
-                """You are a helpful assistant that can generate a quiz for a given topic.
-                The quiz should be in the following format:
-                {{
-                    "questions": [
-                        {{
-                            "question": "The question",
-                            "options": ["The options"],
-                            "answer": "The answer",
-                        }}
-                    ]
-                }}
-                """,
-            ),
-            (
-                "user",
-                """
-                Query: {query}
-                Course data: {yt_scraped_data}
-                """,
-            ),
-        ]
-    )
-    chain = prompt | llm | JsonOutputParser()
+
+async def quiz_node(state: ChatState, config: RunnableConfig) -> Command:
+    """
+    Quiz node for the chat bot. Samples the lecture's quiz bank, or generates
+    a quiz from the scraped context while the bank is built.
+    """
+    lecture_id = state["lecture_id"]
+    if lecture_id:
+        try:
+            questions = await load_quiz_bank(lecture_id)
+        except Exception as e:
+            logger.warning(f"Could not load quiz bank for {lecture_id}: {e}")
+            questions = None
+
+        if questions:
+            quiz_bank_lookups.inc(outcome="hit")
+            await emit_chunk("quiz_chunk", json.dumps(sample_quiz(questions)), config)
+            return Command(goto=END, update=state)
+
+        quiz_bank_lookups.inc(outcome="miss")
+        schedule_lecture_ingestion(lecture_id)
+
+    chain = get_node_runtime().quiz_chain
     response = await chain.ainvoke(
         {
             "query": state["query"],
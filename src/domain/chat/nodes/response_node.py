@@ -1,66 +1,133 @@
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_openai import ChatOpenAI
-from langchain_core.output_parsers import StrOutputParser
+from typing import Optional
+from langchain_core.runnables import Runnable, RunnableConfig
+from src.core.configs import (
+    SPECULATIVE_ROUTES,
+    RESPONSE_CACHE_ENABLED,
+    RESPONSE_CACHE_REPLAY_CHARS,
+)
+from src.core.utility.logging_utils import get_logger
+from src.core.utility.metrics import metrics
+from src.domain.chat.prompts import RESPONSE_SECTION_PROMPTS
+from src.domain.chat.runtime import RESPONSE_MODEL, get_node_runtime
+from src.domain.chat.speculation import SpeculativeResponse
 from src.model.chat.state import ChatState
+from src.services.qdrant.response_cache import response_scope
+from src.tools.chat_runner.run_context import emit_chunk, get_run_context
+from src.tools.context_assembler import AssembledContext, assemble_context
 from langgraph.graph import END
 from langgraph.types import Command
-import json
 
+logger = get_logger(__name__)
 
-async def response_node(state: ChatState):
-    """
-    Response node for the chat bot.
-    """
-    llm = ChatOpenAI(
-        model="gpt-4o",
-        streaming=True,
-    )
+context_tokens = metrics.histogram(
+    "response_context_tokens",
+    "Context tokens in response_node prompts, before and after trimming",
+)
+
+# State fields put in the prompt, all subject to the context token budget
+CONTEXT_SOURCES = ("history", "search_results", "yt_scraped_data", "course_data")
 
-    system_prompt = """
-    You are Vellora, a placement assistant coach and a personal helping assistant.
-    """
 
-    inputs = {
-        "query": state["query"],
-    }
-    if state["search_results"] is not None:
-        system_prompt += """
-        This are the search results for the user's query: {search_results}
-        Use this information to answer the user's query.
-        If the user's query is not related to the search results, say that you are not sure about the answer.
-        """
-        inputs["search_results"] = state["search_results"]
-
-    if state["yt_scraped_data"] is not None:
-        system_prompt += """
-        This is the context of the lecture that the user is interested in: {yt_scraped_data}
-        Use this information to answer the user's query.
-        If the user's query is not related to the lecture, say that you are not sure about the answer.
-        """
-        inputs["yt_scraped_data"] = state["yt_scraped_data"]
-
-    if state["course_data"] is not None:
-        system_prompt += """
-        This is the comprehensive study plan generated for the user: {course_data}
-        Present this study plan in a clear, well-structured format with sections for:
-        - Learning path with phases and topics
-        - Recommended resources (articles and videos)
-        - Practice suggestions
-        - Learning tips
-        Make it actionable and encouraging.
-        """
-        inputs["course_data"] = state["course_data"]
-
-    prompt = ChatPromptTemplate.from_messages(
-        [
-            ("system", system_prompt),
-            ("user", "{query}"),
-        ]
+def build_response_chain(
+    state: ChatState,
+) -> tuple[Runnable, dict, AssembledContext]:
+    """The compiled answer chain for ``state`` and its budget-trimmed inputs."""
+    context = assemble_context(
+        state["query"],
+        {name: state.get(name) for name in CONTEXT_SOURCES},
+        RESPONSE_MODEL,
     )
-    chain = prompt | llm | StrOutputParser()
+    sections = tuple(name for name in RESPONSE_SECTION_PROMPTS if name in context.texts)
+    inputs = {"query": state["query"]}
+    inputs.update((name, context.texts[name]) for name in sections)
+    return get_node_runtime().response_chain(sections), inputs, context
+
 
-    response = await chain.ainvoke(
-        inputs,
+def speculate_response(
+    route: str, state: ChatState, config: RunnableConfig
+) -> Optional[SpeculativeResponse]:
+    """Start response_node's answer while ``route`` decides; ``None`` if disabled."""
+    run_context = get_run_context(config)
+    if route not in SPECULATIVE_ROUTES or run_context is None:
+        return None
+
+    chain, inputs, _ = build_response_chain(state)
+    run_context.speculation = SpeculativeResponse(route, chain, inputs)
+    return run_context.speculation
+
+
+def report_context(context: AssembledContext):
+    """Record prompt context size before and after trimming."""
+    context_tokens.observe(context.total_before, stage="before")
+    context_tokens.observe(context.total_after, stage="after")
+    per_source = ", ".join(
+        f"{name}: {context.tokens_before[name]}->{context.tokens_after[name]}"
+        for name in context.texts
     )
+    logger.info(
+        f"Response context {context.total_before} -> {context.total_after} "
+        f"tokens ({per_source or 'none'})"
+    )
+
+
+async def replay_cached(answer: str, config: RunnableConfig):
+    """Stream a cached answer in small chunks, like a live generation."""
+    for start in range(0, len(answer), RESPONSE_CACHE_REPLAY_CHARS):
+        await emit_chunk(
+            "response_chunk",
+            answer[start : start + RESPONSE_CACHE_REPLAY_CHARS],
+            config,
+        )
+
+
+async def response_node(state: ChatState, config: RunnableConfig):
+    """
+    Response node for the chat bot. Serves cached or speculative answers
+    when possible; chats carrying conversation history bypass the cache.
+    """
+    chain, inputs, context = build_response_chain(state)
+    report_context(context)
+
+    run_context = get_run_context(config)
+    speculation = run_context.speculation if run_context else None
+    if speculation is not None:
+        run_context.speculation = None
+
+    from main import response_cache
+
+    cached, vector, scope = None, None, None
+    use_cache = RESPONSE_CACHE_ENABLED and response_cache is not None
+    if use_cache and not state.get("history"):
+        scope = response_scope(state)
+    if scope is not None:
+        try:
+            cached, vector = await response_cache.lookup(state["query"], scope)
+        except Exception as e:
+            logger.warning(f"Response cache lookup failed: {e}")
+
+    if cached is not None:
+        if speculation is not None:
+            speculation.discard()
+        await replay_cached(cached, config)
+        state["response"] = cached
+        return Command(goto=END, update=state)
+
+    if speculation is not None and speculation.matches(inputs):
+        parts = []
+        async for chunk in speculation.commit():
+            parts.append(chunk)
+            await emit_chunk("response_chunk", chunk, config)
+        response = "".join(parts)
+    else:
+        if speculation is not None:
+            speculation.discard()
+        response = await chain.ainvoke(
+            inputs,
+        )
+
+    if vector is not None and response:
+        response_cache.store_in_background(
+            state["query"], scope, response, vector, lecture_id=state["lecture_id"]
+        )
     state["response"] = response
     return Command(goto=END, update=state)
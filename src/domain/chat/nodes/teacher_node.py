@@ -1,40 +1,35 @@
-from langchain_core.output_parsers import JsonOutputParser
-from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableConfig
 from src.model.chat.state import ChatState
 from langgraph.types import Command
-from langchain_openai import ChatOpenAI
+from src.domain.chat.nodes.response_node import speculate_response
+from src.domain.chat.runtime import get_node_runtime
+from src.tools.chat_runner.run_context import within_time_left
 
 
-async def teacher_node(state: ChatState):
+async def teacher_node(state: ChatState, config: RunnableConfig):
     """
     Teacher node for the chat bot.
-    """
 
-    llm = ChatOpenAI(
-        model="gpt-4.1-mini",
-        temperature=0.1,
-        streaming=True,
-    )
+    The answer is generated speculatively while the calendar check runs and
+    dropped if the query turns out to need calendar_node.
+    """
 
-    prompt = ChatPromptTemplate.from_messages(
-        [
-            (
-                "system",
-                """You are an assistant that analyzes user queries to determine if they require calendar-related actions.
-Calendar actions include:
-- Scheduling meetings, classes, or events
-Analyze the query and respond with a JSON object containing a boolean field 'need_calendar_action'.
-Set it to true if the query requires calendar action, false otherwise.
-                """,
-            ),
-            ("user", "Query: {query}"),
-        ]
-    )
-    chain = prompt | llm | JsonOutputParser()
+    chain = get_node_runtime().calendar_check_chain
 
-    response = await chain.ainvoke({"query": state["query"]})
+    speculation = speculate_response("teacher_node", state, config)
+    try:
+        # Out of time: assume no calendar action and answer directly
+        response = await within_time_left(
+            chain.ainvoke({"query": state["query"]}), config, "calendar_check", {}
+        )
+    except BaseException:
+        if speculation is not None:
+            speculation.discard()
+        raise
 
     if response.get("need_calendar_action"):
+        if speculation is not None:
+            speculation.discard()
         return Command(goto="calendar_node", update=state)
     else:
         return Command(goto="response_node", update=state)
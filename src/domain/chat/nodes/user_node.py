@@ -1,44 +1,105 @@
-from langchain_openai import ChatOpenAI
+import asyncio
+import random
 from src.model.chat.state import ChatState
 from langgraph.types import Command
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.runnables import RunnableConfig
+from src.core.configs import (
+    INTENT_MODEL_PATH,
+    INTENT_LOG_PATH,
+    INTENT_LOG_MAX_BYTES,
+    INTENT_CONFIDENCE_THRESHOLD,
+    INTENT_SHADOW_SAMPLE_RATE,
+)
+from src.core.utility.logging_utils import get_logger
+from src.core.utility.metrics import metrics
+from src.core.utility.tasks import spawn_detached
+from src.domain.chat.nodes.response_node import speculate_response
+from src.domain.chat.runtime import get_node_runtime
+from src.tools.chat_runner.run_context import within_time_left
+from src.tools.intent_classifier import load_classifier, log_labelled_query
 
+logger = get_logger(__name__)
 
-async def user_node(state: ChatState):
+intent_decisions = metrics.counter(
+    "intent_decisions_total", "user_node routing decisions by path (fast, llm)"
+)
+intent_fast_path_checks = metrics.counter(
+    "intent_fast_path_checks_total",
+    "Sampled fast-path decisions re-checked by the LLM (agree, disagree)",
+)
+
+classifier = load_classifier(INTENT_MODEL_PATH)
+
+
+async def classify_with_llm(query: str) -> str:
+    """Classify the query intent with gpt-4o-mini."""
+    response = await get_node_runtime().intent_chain.ainvoke({"query": query})
+
+    return response.get("intent")
+
+
+async def log_label(query: str, intent: str):
+    """Add an LLM-labelled query to the training log off the event loop."""
+    try:
+        await asyncio.to_thread(
+            log_labelled_query, INTENT_LOG_PATH, query, intent, INTENT_LOG_MAX_BYTES
+        )
+    except OSError as e:
+        logger.warning(f"Could not log labelled query: {e}")
+
+
+async def shadow_check(query: str, predicted: str):
+    """Compare a fast-path decision against the LLM to track its accuracy."""
+    try:
+        intent = await classify_with_llm(query)
+    except Exception as e:
+        logger.warning(f"Intent shadow check failed: {e}")
+        return
+    intent_fast_path_checks.inc(outcome="agree" if intent == predicted else "disagree")
+    await log_label(query, intent)
+
+
+async def user_node(state: ChatState, config: RunnableConfig):
     """
     User node for the chat bot.
+
+    Routes with the local intent classifier when it is confident enough and
+    falls back to the LLM otherwise, or to the local guess if the LLM does
+    not answer within the node's time slice. LLM-labelled queries are logged
+    as training data for the local model.
     """
 
     if state["lecture_id"] or state["video_url"]:
         return Command(goto="course_scrapper_node", update=state)
 
-    llm = ChatOpenAI(
-        model="gpt-4o-mini",
-        streaming=False,
-    )
-
-    prompt = ChatPromptTemplate.from_messages(
-        [
-            (
-                "system",
-                """You are a user intent classifier that classifies the user's intent based on the query.
-                The user's intent can be one of the following three literals:
-                - "schedule": If the query is about scheduling a daily reminder or a one day reminder for a lecture or a course
-                - "course_planner": If the query is about planning a course or a document for a study plan
-                - "other": For any other query that doesn't fit the above categories
-                
-                Respond with a JSON object containing a field called "intent" with one of these three literal values: "schedule", "course_planner", or "other".
-                """,
-            ),
-            ("user", "Query: {query}"),
-        ]
-    )
-    chain = prompt | llm | JsonOutputParser()
-
-    response = await chain.ainvoke({"query": state["query"]})
-
-    value = response.get("intent")
+    query = state["query"]
+    prediction = classifier.classify(query)
+
+    if prediction.confidence >= INTENT_CONFIDENCE_THRESHOLD:
+        intent_decisions.inc(path="fast", source=prediction.source)
+        value = prediction.intent
+        if random.random() < INTENT_SHADOW_SAMPLE_RATE:
+            spawn_detached(shadow_check(query, value))
+    else:
+        intent_decisions.inc(path="llm")
+        # Most queries end up at response_node, so start answering while
+        # the LLM decides; the speculation is dropped on any other route.
+        speculation = speculate_response("user_node", state, config)
+        try:
+            value = await within_time_left(
+                classify_with_llm(query), config, "intent_llm"
+            )
+        except BaseException:
+            if speculation is not None:
+                speculation.discard()
+            raise
+        if value is None:
+            # Out of time: go with the local guess
+            value = prediction.intent
+        else:
+            await log_label(query, value)
+        if speculation is not None and value in ("schedule", "course_planner"):
+            speculation.discard()
 
     if value == "schedule":
         return Command(goto="scheduler_node", update=state)
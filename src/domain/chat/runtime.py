@@ -0,0 +1,139 @@
+from itertools import combinations
+from typing import Optional
+from langchain.agents import AgentExecutor, create_tool_calling_agent
+from langchain_core.output_parsers import JsonOutputParser, StrOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import Runnable
+from src.core.utility.logging_utils import get_logger
+from src.domain.chat.prompts import (
+    INTENT_PROMPT,
+    CALENDAR_CHECK_PROMPT,
+    QUIZ_INTENT_PROMPT,
+    EXTRACT_CONTEXT_PROMPT,
+    QUIZ_PROMPT,
+    TOPIC_PROMPT,
+    PLANNER_PROMPT,
+    SCHEDULED_ACTION_PROMPT,
+    RESPONSE_SYSTEM_PROMPT,
+    RESPONSE_SECTION_PROMPTS,
+)
+from src.domain.chat.tools import create_scheduled_action_tools
+from src.services.llm.client_pool import get_chat_model
+
+logger = get_logger(__name__)
+
+RESPONSE_MODEL = "gpt-4o"
+
+_runtime: Optional["NodeRuntime"] = None
+
+
+class NodeRuntime:
+    """
+    Chains of the chat nodes, compiled once with the graph. response_node
+    gets one chain per combination of context sections.
+    """
+
+    def __init__(self):
+        json_parser = JsonOutputParser()
+        self.intent_chain = INTENT_PROMPT | get_chat_model("gpt-4o-mini") | json_parser
+        self.calendar_check_chain = (
+            CALENDAR_CHECK_PROMPT
+            | get_chat_model("gpt-4.1-mini", temperature=0.1, streaming=True)
+            | json_parser
+        )
+        self.quiz_intent_chain = (
+            QUIZ_INTENT_PROMPT | get_chat_model("gpt-4o-mini") | json_parser
+        )
+        self.extract_context_chain = (
+            EXTRACT_CONTEXT_PROMPT | get_chat_model("gpt-4o") | json_parser
+        )
+        self.quiz_chain = (
+            QUIZ_PROMPT
+            | get_chat_model("gpt-4o", temperature=0.1, streaming=True)
+            | json_parser
+        )
+        self.topic_chain = (
+            TOPIC_PROMPT | get_chat_model("gpt-4o", temperature=0.3) | json_parser
+        )
+        self.planner_chain = (
+            PLANNER_PROMPT | get_chat_model("gpt-4o", temperature=0.3) | json_parser
+        )
+
+        response_llm = get_chat_model(RESPONSE_MODEL, streaming=True)
+        names = tuple(RESPONSE_SECTION_PROMPTS)
+        self.response_chains: dict[tuple[str, ...], Runnable] = {}
+        for size in range(len(names) + 1):
+            for sections in combinations(names, size):
+                system_prompt = RESPONSE_SYSTEM_PROMPT + "".join(
+                    RESPONSE_SECTION_PROMPTS[name] for name in sections
+                )
+                prompt = ChatPromptTemplate.from_messages(
+                    [
+                        ("system", system_prompt),
+                        ("user", "{query}"),
+                    ]
+                )
+                chain = prompt | response_llm | StrOutputParser()
+                self.response_chains[sections] = chain
+
+        self.scheduler_executor = self._build_scheduler_executor()
+
+    @staticmethod
+    def _build_scheduler_executor() -> Optional[AgentExecutor]:
+        try:
+            tools = create_scheduled_action_tools()
+            llm = get_chat_model("gpt-4o", temperature=0)
+            agent = create_tool_calling_agent(llm, tools, SCHEDULED_ACTION_PROMPT)
+        except Exception as e:
+            logger.error(f"Scheduler agent could not be built: {e}")
+            return None
+        return AgentExecutor(
+            agent=agent,
+            tools=tools,
+            max_iterations=3,
+            early_stopping_method="force",
+            handle_parsing_errors=True,
+            max_execution_time=60,
+        )
+
+    def response_chain(self, sections: tuple[str, ...]) -> Runnable:
+        """
+        The answer chain for a system prompt with ``sections``, given in
+        ``RESPONSE_SECTION_PROMPTS`` order.
+        """
+        return self.response_chains[sections]
+
+    def scheduler_agent(self, max_execution_time: float) -> AgentExecutor:
+        """The scheduler agent, stopping after ``max_execution_time`` seconds."""
+        if self.scheduler_executor is None:
+            raise RuntimeError("Scheduler agent is not available")
+        # Shallow copy: the compiled agent and tools are shared
+        return self.scheduler_executor.model_copy(
+            update={"max_execution_time": max_execution_time}
+        )
+
+
+def compile_node_runtime() -> NodeRuntime:
+    """Compile the chat nodes' chains; called when the chat graph is built."""
+    global _runtime
+
+    _runtime = NodeRuntime()
+    return _runtime
+
+
+def get_node_runtime() -> NodeRuntime:
+    """
+    Return the compiled node runtime, compiling it first if no graph has
+    been built yet (e.g. in a background refresh or a script).
+    """
+    if _runtime is None:
+        return compile_node_runtime()
+    return _runtime
+
+
+__all__ = [
+    "RESPONSE_MODEL",
+    "NodeRuntime",
+    "compile_node_runtime",
+    "get_node_runtime",
+]
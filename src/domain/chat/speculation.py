@@ -0,0 +1,97 @@
+import asyncio
+from typing import AsyncIterator, Optional
+from langchain_core.runnables import Runnable
+from src.core.utility.logging_utils import get_logger
+from src.core.utility.metrics import metrics
+from src.core.utility.tasks import spawn_detached
+
+logger = get_logger(__name__)
+
+speculations = metrics.counter(
+    "speculation_total", "Speculative responses by route and outcome (hit, miss)"
+)
+wasted_tokens = metrics.counter(
+    "speculation_wasted_tokens_total",
+    "Tokens generated by speculative responses that were discarded",
+)
+
+
+class SpeculativeResponse:
+    """
+    A response generation started before routing has finished.
+
+    Chunks are buffered while the router decides. ``commit`` hands the
+    buffered and remaining chunks to ``response_node``; ``discard`` cancels
+    the generation and counts what it had already produced as waste.
+    """
+
+    def __init__(self, route: str, chain: Runnable, inputs: dict):
+        self.route = route
+        self.chain = chain
+        self.inputs = inputs
+        self.chunks: list[str] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self._signal = asyncio.Event()
+        self._settled = False
+        # Kept out of the graph's event stream; committed chunks are
+        # re-emitted by response_node.
+        self.task = spawn_detached(self._run())
+
+    async def _run(self):
+        try:
+            async for chunk in self.chain.astream(self.inputs):
+                self.chunks.append(chunk)
+                self._notify()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done = True
+            self._notify()
+
+    def _notify(self):
+        self._signal.set()
+        self._signal = asyncio.Event()
+
+    def matches(self, inputs: dict) -> bool:
+        """True if the speculation was started with these prompt inputs."""
+        return self.error is None and self.inputs == inputs
+
+    def commit(self) -> AsyncIterator[str]:
+        """Count a hit and return the buffered-then-live chunk stream."""
+        self._settle("hit")
+        return self._stream()
+
+    async def _stream(self) -> AsyncIterator[str]:
+        cursor = 0
+        try:
+            while True:
+                signal = self._signal
+                while cursor < len(self.chunks):
+                    cursor += 1
+                    yield self.chunks[cursor - 1]
+                if self.done:
+                    if self.error is not None:
+                        raise self.error
+                    return
+                await signal.wait()
+        finally:
+            if not self.done:
+                self.task.cancel()
+
+    def discard(self):
+        """Cancel the speculation and count its tokens as wasted."""
+        self.task.cancel()
+        if not self._settled:
+            self._settle("miss")
+            wasted_tokens.inc(len(self.chunks), route=self.route)
+
+    def _settle(self, outcome: str):
+        self._settled = True
+        speculations.inc(route=self.route, outcome=outcome)
+        logger.debug(f"Speculative response for {self.route}: {outcome}")
+
+
+__all__ = ["SpeculativeResponse"]
@@ -1,6 +1,6 @@
 from langgraph.types import Command
 from src.models.desc_agent.descstate import DESCSTATE
-from langchain_openai import ChatOpenAI
+from src.services.llm.client_pool import get_chat_model
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 from langgraph.graph import END
@@ -11,11 +11,7 @@ async def desc_gen_node(state: DESCSTATE):
     Description generation node for the chat bot.
     """
 
-    llm = ChatOpenAI(
-        model="gpt-5-mini",
-        temperature=0.7,
-        streaming=True,
-    )
+    llm = get_chat_model("gpt-5-mini", temperature=0.7, streaming=True)
     prompt = ChatPromptTemplate.from_messages(
         [
             (
@@ -1,5 +1,6 @@
 from langgraph.types import Command
 from src.models.desc_agent.descstate import DESCSTATE
+from src.tools.youtube_transcriber.captions import parse_captions, plain_text
 from src.tools.youtube_transcriber.transcriber import *
 
 
@@ -8,6 +9,7 @@ async def yt_extracter(state: DESCSTATE):
     YT extracter node for the chat bot.
     """
 
-    state.yt_desc = await get_transcript(state.yt_link)
+    captions = await get_transcript(state.yt_link)
+    state.yt_desc = plain_text(parse_captions(captions)) or captions
 
     return Command(goto="desc_gen_node", update=state)
@@ -0,0 +1,123 @@
+import hashlib
+import time
+from typing import Optional
+from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+from src.core.utility.logging_utils import get_logger
+from src.core.utility.metrics import metrics
+from src.services.llm.client_pool import get_chat_model
+from src.services.qdrant.course import get_lecture_payload, set_lecture_payload
+
+logger = get_logger(__name__)
+
+digest_builds = metrics.counter(
+    "lecture_digest_builds_total", "Lecture digest builds by outcome"
+)
+
+
+def transcript_hash(transcript: str) -> str:
+    """Version of a transcript; a digest is rebuilt when it changes."""
+    return hashlib.sha256(transcript.encode("utf-8")).hexdigest()
+
+
+async def generate_digest(material: str) -> dict:
+    """Summarize timestamped lecture material into a digest."""
+    llm = get_chat_model("gpt-4o", temperature=0.1)
+
+    prompt = ChatPromptTemplate.from_messages(
+        [
+            (
+                "system",
+                """You write compact study digests of lectures from their timestamped transcript.
+                The digest should be in the following format:
+                {{
+                    "summary": "What the lecture covers, in at most 150 words",
+                    "key_concepts": ["The main ideas, one short sentence each"],
+                    "glossary": [
+                        {{
+                            "term": "A technical term used in the lecture",
+                            "definition": "Its meaning in the lecture, in one sentence"
+                        }}
+                    ],
+                    "chapters": [
+                        {{
+                            "start": "The start time as it appears in the transcript",
+                            "title": "The chapter title"
+                        }}
+                    ]
+                }}
+                """,
+            ),
+            ("user", "Lecture transcript: {material}"),
+        ]
+    )
+    chain = prompt | llm | JsonOutputParser()
+    response = await chain.ainvoke({"material": material})
+
+    return {
+        "summary": response.get("summary") or "",
+        "key_concepts": response.get("key_concepts") or [],
+        "glossary": response.get("glossary") or [],
+        "chapters": response.get("chapters") or [],
+    }
+
+
+async def build_digest(lecture_id: str, material: str, version: str) -> bool:
+    """
+    Build and store the digest of a lecture unless the stored one already
+    matches transcript ``version``. Returns whether a new digest was built.
+    """
+    payload = await get_lecture_payload(lecture_id)
+    current = (payload or {}).get("digest")
+    if current and current.get("transcript_hash") == version:
+        digest_builds.inc(outcome="current")
+        return False
+
+    digest = await generate_digest(material)
+    digest.update({"transcript_hash": version, "generated_at": time.time()})
+    await set_lecture_payload(lecture_id, {"digest": digest})
+    digest_builds.inc(outcome="built")
+    logger.info(f"Stored digest for lecture {lecture_id}")
+    return True
+
+
+async def load_digest(lecture_id: str) -> Optional[dict]:
+    """Return the lecture's stored digest, or None if it has none yet."""
+    payload = await get_lecture_payload(lecture_id)
+    return (payload or {}).get("digest")
+
+
+def render_digest(digest: dict) -> str:
+    """A digest as prompt text."""
+    sections = [f"Summary: {digest.get('summary', '')}"]
+    if digest.get("key_concepts"):
+        sections.append(
+            "Key concepts:\n"
+            + "\n".join(f"- {concept}" for concept in digest["key_concepts"])
+        )
+    if digest.get("glossary"):
+        sections.append(
+            "Glossary:\n"
+            + "\n".join(
+                f"- {entry.get('term', '')}: {entry.get('definition', '')}"
+                for entry in digest["glossary"]
+            )
+        )
+    if digest.get("chapters"):
+        sections.append(
+            "Chapters:\n"
+            + "\n".join(
+                f"- [{chapter.get('start', '')}] {chapter.get('title', '')}"
+                for chapter in digest["chapters"]
+            )
+        )
+    return "\n".join(sections)
+
+
+__all__ = [
+    "transcript_hash",
+    "generate_digest",
+    "build_digest",
+    "load_digest",
+    "render_digest",
+]
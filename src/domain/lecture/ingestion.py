@@ -0,0 +1,82 @@
+import asyncio
+from typing import Optional
+from src.core.configs import LECTURE_CHUNK_CHARS
+from src.core.utility.logging_utils import get_logger
+from src.core.utility.metrics import metrics
+from src.core.utility.tasks import spawn_detached
+from src.domain.lecture.digest import build_digest, load_digest, transcript_hash
+from src.domain.lecture.quiz_bank import build_quiz_bank
+from src.services.qdrant.course import get_youtube_url
+from src.services.qdrant.response_cache import lecture_scope
+from src.tools.youtube_transcriber.captions import (
+    chunk_segments,
+    parse_captions,
+    plain_text,
+    render_chunks,
+)
+from src.tools.youtube_transcriber.transcriber import get_transcript
+
+logger = get_logger(__name__)
+
+ingestions = metrics.counter(
+    "lecture_ingestions_total", "Background lecture ingestions by outcome"
+)
+
+# lecture_id -> running ingestion, so a lecture is never processed twice at once
+_ingestion_tasks: dict[str, asyncio.Task] = {}
+
+
+async def ingest_lecture(lecture_id: str, video_url: Optional[str] = None):
+    """
+    Index a lecture's transcript and build its quiz bank and digest. Cached
+    answers from an earlier version of the transcript are dropped.
+    """
+    from main import lecture_chunk_store, response_cache
+
+    try:
+        if video_url is None:
+            video_url = await get_youtube_url(lecture_id)
+        previous = (await load_digest(lecture_id) or {}).get("transcript_hash")
+        transcript = await get_transcript("https://youtu.be/" + str(video_url))
+        version = transcript_hash(transcript)
+        segments = parse_captions(transcript)
+        chunks = chunk_segments(segments, LECTURE_CHUNK_CHARS)
+        await asyncio.gather(
+            lecture_chunk_store.index_lecture(lecture_id, chunks),
+            build_quiz_bank(lecture_id, plain_text(segments) or transcript),
+            build_digest(
+                lecture_id,
+                render_chunks(chunks) or transcript,
+                version,
+            ),
+        )
+    except Exception as e:
+        ingestions.inc(outcome="failed")
+        logger.error(f"Ingestion of lecture {lecture_id} failed: {e}")
+        return
+    ingestions.inc(outcome="ok")
+
+    if response_cache is not None and previous and previous != version:
+        try:
+            await response_cache.invalidate_scope(lecture_scope(lecture_id, previous))
+        except Exception as e:
+            logger.warning(f"Could not invalidate cached answers of {lecture_id}: {e}")
+
+
+def schedule_lecture_ingestion(
+    lecture_id: str, video_url: Optional[str] = None
+) -> bool:
+    """
+    Run :func:`ingest_lecture` in the background. Returns ``False`` if the
+    lecture is already being ingested.
+    """
+    if lecture_id in _ingestion_tasks:
+        return False
+
+    task = spawn_detached(ingest_lecture(lecture_id, video_url))
+    _ingestion_tasks[lecture_id] = task
+    task.add_done_callback(lambda _: _ingestion_tasks.pop(lecture_id, None))
+    return True
+
+
+__all__ = ["ingest_lecture", "schedule_lecture_ingestion"]
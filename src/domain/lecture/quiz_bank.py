@@ -0,0 +1,75 @@
+import random
+import time
+from typing import Optional
+from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+from src.core.configs import QUIZ_BANK_SIZE, QUIZ_SAMPLE_SIZE
+from src.core.utility.logging_utils import get_logger
+from src.services.llm.client_pool import get_chat_model
+from src.services.qdrant.course import get_lecture_payload, set_lecture_payload
+
+logger = get_logger(__name__)
+
+
+async def generate_questions(context: str, count: int = QUIZ_BANK_SIZE) -> list[dict]:
+    """Generate ``count`` multiple-choice questions covering ``context``."""
+    llm = get_chat_model("gpt-4o", temperature=0.1)
+
+    prompt = ChatPromptTemplate.from_messages(
+        [
+            (
+                "system",
+                """You are a helpful assistant that writes quiz questions for a lecture.
+                Write {count} multiple-choice questions that together cover the whole lecture,
+                from basic recall to applying the ideas. Avoid near-duplicate questions.
+                The quiz should be in the following format:
+                {{
+                    "questions": [
+                        {{
+                            "question": "The question",
+                            "options": ["The options"],
+                            "answer": "The answer",
+                        }}
+                    ]
+                }}
+                """,
+            ),
+            ("user", "Lecture transcript: {context}"),
+        ]
+    )
+    chain = prompt | llm | JsonOutputParser()
+    response = await chain.ainvoke({"count": count, "context": context})
+
+    return [
+        question
+        for question in response.get("questions", [])
+        if question.get("question") and question.get("options")
+    ]
+
+
+async def build_quiz_bank(lecture_id: str, transcript: str) -> int:
+    """Generate the quiz bank for a lecture and store it; returns its size."""
+    questions = await generate_questions(transcript)
+    await set_lecture_payload(
+        lecture_id,
+        {"quiz_bank": {"questions": questions, "generated_at": time.time()}},
+    )
+    logger.info(f"Stored {len(questions)} quiz questions for lecture {lecture_id}")
+    return len(questions)
+
+
+async def load_quiz_bank(lecture_id: str) -> Optional[list[dict]]:
+    """Return the lecture's stored quiz questions, or None if it has none yet."""
+    payload = await get_lecture_payload(lecture_id)
+    bank = (payload or {}).get("quiz_bank")
+    if not bank or not bank.get("questions"):
+        return None
+    return bank["questions"]
+
+
+def sample_quiz(questions: list[dict], size: int = QUIZ_SAMPLE_SIZE) -> dict:
+    """Pick a random quiz of ``size`` questions from the bank."""
+    return {"questions": random.sample(questions, min(size, len(questions)))}
+
+
+__all__ = ["generate_questions", "build_quiz_bank", "load_quiz_bank", "sample_quiz"]
@@ -0,0 +1,15 @@
+from pydantic import BaseModel, Field
+
+
+class QuizQuestion(BaseModel):
+    """A multiple-choice quiz question."""
+
+    question: str = Field(..., description="The question")
+    options: list[str] = Field(..., min_length=2, description="Answer options")
+    answer: str = Field(..., description="The correct answer")
+
+
+class Quiz(BaseModel):
+    """A quiz as produced by quiz_node."""
+
+    questions: list[QuizQuestion] = Field(..., min_length=1, description="Questions")
@@ -15,4 +15,10 @@ class ChatState(TypedDict):
         Optional[list[dict]], "Search results"
     ]
     course_data: Optional[dict] = Annotated[Optional[dict], "Course data"]
+    lecture_version: Optional[str] = Annotated[
+        Optional[str], "Transcript hash of the lecture material"
+    ]
     need_quiz: Optional[bool] = Annotated[Optional[bool], "Need quiz"]
+    history: Optional[str] = Annotated[
+        Optional[str], "Conversation summary and recent turns"
+    ]
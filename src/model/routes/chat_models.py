@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from typing import Literal, Optional
+from pydantic import BaseModel, Field
+
+
+class ChatRequest(BaseModel):
+    """Request body for `POST /chat`."""
+
+    query: str = Field(..., description="User query")
+    video_url: Optional[str] = Field(None, description="YouTube video URL")
+    lecture_id: Optional[str] = Field(None, description="Lecture ID")
+
+
+class ChatSocketMessage(BaseModel):
+    """Client message on `/ws/chat`: start (`chat`) or cancel a stream."""
+
+    type: Literal["chat", "cancel"] = Field(..., description="Message type")
+    request_id: str = Field(..., description="Client-chosen id of the stream")
+    query: Optional[str] = Field(None, description="User query (chat only)")
+    video_url: Optional[str] = Field(None, description="YouTube video URL")
+    lecture_id: Optional[str] = Field(None, description="Lecture ID")
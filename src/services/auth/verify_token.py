@@ -5,12 +5,12 @@ from typing import Optional, Dict
 from src.core.configs import JWT_SECRET_KEY, JWT_ALGORITHM
 
 
-async def verify_token(authorization: Optional[str] = Header(None)) -> Dict:
+def decode_token(authorization: Optional[str]) -> Dict:
     """
-    Verify JWT token from Authorization header
+    Decode and validate a JWT, with or without the ``Bearer `` prefix
 
     Args:
-        authorization: The Authorization header value
+        authorization: The Authorization header value or bare token
 
     Returns:
         Dict: The decoded token payload
@@ -42,3 +42,19 @@ async def verify_token(authorization: Optional[str] = Header(None)) -> Dict:
         )
     except Exception as e:
         raise HTTPException(status_code=401, detail=f"Authentication error: {str(e)}")
+
+
+async def verify_token(authorization: Optional[str] = Header(None)) -> Dict:
+    """
+    Verify JWT token from Authorization header
+
+    Args:
+        authorization: The Authorization header value
+
+    Returns:
+        Dict: The decoded token payload
+
+    Raises:
+        HTTPException: If token is invalid or missing
+    """
+    return decode_token(authorization)
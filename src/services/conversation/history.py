@@ -0,0 +1,135 @@
+import asyncio
+from typing import Optional
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+from src.core.configs import (
+    CONVERSATION_WINDOW_TURNS,
+    CONVERSATION_TURN_MAX_CHARS,
+    CONVERSATION_SUMMARY_MAX_WORDS,
+)
+from src.core.utility.logging_utils import get_logger
+from src.core.utility.metrics import metrics
+from src.core.utility.tasks import spawn_detached
+from src.services.conversation.store import Turn, get_conversation_store
+from src.services.llm.client_pool import get_chat_model
+
+logger = get_logger(__name__)
+
+history_chars = metrics.histogram(
+    "conversation_history_chars", "Size of the history window added to a prompt"
+)
+compactions = metrics.counter(
+    "conversation_compactions_total", "Turns folded into a rolling summary"
+)
+
+_compact_locks: dict[str, asyncio.Lock] = {}
+
+
+def _clip(text: str, limit: int = CONVERSATION_TURN_MAX_CHARS) -> str:
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+def conversation_id_for(
+    user_id: str, lecture_id: Optional[str] = None, video_url: Optional[str] = None
+) -> str:
+    """A user's conversation about a lecture or video, or their general chat."""
+    return f"{user_id}:{lecture_id or video_url or 'general'}"
+
+
+def render_history(summary: str, turns: list[Turn]) -> str:
+    """Format the rolling summary and window turns for a prompt."""
+    lines = []
+    if summary:
+        lines.append(f"Summary of the earlier conversation: {summary}")
+    for turn in turns:
+        lines.append(f"User: {_clip(turn.query)}")
+        lines.append(f"Assistant: {_clip(turn.reply)}")
+    return "\n".join(lines)
+
+
+async def load_history(conversation_id: str) -> str:
+    """
+    Return the conversation's history window: the rolling summary plus at
+    most ``CONVERSATION_WINDOW_TURNS`` recent turns, each clipped, so its
+    size stays bounded however long the conversation gets.
+    """
+    store = get_conversation_store()
+    summary, summarized_seq = await store.get_summary(conversation_id)
+    turns = await store.recent_turns(
+        conversation_id, summarized_seq, CONVERSATION_WINDOW_TURNS
+    )
+    history = render_history(summary, turns)
+    history_chars.observe(len(history))
+    return history
+
+
+async def record_turn(conversation_id: str, query: str, reply: str) -> Turn:
+    """
+    Persist a finished turn, its reply clipped; turns that fall out of the
+    window are summarized in the background.
+    """
+    store = get_conversation_store()
+    turn = await store.append_turn(conversation_id, query, _clip(reply))
+
+    _, summarized_seq = await store.get_summary(conversation_id)
+    if turn.seq - summarized_seq > CONVERSATION_WINDOW_TURNS:
+        spawn_detached(compact_history(conversation_id))
+    return turn
+
+
+async def summarize(summary: str, turns: list[Turn]) -> str:
+    """Fold ``turns`` into the running ``summary`` with gpt-4o-mini."""
+    llm = get_chat_model("gpt-4o-mini", temperature=0)
+
+    prompt = ChatPromptTemplate.from_messages(
+        [
+            (
+                "system",
+                """You maintain a running summary of a conversation between a student and Vellora, a learning assistant.
+                Update the summary with the new turns. Keep facts about the student (goals, level, schedule,
+                lectures and topics discussed) and open questions; drop small talk.
+                Keep it under {max_words} words and return only the summary.
+                """,
+            ),
+            ("user", "Current summary:\n{summary}\n\nNew turns:\n{turns}"),
+        ]
+    )
+    chain = prompt | llm | StrOutputParser()
+    return await chain.ainvoke(
+        {
+            "max_words": CONVERSATION_SUMMARY_MAX_WORDS,
+            "summary": summary or "(none)",
+            "turns": render_history("", turns),
+        }
+    )
+
+
+async def compact_history(conversation_id: str):
+    """Summarize the turns that no longer fit in the conversation's window."""
+    lock = _compact_locks.setdefault(conversation_id, asyncio.Lock())
+    try:
+        async with lock:
+            store = get_conversation_store()
+            summary, summarized_seq = await store.get_summary(conversation_id)
+            upto_seq = await store.last_seq(conversation_id) - CONVERSATION_WINDOW_TURNS
+            turns = await store.turns_between(conversation_id, summarized_seq, upto_seq)
+            if not turns:
+                return
+            summary = await summarize(summary, turns)
+            # Hard cap in case the model ignores the word limit.
+            summary = _clip(summary.strip(), CONVERSATION_SUMMARY_MAX_WORDS * 8)
+            await store.set_summary(conversation_id, summary, turns[-1].seq)
+            compactions.inc(len(turns))
+    except Exception as e:
+        logger.warning(f"History compaction failed for {conversation_id}: {e}")
+    finally:
+        if not lock.locked():
+            _compact_locks.pop(conversation_id, None)
+
+
+__all__ = [
+    "conversation_id_for",
+    "render_history",
+    "load_history",
+    "record_turn",
+]
@@ -0,0 +1,312 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Optional
+from src.core.configs import (
+    CONVERSATION_BACKEND,
+    CONVERSATION_SQLITE_PATH,
+    CONVERSATION_REDIS_URL,
+)
+from src.core.utility.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class Turn:
+    """One user query and the assistant's reply."""
+
+    seq: int
+    query: str
+    reply: str
+    created_at: float = field(default_factory=time.time)
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "seq": self.seq,
+                "query": self.query,
+                "reply": self.reply,
+                "created_at": self.created_at,
+            }
+        )
+
+    @classmethod
+    def from_json(cls, raw) -> "Turn":
+        return cls(**json.loads(raw))
+
+
+class ConversationStore(ABC):
+    """
+    Conversation turns and a rolling summary of the turns that have left
+    the history window. Summarized turns are dropped.
+    """
+
+    @abstractmethod
+    async def append_turn(self, conversation_id: str, query: str, reply: str) -> Turn:
+        """Append a turn and return it with its sequence number."""
+
+    @abstractmethod
+    async def recent_turns(
+        self, conversation_id: str, after_seq: int, limit: int
+    ) -> list[Turn]:
+        """The last ``limit`` turns with a sequence number above ``after_seq``."""
+
+    @abstractmethod
+    async def turns_between(
+        self, conversation_id: str, after_seq: int, upto_seq: int
+    ) -> list[Turn]:
+        """Turns with ``after_seq < seq <= upto_seq``, oldest first."""
+
+    @abstractmethod
+    async def last_seq(self, conversation_id: str) -> int:
+        pass
+
+    @abstractmethod
+    async def get_summary(self, conversation_id: str) -> tuple[str, int]:
+        """Return ``(summary, summarized_seq)``; ``("", 0)`` for a new conversation."""
+
+    @abstractmethod
+    async def set_summary(
+        self, conversation_id: str, summary: str, summarized_seq: int
+    ):
+        """Store the summary and drop the turns up to ``summarized_seq``."""
+
+    async def close(self):
+        pass
+
+
+class SQLiteConversationStore(ConversationStore):
+    """Local single-file store; queries run on a worker thread."""
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(
+            """
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            CREATE TABLE IF NOT EXISTS turns (
+                conversation_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                query TEXT NOT NULL,
+                reply TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (conversation_id, seq)
+            );
+            CREATE TABLE IF NOT EXISTS summaries (
+                conversation_id TEXT PRIMARY KEY,
+                summary TEXT NOT NULL,
+                summarized_seq INTEGER NOT NULL
+            );
+            """
+        )
+
+    def _execute(self, sql: str, params: tuple = (), fetch: bool = False):
+        with self._lock:
+            cursor = self._db.execute(sql, params)
+            rows = cursor.fetchall() if fetch else None
+            self._db.commit()
+            return rows
+
+    async def _run(self, sql: str, params: tuple = (), fetch: bool = False):
+        return await asyncio.to_thread(self._execute, sql, params, fetch)
+
+    @staticmethod
+    def _turn(row) -> Turn:
+        return Turn(*row)
+
+    def _append(self, conversation_id: str, turn: Turn) -> Turn:
+        with self._lock:
+            (last,) = self._db.execute(
+                "SELECT COALESCE(MAX(seq), 0) FROM turns WHERE conversation_id = ?",
+                (conversation_id,),
+            ).fetchone()
+            turn.seq = last + 1
+            self._db.execute(
+                "INSERT INTO turns VALUES (?, ?, ?, ?, ?)",
+                (conversation_id, turn.seq, turn.query, turn.reply, turn.created_at),
+            )
+            self._db.commit()
+        return turn
+
+    async def append_turn(self, conversation_id: str, query: str, reply: str) -> Turn:
+        return await asyncio.to_thread(
+            self._append, conversation_id, Turn(0, query, reply)
+        )
+
+    async def recent_turns(
+        self, conversation_id: str, after_seq: int, limit: int
+    ) -> list[Turn]:
+        rows = await self._run(
+            "SELECT seq, query, reply, created_at FROM turns "
+            "WHERE conversation_id = ? AND seq > ? ORDER BY seq DESC LIMIT ?",
+            (conversation_id, after_seq, limit),
+            True,
+        )
+        return [self._turn(row) for row in reversed(rows)]
+
+    async def turns_between(
+        self, conversation_id: str, after_seq: int, upto_seq: int
+    ) -> list[Turn]:
+        rows = await self._run(
+            "SELECT seq, query, reply, created_at FROM turns "
+            "WHERE conversation_id = ? AND seq > ? AND seq <= ? ORDER BY seq",
+            (conversation_id, after_seq, upto_seq),
+            True,
+        )
+        return [self._turn(row) for row in rows]
+
+    async def last_seq(self, conversation_id: str) -> int:
+        rows = await self._run(
+            "SELECT COALESCE(MAX(seq), 0) FROM turns WHERE conversation_id = ?",
+            (conversation_id,),
+            True,
+        )
+        return rows[0][0]
+
+    async def get_summary(self, conversation_id: str) -> tuple[str, int]:
+        rows = await self._run(
+            "SELECT summary, summarized_seq FROM summaries WHERE conversation_id = ?",
+            (conversation_id,),
+            True,
+        )
+        return tuple(rows[0]) if rows else ("", 0)
+
+    def _set_summary(self, conversation_id: str, summary: str, summarized_seq: int):
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO summaries (conversation_id, summary, summarized_seq) "
+                "VALUES (?, ?, ?) "
+                "ON CONFLICT(conversation_id) DO UPDATE SET "
+                "summary = excluded.summary, summarized_seq = excluded.summarized_seq",
+                (conversation_id, summary, summarized_seq),
+            )
+            self._db.execute(
+                "DELETE FROM turns WHERE conversation_id = ? AND seq <= ?",
+                (conversation_id, summarized_seq),
+            )
+            self._db.commit()
+
+    async def set_summary(
+        self, conversation_id: str, summary: str, summarized_seq: int
+    ):
+        await asyncio.to_thread(
+            self._set_summary, conversation_id, summary, summarized_seq
+        )
+
+    async def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class RedisConversationStore(ConversationStore):
+    """
+    Shared store for multi-process deployments.
+
+    Turns are a per-conversation list (``conv:<id>:turns``) whose index is
+    the sequence number minus one; the summary lives in ``conv:<id>:summary``
+    and summarized turns are blanked so the indexes stay valid.
+    """
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+
+        self._redis = redis.from_url(url)
+
+    @staticmethod
+    def _turns_key(conversation_id: str) -> str:
+        return f"conv:{conversation_id}:turns"
+
+    @staticmethod
+    def _summary_key(conversation_id: str) -> str:
+        return f"conv:{conversation_id}:summary"
+
+    async def append_turn(self, conversation_id: str, query: str, reply: str) -> Turn:
+        key = self._turns_key(conversation_id)
+        # RPUSH on a placeholder claims the sequence number atomically.
+        seq = await self._redis.rpush(key, "")
+        turn = Turn(seq, query, reply)
+        await self._redis.lset(key, seq - 1, turn.to_json())
+        return turn
+
+    async def recent_turns(
+        self, conversation_id: str, after_seq: int, limit: int
+    ) -> list[Turn]:
+        raw = await self._redis.lrange(self._turns_key(conversation_id), -limit, -1)
+        turns = [Turn.from_json(item) for item in raw if item]
+        return [turn for turn in turns if turn.seq > after_seq]
+
+    async def turns_between(
+        self, conversation_id: str, after_seq: int, upto_seq: int
+    ) -> list[Turn]:
+        if upto_seq <= after_seq:
+            return []
+        raw = await self._redis.lrange(
+            self._turns_key(conversation_id), after_seq, upto_seq - 1
+        )
+        return [Turn.from_json(item) for item in raw if item]
+
+    async def last_seq(self, conversation_id: str) -> int:
+        return await self._redis.llen(self._turns_key(conversation_id))
+
+    async def get_summary(self, conversation_id: str) -> tuple[str, int]:
+        data = await self._redis.hgetall(self._summary_key(conversation_id))
+        if not data:
+            return "", 0
+        return data[b"summary"].decode("utf-8"), int(data[b"summarized_seq"])
+
+    async def set_summary(
+        self, conversation_id: str, summary: str, summarized_seq: int
+    ):
+        _, previous_seq = await self.get_summary(conversation_id)
+        key = self._turns_key(conversation_id)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hset(
+                self._summary_key(conversation_id),
+                mapping={"summary": summary, "summarized_seq": summarized_seq},
+            )
+            for index in range(previous_seq, summarized_seq):
+                pipe.lset(key, index, "")
+            await pipe.execute()
+
+    async def close(self):
+        await self._redis.close()
+
+
+_store: Optional[ConversationStore] = None
+
+
+def get_conversation_store() -> ConversationStore:
+    """Return the process-wide store for ``CONVERSATION_BACKEND``."""
+    global _store
+
+    if _store is None:
+        if CONVERSATION_BACKEND == "redis":
+            _store = RedisConversationStore(CONVERSATION_REDIS_URL)
+        else:
+            _store = SQLiteConversationStore(CONVERSATION_SQLITE_PATH)
+        logger.info(f"Conversation store: {CONVERSATION_BACKEND}")
+    return _store
+
+
+async def close_conversation_store():
+    global _store
+
+    if _store is not None:
+        await _store.close()
+        _store = None
+
+
+__all__ = [
+    "Turn",
+    "ConversationStore",
+    "SQLiteConversationStore",
+    "RedisConversationStore",
+    "get_conversation_store",
+    "close_conversation_store",
+]
@@ -0,0 +1,166 @@
+import asyncio
+import os
+from typing import Optional
+import httpx
+from langchain_openai import ChatOpenAI
+from src.core.configs import (
+    LLM_POOL_MAX_CONNECTIONS,
+    LLM_POOL_MAX_KEEPALIVE,
+    LLM_POOL_KEEPALIVE_EXPIRY,
+    LLM_POOL_PREWARM_CONNECTIONS,
+    LLM_HTTP_TIMEOUT,
+)
+from src.core.utility.logging_utils import get_logger
+from src.core.utility.metrics import metrics
+
+logger = get_logger(__name__)
+
+requests_total = metrics.counter(
+    "llm_pool_requests_total", "HTTP requests sent through the shared LLM pool"
+)
+in_flight = metrics.gauge(
+    "llm_pool_in_flight_requests", "LLM HTTP requests currently holding a connection"
+)
+utilization = metrics.gauge(
+    "llm_pool_utilization", "In-flight LLM requests / pool max_connections"
+)
+open_connections = metrics.gauge(
+    "llm_pool_open_connections", "Connections currently open in the LLM pool"
+)
+
+_http_client: Optional[httpx.AsyncClient] = None
+_chat_models: dict[tuple, ChatOpenAI] = {}
+
+
+class _TrackedStream(httpx.AsyncByteStream):
+    """Response body wrapper that reports when the connection is handed back."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, on_close):
+        self._stream = stream
+        self._on_close = on_close
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._on_close is not None:
+                self._on_close()
+                self._on_close = None
+
+
+class InstrumentedTransport(httpx.AsyncBaseTransport):
+    """Wraps the pooled transport to export in-flight and utilization metrics."""
+
+    def __init__(self, transport: httpx.AsyncHTTPTransport, max_connections: int):
+        self._transport = transport
+        self._max_connections = max_connections
+        self._in_flight = 0
+
+    def _update(self, delta: int):
+        self._in_flight += delta
+        in_flight.set(self._in_flight)
+        utilization.set(self._in_flight / self._max_connections)
+        pool = getattr(self._transport, "_pool", None)
+        if pool is not None:
+            open_connections.set(len(pool.connections))
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        requests_total.inc()
+        self._update(1)
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            self._update(-1)
+            raise
+        response.stream = _TrackedStream(response.stream, lambda: self._update(-1))
+        return response
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the process-wide pooled HTTP client used by every LLM client."""
+    global _http_client
+
+    if _http_client is None:
+        limits = httpx.Limits(
+            max_connections=LLM_POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_POOL_MAX_KEEPALIVE,
+            keepalive_expiry=LLM_POOL_KEEPALIVE_EXPIRY,
+        )
+        transport = InstrumentedTransport(
+            httpx.AsyncHTTPTransport(limits=limits),
+            max_connections=LLM_POOL_MAX_CONNECTIONS,
+        )
+        _http_client = httpx.AsyncClient(
+            transport=transport,
+            timeout=httpx.Timeout(LLM_HTTP_TIMEOUT, connect=10.0),
+        )
+    return _http_client
+
+
+def get_chat_model(
+    model: str,
+    temperature: Optional[float] = None,
+    streaming: bool = False,
+) -> ChatOpenAI:
+    """
+    Return the shared ChatOpenAI client for ``(model, temperature, streaming)``.
+
+    Clients are created once per key and all send through the same pooled
+    HTTP client, so connections and TLS sessions are reused across requests.
+    """
+    key = (model, temperature, streaming)
+    llm = _chat_models.get(key)
+    if llm is None:
+        kwargs = {"temperature": temperature} if temperature is not None else {}
+        llm = ChatOpenAI(
+            model=model,
+            streaming=streaming,
+            http_async_client=get_http_client(),
+            **kwargs,
+        )
+        _chat_models[key] = llm
+    return llm
+
+
+async def warm_llm_pool(connections: int = LLM_POOL_PREWARM_CONNECTIONS):
+    """
+    Open ``connections`` keep-alive connections to the OpenAI API up front so
+    the first chat requests skip the TCP/TLS handshake.
+    """
+    base_url = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
+    headers = {"Authorization": f"Bearer {os.getenv('OPENAI_API_KEY', '')}"}
+    client = get_http_client()
+
+    results = await asyncio.gather(
+        *(
+            client.get(f"{base_url}/models", headers=headers)
+            for _ in range(connections)
+        ),
+        return_exceptions=True,
+    )
+    failures = [r for r in results if isinstance(r, Exception)]
+    if failures:
+        logger.warning(
+            f"LLM pool pre-warm: {len(failures)} connections failed: {failures[0]}"
+        )
+    logger.info(f"LLM pool pre-warmed with {connections - len(failures)} connections")
+
+
+async def close_llm_pool():
+    """Close the shared HTTP client and forget the cached LLM clients."""
+    global _http_client
+
+    _chat_models.clear()
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+__all__ = ["get_chat_model", "get_http_client", "warm_llm_pool", "close_llm_pool"]
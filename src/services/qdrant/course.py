@@ -1,8 +1,15 @@
+import asyncio
 from datetime import datetime
+from typing import Optional
 import uuid
 
 from qdrant_client import models
-from src.core.configs import QDRANT_HOST, QDRANT_API_KEY, TEACHER_COLLECTION_NAME
+from src.core.configs import (
+    QDRANT_HOST,
+    QDRANT_API_KEY,
+    TEACHER_COLLECTION_NAME,
+    LECTURE_COLLECTION_NAME,
+)
 from src.model.qdrant.course import Course
 from src.model.qdrant.lecture import Lecture
 from src.core.utility.logging_utils import get_logger
@@ -106,28 +113,77 @@ async def get_courses_from_qdrant():
         )
 
 
+def _lecture_filter(lecture_id: str) -> models.Filter:
+    return models.Filter(
+        must=[
+            models.FieldCondition(
+                key="metadata.lecture_id",
+                match=models.MatchValue(value=lecture_id),
+            )
+        ]
+    )
+
+
+def _course_filter(course_id: str) -> models.Filter:
+    return models.Filter(
+        must=[
+            models.FieldCondition(
+                key="metadata.course_id",
+                match=models.MatchValue(value=course_id),
+            )
+        ]
+    )
+
+
+async def get_course_payload(course_id: str) -> Optional[dict]:
+    """Get the stored payload of a course, or None if it does not exist"""
+    from src.services.qdrant.setup_qdrant import client
+
+    points, _ = await asyncio.to_thread(
+        client.scroll,
+        collection_name=TEACHER_COLLECTION_NAME,
+        scroll_filter=_course_filter(course_id),
+        limit=1,
+        with_payload=True,
+    )
+    return points[0].payload if points else None
+
+
+async def get_lecture_payload(lecture_id: str) -> Optional[dict]:
+    """Get the stored payload of a lecture, or None if it does not exist"""
+    from src.services.qdrant.setup_qdrant import client
+
+    points, _ = await asyncio.to_thread(
+        client.scroll,
+        collection_name=LECTURE_COLLECTION_NAME,
+        scroll_filter=_lecture_filter(lecture_id),
+        limit=1,
+        with_payload=True,
+    )
+    return points[0].payload if points else None
+
+
+async def set_lecture_payload(lecture_id: str, payload: dict):
+    """Merge top-level fields into a lecture's payload"""
+    from src.services.qdrant.setup_qdrant import client
+
+    await asyncio.to_thread(
+        client.set_payload,
+        collection_name=LECTURE_COLLECTION_NAME,
+        payload=payload,
+        points=_lecture_filter(lecture_id),
+    )
+
+
 async def get_youtube_url(lecture_id: str):
     """Get the YouTube URL from the lecture id"""
-    from main import lecture_store
-
     try:
-        qdrant_filter = models.Filter(
-            must=[
-                models.FieldCondition(
-                    key="metadata.lecture_id",
-                    match=models.MatchValue(value=lecture_id),
-                )
-            ]
-        )
-        result = await lecture_store.asimilarity_search(
-            query_text="",
-            query_filter=qdrant_filter,
-            limit=1,
-        )
-        print(result)
-        return result[0].metadata.video_url
+        payload = await get_lecture_payload(lecture_id)
     except Exception as e:
         logger.error(f"Error getting YouTube URL from lecture id: {e}")
         raise HTTPException(
             status_code=500, detail=f"Error getting YouTube URL from lecture id: {e}"
         )
+    if payload is None:
+        raise HTTPException(status_code=404, detail=f"Lecture {lecture_id} not found")
+    return payload["metadata"]["video_url"]
@@ -0,0 +1,135 @@
+import asyncio
+import uuid
+from langchain_openai import OpenAIEmbeddings
+from qdrant_client import QdrantClient, models
+from src.core.configs import LECTURE_CHUNK_COLLECTION_NAME, LECTURE_CHUNK_TOP_K
+from src.core.utility.logging_utils import get_logger
+from src.core.utility.metrics import metrics
+from src.tools.youtube_transcriber.captions import TranscriptChunk
+
+logger = get_logger(__name__)
+
+searches = metrics.counter(
+    "lecture_chunk_searches_total", "Lecture chunk searches by outcome"
+)
+indexed_chunks = metrics.histogram(
+    "lecture_chunks_indexed", "Number of transcript chunks stored per lecture"
+)
+
+
+def _lecture_filter(lecture_id: str, from_index: int = 0) -> models.Filter:
+    must = [
+        models.FieldCondition(key="lecture_id", match=models.MatchValue(value=lecture_id))
+    ]
+    if from_index:
+        must.append(
+            models.FieldCondition(key="index", range=models.Range(gte=from_index))
+        )
+    return models.Filter(must=must)
+
+
+class LectureChunkStore:
+    """
+    Timestamped transcript chunks of every lecture, embedded once at
+    ingestion, in a collection next to the lectures.
+
+    Chat requests retrieve the ``k`` chunks of a lecture nearest to the
+    query instead of sending the whole transcript.
+    """
+
+    def __init__(
+        self,
+        client: QdrantClient,
+        collection_name: str = LECTURE_CHUNK_COLLECTION_NAME,
+    ):
+        self.client = client
+        self.collection_name = collection_name
+        self.embeddings = OpenAIEmbeddings()
+
+    def ensure_collection(self):
+        if not self.client.collection_exists(self.collection_name):
+            self.client.create_collection(
+                collection_name=self.collection_name,
+                vectors_config=models.VectorParams(
+                    size=1536, distance=models.Distance.COSINE
+                ),
+            )
+        # Every search is restricted to one lecture
+        for field, schema in (
+            ("lecture_id", models.PayloadSchemaType.KEYWORD),
+            ("index", models.PayloadSchemaType.INTEGER),
+        ):
+            self.client.create_payload_index(
+                self.collection_name, field_name=field, field_schema=schema
+            )
+
+    async def delete_lecture(self, lecture_id: str, from_index: int = 0):
+        """Delete the chunks of a lecture, or those from ``from_index`` on."""
+        await asyncio.to_thread(
+            self.client.delete,
+            collection_name=self.collection_name,
+            points_selector=models.FilterSelector(
+                filter=_lecture_filter(lecture_id, from_index)
+            ),
+        )
+
+    async def index_lecture(self, lecture_id: str, chunks: list[TranscriptChunk]) -> int:
+        """Replace the stored chunks of a lecture; returns how many were stored."""
+        vectors = await self.embeddings.aembed_documents(
+            [chunk.text for chunk in chunks]
+        )
+        points = [
+            models.PointStruct(
+                # Stable ids, so re-indexing overwrites instead of duplicating
+                id=str(uuid.uuid5(uuid.NAMESPACE_URL, f"{lecture_id}/{chunk.index}")),
+                vector=vector,
+                payload={
+                    "lecture_id": lecture_id,
+                    "index": chunk.index,
+                    "start": chunk.start,
+                    "end": chunk.end,
+                    "text": chunk.text,
+                },
+            )
+            for chunk, vector in zip(chunks, vectors)
+        ]
+        if points:
+            await asyncio.to_thread(
+                self.client.upsert, collection_name=self.collection_name, points=points
+            )
+        # Drop what is left of a longer previous version of the transcript
+        await self.delete_lecture(lecture_id, from_index=len(points))
+        indexed_chunks.observe(len(points))
+        logger.info(f"Indexed {len(points)} transcript chunks for lecture {lecture_id}")
+        return len(points)
+
+    async def search(
+        self, lecture_id: str, query: str, k: int = LECTURE_CHUNK_TOP_K
+    ) -> list[TranscriptChunk]:
+        """
+        The ``k`` chunks of a lecture most relevant to ``query``, in reading
+        order. Empty if the lecture has not been indexed yet.
+        """
+        vector = await self.embeddings.aembed_query(query)
+        result = await asyncio.to_thread(
+            self.client.query_points,
+            collection_name=self.collection_name,
+            query=vector,
+            query_filter=_lecture_filter(lecture_id),
+            limit=k,
+            with_payload=True,
+        )
+        searches.inc(outcome="hit" if result.points else "empty")
+        chunks = [
+            TranscriptChunk(
+                index=point.payload["index"],
+                start=point.payload["start"],
+                end=point.payload["end"],
+                text=point.payload["text"],
+            )
+            for point in result.points
+        ]
+        return sorted(chunks, key=lambda chunk: chunk.index)
+
+
+__all__ = ["LectureChunkStore"]
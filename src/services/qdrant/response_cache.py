@@ -0,0 +1,269 @@
+import asyncio
+import hashlib
+import json
+import time
+import uuid
+from typing import Optional
+from langchain_openai import OpenAIEmbeddings
+from qdrant_client import QdrantClient, models
+from src.core.configs import (
+    RESPONSE_CACHE_COLLECTION_NAME,
+    RESPONSE_CACHE_THRESHOLD,
+    RESPONSE_CACHE_TTL_SECONDS,
+    RESPONSE_CACHE_MAX_ENTRIES,
+    RESPONSE_CACHE_SWEEP_EVERY,
+)
+from src.core.utility.logging_utils import get_logger
+from src.core.utility.metrics import metrics
+from src.core.utility.tasks import spawn_detached
+
+logger = get_logger(__name__)
+
+lookups = metrics.counter(
+    "response_cache_lookups_total", "Semantic response cache lookups by outcome"
+)
+hit_rate = metrics.gauge(
+    "response_cache_hit_rate", "Hits / (hits + misses) since process start"
+)
+similarity = metrics.histogram(
+    "response_cache_similarity", "Similarity of the nearest cached query"
+)
+evictions = metrics.counter(
+    "response_cache_evictions_total", "Cached responses evicted to stay under max size"
+)
+
+# State fields that change what the right answer to a query is.
+SCOPE_FIELDS = ("yt_scraped_data", "search_results", "course_data")
+
+
+def lecture_scope(source: str, version: str) -> str:
+    """Scope of answers from the material of a lecture or video version."""
+    return f"lecture:{source}:{version}"
+
+
+def response_scope(state: dict) -> Optional[str]:
+    """
+    Scope of the context attached to a query; cache entries never cross it.
+    Answers from lecture material are scoped by the lecture and transcript
+    version, not by the passages retrieved for the query. ``None`` for a
+    lecture chat whose material could not be loaded: it is not cached.
+    """
+    source = state.get("lecture_id") or state.get("video_url")
+    if source and not state.get("yt_scraped_data"):
+        return None
+    if source and state.get("lecture_version"):
+        return lecture_scope(source, state["lecture_version"])
+    context = {name: state.get(name) for name in SCOPE_FIELDS}
+    context["source"] = source
+    return hashlib.sha256(
+        json.dumps(context, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+class SemanticResponseCache:
+    """
+    Answers of response_node keyed by query embedding, in a dedicated
+    Qdrant collection.
+
+    A lookup only considers entries with the same context scope that are
+    younger than ``ttl``; the nearest one is a hit above ``threshold``.
+    Every ``sweep_every`` stores, expired entries are deleted and the least
+    recently hit ones are evicted down to ``max_entries``.
+    """
+
+    def __init__(
+        self,
+        client: QdrantClient,
+        collection_name: str = RESPONSE_CACHE_COLLECTION_NAME,
+        threshold: float = RESPONSE_CACHE_THRESHOLD,
+        ttl: float = RESPONSE_CACHE_TTL_SECONDS,
+        max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+        sweep_every: int = RESPONSE_CACHE_SWEEP_EVERY,
+    ):
+        self.client = client
+        self.collection_name = collection_name
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.sweep_every = sweep_every
+        self.embeddings = OpenAIEmbeddings()
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+
+    def ensure_collection(self):
+        if not self.client.collection_exists(self.collection_name):
+            self.client.create_collection(
+                collection_name=self.collection_name,
+                vectors_config=models.VectorParams(
+                    size=1536, distance=models.Distance.COSINE
+                ),
+            )
+        # Also on an existing collection, which may predate an index
+        for field, schema in (
+            ("scope", models.PayloadSchemaType.KEYWORD),
+            ("lecture_id", models.PayloadSchemaType.KEYWORD),
+            ("created_at", models.PayloadSchemaType.FLOAT),
+            ("last_hit_at", models.PayloadSchemaType.FLOAT),
+        ):
+            self.client.create_payload_index(
+                self.collection_name, field_name=field, field_schema=schema
+            )
+
+    def _record(self, outcome: str):
+        lookups.inc(outcome=outcome)
+        if outcome == "hit":
+            self._hits += 1
+        elif outcome == "miss":
+            self._misses += 1
+        hit_rate.set(self._hits / max(self._hits + self._misses, 1))
+
+    def _background(self, coro):
+        spawn_detached(coro)
+
+    async def lookup(self, query: str, scope: str) -> tuple[Optional[str], list[float]]:
+        """
+        Return ``(answer, vector)``: the cached answer for the nearest
+        paraphrase of ``query`` in ``scope`` (or ``None``) and the query
+        embedding, to be passed back to :meth:`store` on a miss.
+        """
+        vector = await self.embeddings.aembed_query(query)
+        query_filter = models.Filter(
+            must=[
+                models.FieldCondition(
+                    key="scope", match=models.MatchValue(value=scope)
+                ),
+                models.FieldCondition(
+                    key="created_at",
+                    range=models.Range(gte=time.time() - self.ttl),
+                ),
+            ]
+        )
+        result = await asyncio.to_thread(
+            self.client.query_points,
+            collection_name=self.collection_name,
+            query=vector,
+            query_filter=query_filter,
+            limit=1,
+            with_payload=True,
+        )
+        if not result.points:
+            self._record("miss")
+            return None, vector
+
+        point = result.points[0]
+        similarity.observe(point.score)
+        if point.score < self.threshold:
+            self._record("miss")
+            return None, vector
+
+        self._record("hit")
+        self._background(
+            asyncio.to_thread(
+                self.client.set_payload,
+                collection_name=self.collection_name,
+                payload={"last_hit_at": time.time()},
+                points=[point.id],
+            )
+        )
+        return point.payload["answer"], vector
+
+    async def store(
+        self,
+        query: str,
+        scope: str,
+        answer: str,
+        vector: list[float],
+        lecture_id: Optional[str] = None,
+    ):
+        now = time.time()
+        await asyncio.to_thread(
+            self.client.upsert,
+            collection_name=self.collection_name,
+            points=[
+                models.PointStruct(
+                    id=str(uuid.uuid4()),
+                    vector=vector,
+                    payload={
+                        "scope": scope,
+                        "lecture_id": lecture_id,
+                        "query": query,
+                        "answer": answer,
+                        "created_at": now,
+                        "last_hit_at": now,
+                    },
+                )
+            ],
+        )
+        self._stores += 1
+        if self._stores % self.sweep_every == 0:
+            self._background(asyncio.to_thread(self.sweep))
+
+    def store_in_background(self, *args, **kwargs):
+        """:meth:`store` without making the caller wait for Qdrant."""
+
+        async def store():
+            try:
+                await self.store(*args, **kwargs)
+            except Exception as e:
+                logger.warning(f"Response cache store failed: {e}")
+
+        self._background(store())
+
+    def sweep(self):
+        """Delete expired entries, then evict least recently hit ones."""
+        self.client.delete(
+            collection_name=self.collection_name,
+            points_selector=models.FilterSelector(
+                filter=models.Filter(
+                    must=[
+                        models.FieldCondition(
+                            key="created_at",
+                            range=models.Range(lt=time.time() - self.ttl),
+                        )
+                    ]
+                )
+            ),
+        )
+        count = self.client.count(self.collection_name, exact=True).count
+        excess = count - self.max_entries
+        if excess <= 0:
+            return
+        points, _ = self.client.scroll(
+            collection_name=self.collection_name,
+            limit=excess,
+            order_by=models.OrderBy(key="last_hit_at", direction="asc"),
+            with_payload=False,
+        )
+        self.client.delete(
+            collection_name=self.collection_name,
+            points_selector=models.PointIdsList(points=[p.id for p in points]),
+        )
+        evictions.inc(len(points))
+        logger.info(f"Response cache: evicted {len(points)} entries")
+
+    def _delete_where(self, key: str, value: str):
+        self.client.delete(
+            collection_name=self.collection_name,
+            points_selector=models.FilterSelector(
+                filter=models.Filter(
+                    must=[
+                        models.FieldCondition(
+                            key=key, match=models.MatchValue(value=value)
+                        )
+                    ]
+                )
+            ),
+        )
+        logger.info(f"Response cache: invalidated {key}={value}")
+
+    async def invalidate_scope(self, scope: str):
+        """Drop every cached answer given with the context ``scope``."""
+        await asyncio.to_thread(self._delete_where, "scope", scope)
+
+    async def invalidate_lecture(self, lecture_id: str):
+        """Drop every cached answer about ``lecture_id``."""
+        await asyncio.to_thread(self._delete_where, "lecture_id", lecture_id)
+
+
+__all__ = ["SCOPE_FIELDS", "lecture_scope", "response_scope", "SemanticResponseCache"]
@@ -3,7 +3,7 @@ from qdrant_client import QdrantClient
 from langchain_qdrant import QdrantVectorStore
 from langchain_openai import OpenAIEmbeddings
 from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams
+from qdrant_client.models import Distance, PayloadSchemaType, VectorParams
 from src.core.configs import (
     QDRANT_HOST,
     QDRANT_API_KEY,
@@ -11,6 +11,8 @@ from src.core.configs import (
     USER_COLLECTION_NAME,
     LECTURE_COLLECTION_NAME,
 )
+from src.services.qdrant.lecture_chunks import LectureChunkStore
+from src.services.qdrant.response_cache import SemanticResponseCache
 
 
 # Initialize Qdrant client
@@ -64,6 +66,12 @@ async def setup_lecture_store():
             collection_name=LECTURE_COLLECTION_NAME,
             vectors_config=VectorParams(size=1536, distance=Distance.COSINE),
         )
+    # Lectures are looked up by id on the chat hot path
+    client.create_payload_index(
+        LECTURE_COLLECTION_NAME,
+        field_name="metadata.lecture_id",
+        field_schema=PayloadSchemaType.KEYWORD,
+    )
 
     # Create vector store
     embeddings = OpenAIEmbeddings()
@@ -72,3 +80,19 @@ async def setup_lecture_store():
     )
 
     return vectorstore
+
+
+async def setup_response_cache():
+    """Initialize and return the semantic response cache"""
+    cache = SemanticResponseCache(client)
+    cache.ensure_collection()
+
+    return cache
+
+
+async def setup_lecture_chunk_store():
+    """Initialize and return the lecture transcript chunk store"""
+    store = LectureChunkStore(client)
+    store.ensure_collection()
+
+    return store
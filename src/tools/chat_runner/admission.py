@@ -0,0 +1,179 @@
+import asyncio
+import time
+from collections import deque
+from typing import AsyncIterator
+from src.core.configs import (
+    CHAT_MAX_CONCURRENT_RUNS,
+    CHAT_MAX_QUEUED_RUNS,
+    CHAT_QUEUE_MAX_WAIT_SECONDS,
+    CHAT_MAX_RUNS_PER_USER,
+    CHAT_RETRY_AFTER_SECONDS,
+)
+from src.core.utility.metrics import metrics
+
+queue_depth = metrics.gauge(
+    "chat_admission_queue_depth", "Chat runs waiting for a free slot"
+)
+active_runs = metrics.gauge("chat_admission_active_runs", "Chat runs holding a slot")
+wait_seconds = metrics.histogram(
+    "chat_admission_wait_seconds", "Time chat runs spent waiting for a slot"
+)
+rejected = metrics.counter(
+    "chat_admission_rejected_total", "Chat runs rejected by admission control"
+)
+
+
+class AdmissionRejected(Exception):
+    """Raised when a run cannot be admitted; carries a Retry-After hint."""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionTicket:
+    """A held run slot. ``release`` is idempotent."""
+
+    def __init__(self, controller: "AdmissionController", user_id: str):
+        self._controller = controller
+        self.user_id = user_id
+        self._released = False
+
+    def release(self):
+        if not self._released:
+            self._released = True
+            self._controller._release(self.user_id)
+
+
+class AdmissionController:
+    """
+    Admission control for chat runs.
+
+    At most ``max_concurrent`` runs execute at once; further runs wait in a
+    FIFO queue of at most ``max_queue`` entries for up to ``max_wait``
+    seconds. Each user may have at most ``per_user_limit`` runs running or
+    queued. Anything over these limits is rejected immediately.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        max_queue: int,
+        max_wait: float,
+        per_user_limit: int,
+        retry_after: int,
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.per_user_limit = per_user_limit
+        self.retry_after = retry_after
+        self._active = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._per_user: dict[str, int] = {}
+
+    def _reject(self, reason: str):
+        rejected.inc(reason=reason)
+        raise AdmissionRejected(reason, self.retry_after)
+
+    async def acquire(self, user_id: str) -> AdmissionTicket:
+        """
+        Wait for a run slot.
+
+        Raises:
+            AdmissionRejected: If the user is at their cap, the queue is full
+                or no slot frees up within ``max_wait``
+        """
+        if self._per_user.get(user_id, 0) >= self.per_user_limit:
+            self._reject("user_limit")
+
+        if self._active < self.max_concurrent and not self._waiters:
+            self._admit(user_id, waited=0.0)
+            return AdmissionTicket(self, user_id)
+
+        if len(self._waiters) >= self.max_queue:
+            self._reject("queue_full")
+
+        self._per_user[user_id] = self._per_user.get(user_id, 0) + 1
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        queue_depth.set(len(self._waiters))
+        started = time.monotonic()
+        try:
+            await asyncio.wait({waiter}, timeout=self.max_wait)
+        except asyncio.CancelledError:
+            self._abandon(user_id, waiter)
+            raise
+
+        if not waiter.done():
+            self._abandon(user_id, waiter)
+            self._reject("queue_timeout")
+
+        # The slot was handed over by _release; _active already accounts for it.
+        wait_seconds.observe(time.monotonic() - started)
+        return AdmissionTicket(self, user_id)
+
+    def _admit(self, user_id: str, waited: float):
+        self._active += 1
+        self._per_user[user_id] = self._per_user.get(user_id, 0) + 1
+        active_runs.set(self._active)
+        wait_seconds.observe(waited)
+
+    def _abandon(self, user_id: str, waiter: asyncio.Future):
+        """Give up a queue entry, passing on a slot that was already handed over."""
+        if waiter.done() and not waiter.cancelled():
+            self._release(user_id)
+            return
+        waiter.cancel()
+        self._waiters.remove(waiter)
+        queue_depth.set(len(self._waiters))
+        self._decrement_user(user_id)
+
+    def _decrement_user(self, user_id: str):
+        count = self._per_user.get(user_id, 0) - 1
+        if count > 0:
+            self._per_user[user_id] = count
+        else:
+            self._per_user.pop(user_id, None)
+
+    def _release(self, user_id: str):
+        self._decrement_user(user_id)
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # Hand the slot straight to the next waiter.
+                waiter.set_result(None)
+                queue_depth.set(len(self._waiters))
+                return
+        queue_depth.set(0)
+        self._active -= 1
+        active_runs.set(self._active)
+
+
+async def release_when_done(
+    frames: AsyncIterator[str], ticket: AdmissionTicket
+) -> AsyncIterator[str]:
+    """Pass ``frames`` through and release the run slot once they end."""
+    try:
+        async for frame in frames:
+            yield frame
+    finally:
+        ticket.release()
+
+
+admission_controller = AdmissionController(
+    max_concurrent=CHAT_MAX_CONCURRENT_RUNS,
+    max_queue=CHAT_MAX_QUEUED_RUNS,
+    max_wait=CHAT_QUEUE_MAX_WAIT_SECONDS,
+    per_user_limit=CHAT_MAX_RUNS_PER_USER,
+    retry_after=CHAT_RETRY_AFTER_SECONDS,
+)
+
+__all__ = [
+    "AdmissionRejected",
+    "AdmissionTicket",
+    "AdmissionController",
+    "admission_controller",
+    "release_when_done",
+]
@@ -0,0 +1,161 @@
+import asyncio
+import json
+from json.encoder import encode_basestring_ascii
+from typing import AsyncIterator, Optional
+
+# Sentinel pushed by the pump task once the source iterator is exhausted.
+_DONE = object()
+
+
+class SSEFrameEncoder:
+    """
+    Builds ``data:`` frames from pre-encoded per-type templates.
+
+    The output is byte-for-byte identical to
+    ``f"data: {json.dumps({'type': t, 'content': c})}\\n\\n"`` but only the
+    content string is escaped per frame; the envelope is encoded once.
+    ``fields`` are extra constant keys placed before ``type`` in every frame.
+    """
+
+    prefix = "data: "
+    suffix = "\n\n"
+
+    def __init__(
+        self,
+        frame_types: tuple[str, ...] = ("response", "quiz"),
+        fields: Optional[dict] = None,
+    ):
+        self.fields = fields or {}
+        self._head = "".join(
+            f"{encode_basestring_ascii(key)}: {json.dumps(value)}, "
+            for key, value in self.fields.items()
+        )
+        self._prefixes: dict[str, str] = {}
+        for frame_type in frame_types:
+            self._register(frame_type)
+
+    def _register(self, frame_type: str) -> str:
+        prefix = (
+            self.prefix
+            + "{"
+            + self._head
+            + '"type": '
+            + encode_basestring_ascii(frame_type)
+            + ', "content": '
+        )
+        self._prefixes[frame_type] = prefix
+        return prefix
+
+    def encode(self, frame_type: str, content: str) -> str:
+        """Encode a text chunk as a frame of the given type."""
+        prefix = self._prefixes.get(frame_type) or self._register(frame_type)
+        return prefix + encode_basestring_ascii(content) + "}" + self.suffix
+
+    def encode_payload(self, payload: dict) -> str:
+        """Encode an arbitrary JSON payload as a frame."""
+        return self.prefix + json.dumps({**self.fields, **payload}) + self.suffix
+
+
+class WebSocketFrameEncoder(SSEFrameEncoder):
+    """Same frames as :class:`SSEFrameEncoder`, as bare JSON text messages."""
+
+    prefix = ""
+    suffix = ""
+
+
+async def coalesce_frames(
+    chunks: AsyncIterator[tuple[str, str]],
+    encoder: Optional[SSEFrameEncoder] = None,
+    window_ms: float = 20,
+    max_bytes: int = 256,
+    atomic_types: frozenset[str] = frozenset(),
+) -> AsyncIterator[str]:
+    """
+    Coalesce ``(frame_type, content)`` chunks into micro-batched SSE frames.
+
+    The first chunk is always flushed immediately so time-to-first-token is
+    unaffected. After that, chunks of the same type are buffered until
+    ``window_ms`` has elapsed since the first buffered chunk or the buffer
+    holds at least ``max_bytes`` of UTF-8 text, whichever comes first. A change
+    of frame type or the end of the stream flushes the buffer as well.
+    Chunks of ``atomic_types`` are complete documents and always get a
+    frame of their own.
+
+    Args:
+        chunks: Source of ``(frame_type, content)`` tuples
+        encoder: Frame encoder (a default one is created if omitted)
+        window_ms: Maximum time a chunk may wait in the buffer
+        max_bytes: Buffer size that triggers an early flush
+        atomic_types: Frame types that are never merged with other chunks
+
+    Yields:
+        Encoded SSE frames
+    """
+    encoder = encoder or SSEFrameEncoder()
+    window = max(window_ms, 0) / 1000
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def pump():
+        try:
+            async for chunk in chunks:
+                queue.put_nowait(chunk)
+        except Exception as e:
+            queue.put_nowait(e)
+        else:
+            queue.put_nowait(_DONE)
+
+    pump_task = asyncio.create_task(pump())
+
+    pending_type: Optional[str] = None
+    parts: list[str] = []
+    size = 0
+    flush_at = 0.0
+    first = True
+
+    def flush() -> str:
+        nonlocal parts, size, pending_type
+        frame = encoder.encode(pending_type, "".join(parts))
+        parts, size, pending_type = [], 0, None
+        return frame
+
+    try:
+        while True:
+            timeout = max(flush_at - loop.time(), 0) if parts else None
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                yield flush()
+                continue
+
+            if item is _DONE:
+                if parts:
+                    yield flush()
+                return
+            if isinstance(item, Exception):
+                if parts:
+                    yield flush()
+                raise item
+
+            frame_type, content = item
+            if not content:
+                continue
+            if parts and frame_type != pending_type:
+                yield flush()
+            if first or window == 0 or frame_type in atomic_types:
+                first = False
+                yield encoder.encode(frame_type, content)
+                continue
+
+            if not parts:
+                pending_type = frame_type
+                flush_at = loop.time() + window
+            parts.append(content)
+            size += len(content.encode("utf-8"))
+            if size >= max_bytes:
+                yield flush()
+    finally:
+        pump_task.cancel()
+
+
+__all__ = ["SSEFrameEncoder", "WebSocketFrameEncoder", "coalesce_frames"]
@@ -0,0 +1,168 @@
+import json
+import re
+from typing import AsyncIterator, Optional
+from pydantic import ValidationError
+from src.core.utility.metrics import metrics
+from src.model.chat.quiz import Quiz, QuizQuestion
+
+first_question_fraction = metrics.histogram(
+    "quiz_first_question_fraction",
+    "Share of the quiz text streamed before its first question was complete",
+)
+
+# Frames produced from the raw "quiz" token stream. Each carries one whole
+# JSON document, so they must never be merged by the coalescer.
+QUIZ_FRAME_TYPES = ("quiz_question", "quiz", "quiz_error")
+
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+
+
+def loads_lenient(raw: str):
+    """``json.loads`` that also accepts trailing commas, which LLMs often emit."""
+    try:
+        return json.loads(raw)
+    except json.JSONDecodeError:
+        return json.loads(_TRAILING_COMMA.sub(r"\1", raw))
+
+
+class IncrementalQuizParser:
+    """
+    Incremental JSON scanner for ``{"questions": [{...}, ...]}`` token streams.
+
+    :meth:`feed` returns every question object that closed in the new text,
+    and raises ``json.JSONDecodeError`` on a malformed top-level key.
+    Anything before the first ``{`` (e.g. a code fence) is skipped, and
+    :attr:`done` is set once the top-level object closes.
+    """
+
+    def __init__(self):
+        self.buffer: list[str] = []
+        self.length = 0
+        self.done = False
+        self._stack: list[str] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_key: Optional[str] = None
+        self._in_questions = False
+        self._question_start: Optional[int] = None
+
+    def text(self) -> str:
+        return "".join(self.buffer)
+
+    def feed(self, fragment: str) -> list[dict]:
+        questions = []
+        for char in fragment:
+            if self.done:
+                break
+            if not self._stack and char != "{":
+                continue
+            self.buffer.append(char)
+            position = self.length
+            self.length += 1
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if len(self._stack) == 1:
+                        self._last_key = json.loads(
+                            "".join(self.buffer[self._string_start :])
+                        )
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = position
+            elif char in "{[":
+                if char == "[" and len(self._stack) == 1:
+                    self._in_questions = self._last_key == "questions"
+                elif char == "{" and self._in_questions and len(self._stack) == 2:
+                    self._question_start = position
+                self._stack.append(char)
+            elif char in "}]":
+                self._stack.pop()
+                if (
+                    char == "}"
+                    and self._question_start is not None
+                    and len(self._stack) == 2
+                ):
+                    raw = "".join(self.buffer[self._question_start :])
+                    self._question_start = None
+                    try:
+                        questions.append(loads_lenient(raw))
+                    except json.JSONDecodeError:
+                        pass
+                elif len(self._stack) == 1:
+                    self._in_questions = False
+                elif not self._stack:
+                    self.done = True
+        return questions
+
+    def result(self) -> Quiz:
+        """Parse and validate the complete quiz."""
+        return Quiz.model_validate(loads_lenient(self.text()))
+
+
+async def structure_quiz_frames(
+    chunks: AsyncIterator[tuple[str, str]],
+) -> AsyncIterator[tuple[str, str]]:
+    """
+    Replace raw ``quiz`` token chunks with structured frames.
+
+    Each question is emitted as a ``quiz_question`` frame as soon as its
+    object closes. When the quiz ends, the whole quiz is validated and sent
+    as one ``quiz`` frame, or a ``quiz_error`` frame if it is invalid. Other
+    chunks pass through untouched. From the first quiz chunk the parser
+    cannot read on, the raw quiz text is passed through instead.
+    """
+    parser: Optional[IncrementalQuizParser] = None
+    first_question_at: Optional[int] = None
+    passthrough = False
+    raw_chunks: list[str] = []
+
+    def finish() -> tuple[str, str]:
+        if first_question_at is not None and parser.length:
+            first_question_fraction.observe(first_question_at / parser.length)
+        try:
+            return "quiz", parser.result().model_dump_json()
+        except ValidationError as e:
+            return "quiz_error", f"Invalid quiz: {e.error_count()} errors"
+        except json.JSONDecodeError as e:
+            return "quiz_error", f"Invalid quiz JSON: {e.msg}"
+
+    async for frame_type, content in chunks:
+        if frame_type != "quiz" or passthrough:
+            yield frame_type, content
+            continue
+
+        if parser is None:
+            parser = IncrementalQuizParser()
+        if parser.done:
+            continue
+        raw_chunks.append(content)
+        try:
+            questions = parser.feed(content)
+        except json.JSONDecodeError:
+            passthrough = True
+            yield frame_type, "".join(raw_chunks)
+            continue
+        for question in questions:
+            try:
+                question = QuizQuestion.model_validate(question).model_dump()
+            except ValidationError:
+                continue
+            if first_question_at is None:
+                first_question_at = parser.length
+            yield "quiz_question", json.dumps(question)
+        if parser.done:
+            yield finish()
+
+    if parser is not None and not parser.done and not passthrough:
+        yield "quiz_error", "Quiz stream ended before the quiz was complete"
+
+
+__all__ = ["QUIZ_FRAME_TYPES", "IncrementalQuizParser", "structure_quiz_frames"]
@@ -0,0 +1,194 @@
+import asyncio
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Awaitable, Optional, TypeVar
+from langchain_core.callbacks import adispatch_custom_event
+from langchain_core.runnables import RunnableConfig
+from src.core.configs import CHAT_EXPECTED_COMPLETION_TOKENS, CHAT_NODE_TIME_SLICES
+from src.core.utility.logging_utils import get_logger
+from src.core.utility.metrics import metrics
+
+logger = get_logger(__name__)
+
+runs_cancelled = metrics.counter(
+    "chat_runs_cancelled_total", "Chat runs cancelled before completion"
+)
+tokens_saved = metrics.counter(
+    "chat_tokens_saved_total",
+    "Estimated completion tokens not generated because a run was cancelled",
+)
+node_overruns = metrics.counter(
+    "chat_node_overruns_total", "Nodes that ran past their slice of the run deadline"
+)
+degradations = metrics.counter(
+    "chat_deadline_degradations_total",
+    "Node steps skipped or cut short because the node's time slice ran out",
+)
+
+T = TypeVar("T")
+
+# A node that gives up on a step right at its deadline still needs a moment
+# to return; only finishing later than this counts as an overrun.
+OVERRUN_TOLERANCE_SECONDS = 0.25
+
+if TYPE_CHECKING:
+    from src.domain.chat.speculation import SpeculativeResponse
+
+# Custom events nodes dispatch to stream text that does not come from a live
+# LLM call in that node (e.g. a committed speculative response), mapped to
+# the frame type the runner forwards them as.
+CHUNK_EVENTS = {
+    "response_chunk": "response",
+    "quiz_chunk": "quiz",
+}
+
+
+class RunCancelled(Exception):
+    """Raised inside nodes and worker threads once a run has been cancelled."""
+
+
+class CancelToken:
+    """
+    Thread-safe cancellation flag.
+
+    Asyncio work is cancelled through the run task itself; the token exists
+    for code running in worker threads (yt-dlp), which cannot be interrupted
+    by task cancellation and has to poll instead.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self.reason: Optional[str] = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self, reason: str = "cancelled"):
+        if not self._event.is_set():
+            self.reason = reason
+            self._event.set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise RunCancelled(self.reason)
+
+
+@dataclass
+class RunContext:
+    """Per-run, non-serialisable state passed to nodes through the graph config."""
+
+    run_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    cancel_token: CancelToken = field(default_factory=CancelToken)
+    streamed_tokens: int = 0
+    speculation: Optional["SpeculativeResponse"] = None
+    # Streamed text, recorded as the turn's reply
+    reply_parts: list[str] = field(default_factory=list)
+    # time.monotonic() deadlines of the whole run and of the running node
+    deadline: Optional[float] = None
+    node_deadline: Optional[float] = None
+
+    def start_node(self, node: str) -> Optional[float]:
+        """
+        Give ``node`` its slice of the time left before the run deadline
+        (``CHAT_NODE_TIME_SLICES``, all of it by default) and return the
+        node's deadline.
+        """
+        if self.deadline is None:
+            self.node_deadline = None
+        else:
+            left = max(self.deadline - time.monotonic(), 0)
+            share = CHAT_NODE_TIME_SLICES.get(node, 1.0)
+            self.node_deadline = time.monotonic() + left * share
+        return self.node_deadline
+
+    def end_node(self, node: str):
+        """Count ``node`` as an overrun if it finished after its deadline."""
+        if self.node_deadline is not None:
+            overrun = time.monotonic() - self.node_deadline
+            if overrun > OVERRUN_TOLERANCE_SECONDS:
+                node_overruns.inc(node=node)
+                logger.info(f"{node} overran its time slice by {overrun:.1f}s")
+        self.node_deadline = None
+
+
+def record_cancelled_run(run_context: RunContext) -> int:
+    """
+    Count a cancelled run and return the estimated tokens it saved.
+
+    The estimate is the expected completion size minus what was already
+    streamed, since the true length of an unfinished answer is unknown.
+    """
+    reason = run_context.cancel_token.reason or "cancelled"
+    saved = max(CHAT_EXPECTED_COMPLETION_TOKENS - run_context.streamed_tokens, 0)
+    runs_cancelled.inc(reason=reason)
+    tokens_saved.inc(saved)
+    return saved
+
+
+async def emit_chunk(event_name: str, content: str, config: RunnableConfig):
+    """Stream ``content`` to the client as a chunk of ``CHUNK_EVENTS[event_name]``."""
+    await adispatch_custom_event(event_name, {"content": content}, config=config)
+
+
+def get_run_context(config: Optional[RunnableConfig]) -> Optional[RunContext]:
+    """Return the run context from a node's config, if the run has one."""
+    if not config:
+        return None
+    return config.get("configurable", {}).get("run_context")
+
+
+def get_cancel_token(config: Optional[RunnableConfig]) -> Optional[CancelToken]:
+    """Return the cancel token from a node's config, if the run has one."""
+    run_context = get_run_context(config)
+    return run_context.cancel_token if run_context else None
+
+
+def time_left(config: Optional[RunnableConfig]) -> Optional[float]:
+    """
+    Seconds left in the running node's time slice, or ``None`` if the run
+    has no deadline.
+    """
+    run_context = get_run_context(config)
+    if run_context is None or run_context.node_deadline is None:
+        return None
+    return max(run_context.node_deadline - time.monotonic(), 0)
+
+
+async def within_time_left(
+    awaitable: Awaitable[T],
+    config: Optional[RunnableConfig],
+    step: str,
+    default: T = None,
+) -> T:
+    """
+    Await ``awaitable`` within the node's remaining time slice. If the slice
+    runs out first, it is cancelled and ``default`` is returned instead, so
+    the node can carry on without that step.
+    """
+    timeout = time_left(config)
+    if timeout is None:
+        return await awaitable
+    try:
+        return await asyncio.wait_for(awaitable, timeout)
+    except asyncio.TimeoutError:
+        node = (config or {}).get("metadata", {}).get("langgraph_node", "unknown")
+        degradations.inc(node=node, step=step)
+        logger.warning(f"{node}: skipping {step}, out of time")
+        return default
+
+
+__all__ = [
+    "RunCancelled",
+    "CancelToken",
+    "RunContext",
+    "record_cancelled_run",
+    "CHUNK_EVENTS",
+    "emit_chunk",
+    "get_run_context",
+    "get_cancel_token",
+    "time_left",
+    "within_time_left",
+]
@@ -1,10 +1,64 @@
-import json
-from typing import cast, Any, Literal, Optional
+import time
+from typing import cast, Any, AsyncIterator, Literal, Optional
 from src import get_logger
+from src.core.configs import (
+    CHAT_DEADLINE_SECONDS,
+    STREAM_COALESCE_WINDOW_MS,
+    STREAM_COALESCE_MAX_BYTES,
+)
+from src.core.utility.tasks import spawn_detached
 from src.model.chat.state import ChatState
+from src.tools.chat_runner.encoder import SSEFrameEncoder, coalesce_frames
+from src.tools.chat_runner.run_context import CHUNK_EVENTS, RunContext
+from src.tools.chat_runner.quiz_stream import QUIZ_FRAME_TYPES, structure_quiz_frames
+from src.services.conversation.history import (
+    conversation_id_for,
+    load_history,
+    record_turn,
+)
 
 logger = get_logger(__name__)
 
+# Nodes whose LLM token stream is forwarded to the client, keyed to frame type.
+STREAMED_NODES = {
+    "response_node": "response",
+    "quiz_node": "quiz",
+}
+
+frame_encoder = SSEFrameEncoder(tuple(STREAMED_NODES.values()) + QUIZ_FRAME_TYPES)
+
+
+async def stream_graph_chunks(
+    events: AsyncIterator[dict], run_context: Optional[RunContext] = None
+):
+    """Extract ``(frame_type, content)`` chunks from graph stream events."""
+    async for event in events:
+        event_type = event.get("event")
+        if event_type == "on_chat_model_stream":
+            frame_type = STREAMED_NODES.get(event.get("metadata").get("langgraph_node"))
+            content = event.get("data").get("chunk").content
+        elif event_type == "on_custom_event":
+            frame_type = CHUNK_EVENTS.get(event.get("name"))
+            content = event.get("data", {}).get("content")
+        else:
+            continue
+        if frame_type is None:
+            continue
+        if run_context is not None:
+            run_context.streamed_tokens += 1
+            # Quiz JSON is not part of the reply recorded in the history
+            if frame_type == "response":
+                run_context.reply_parts.append(f"{content}")
+        yield frame_type, f"{content}"
+
+
+async def save_turn(conversation_id: str, query: str, reply: str):
+    """:func:`record_turn`, logging instead of raising on failure."""
+    try:
+        await record_turn(conversation_id, query, reply)
+    except Exception as e:
+        logger.warning(f"Could not record turn for {conversation_id}: {e}")
+
 
 async def run_graph(
     query: str,
@@ -12,9 +66,37 @@ async def run_graph(
     user_type: Literal["user", "teacher"],
     lecture_id: Optional[str] = None,
     video_url: Optional[str] = None,
+    run_context: Optional[RunContext] = None,
+    encoder: Optional[SSEFrameEncoder] = None,
+    history: Optional[str] = None,
 ):
+    """
+    Run the chat graph and yield its streamed output as encoded frames.
+
+    ``encoder`` selects the wire format (SSE by default); the WebSocket
+    transport passes a :class:`WebSocketFrameEncoder` tagged with its
+    request id. Quiz output is sent as one ``quiz_question`` frame per
+    question as soon as it is complete, then the validated ``quiz``.
+
+    The history window of the user's conversation about the lecture or video
+    is loaded unless the caller already has it (``history``), and the
+    finished turn is recorded in that conversation in the background.
+
+    The run has ``CHAT_DEADLINE_SECONDS`` from here, unless the caller's
+    ``run_context`` already carries a deadline; nodes get slices of it.
+    """
     from main import chat_graph
 
+    run_context = run_context or RunContext()
+    if run_context.deadline is None:
+        run_context.deadline = time.monotonic() + CHAT_DEADLINE_SECONDS
+    conversation_id = conversation_id_for(user_id, lecture_id, video_url)
+    if history is None:
+        try:
+            history = await load_history(conversation_id)
+        except Exception as e:
+            logger.warning(f"Could not load history for {conversation_id}: {e}")
+
     state = cast(
         ChatState,
         {
@@ -28,47 +110,36 @@ async def run_graph(
             "response": "",
             "need_quiz": False,
             "course_data": None,
+            "lecture_version": None,
+            "history": history or None,
         },
     )
 
     config = {
         "thread_id": user_id,
+        "configurable": {"run_context": run_context},
     }
 
     try:
         events = chat_graph.astream_events(
             state, config=cast(Any, config), version="v2", stream_mode="updates"
         )
-        async for event in events:
-            event_type = event.get("event")
-            if (
-                event_type == "on_chat_model_stream"
-                and event.get("metadata").get("langgraph_node") == "response_node"
-            ):
-                json_data = json.dumps(
-                    {
-                        "type": "response",
-                        "content": f"{event.get('data').get('chunk').content}",
-                    }
-                )
-
-                yield f"data: {json_data}\n\n"
-
-            elif (
-                event_type == "on_chat_model_stream"
-                and event.get("metadata").get("langgraph_node") == "quiz_node"
-            ):
-                json_data = json.dumps(
-                    {
-                        "type": "quiz",
-                        "content": f"{event.get('data').get('chunk').content}",
-                    }
-                )
-
-                yield f"data: {json_data}\n\n"
-
-            else:
-                continue
+        async for frame in coalesce_frames(
+            structure_quiz_frames(stream_graph_chunks(events, run_context)),
+            encoder=encoder or frame_encoder,
+            window_ms=STREAM_COALESCE_WINDOW_MS,
+            max_bytes=STREAM_COALESCE_MAX_BYTES,
+            atomic_types=frozenset(QUIZ_FRAME_TYPES),
+        ):
+            yield frame
     except Exception as e:
         logger.error(f"Error running graph: {e}")
         raise e
+    else:
+        # Recorded after the stream ends, so the client never waits for it
+        spawn_detached(
+            save_turn(conversation_id, query, "".join(run_context.reply_parts))
+        )
+    finally:
+        if run_context.speculation is not None:
+            run_context.speculation.discard()
@@ -0,0 +1,302 @@
+import asyncio
+import re
+import time
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, Optional
+from src.core.configs import (
+    CHAT_STREAM_BUFFER_FRAMES,
+    CHAT_STREAM_RETENTION_SECONDS,
+    CHAT_DISCONNECT_GRACE_SECONDS,
+    CHAT_DISCONNECT_POLL_SECONDS,
+    CHAT_SINGLEFLIGHT_REPLAY_SECONDS,
+)
+from src.core.utility.logging_utils import get_logger
+from src.core.utility.metrics import metrics
+from src.tools.chat_runner.encoder import SSEFrameEncoder
+from src.tools.chat_runner.run_context import RunContext, record_cancelled_run
+
+logger = get_logger(__name__)
+
+singleflight = metrics.counter(
+    "chat_singleflight_total",
+    "Lecture chats by single-flight outcome (leader, joined, replayed)",
+)
+
+error_encoder = SSEFrameEncoder(("error",))
+
+_NON_WORD = re.compile(r"[^\w\s]+")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """Lower-case a query and drop punctuation and repeated whitespace."""
+    return _SPACES.sub(" ", _NON_WORD.sub(" ", query.lower())).strip()
+
+
+def singleflight_key(
+    user_type: str,
+    query: str,
+    lecture_id: Optional[str] = None,
+    video_url: Optional[str] = None,
+    history: Optional[str] = None,
+) -> Optional[str]:
+    """
+    Key under which identical lecture chats share one run, or ``None`` for
+    chats that are not about a lecture. Chats in a conversation with stored
+    turns carry its history, so they are personal and never shared.
+    """
+    source = lecture_id or video_url
+    if not source or history:
+        return None
+    return f"{user_type}|{source}|{normalize_query(query)}"
+
+
+def format_event_id(run_id: str, seq: int) -> str:
+    """Build the SSE event id for a frame of a run."""
+    return f"{run_id}:{seq}"
+
+
+def parse_event_id(event_id: str) -> Optional[tuple[str, int]]:
+    """Split an SSE event id into ``(run_id, seq)``, or ``None`` if malformed."""
+    run_id, _, seq = event_id.strip().rpartition(":")
+    if not run_id or not seq.isdigit():
+        return None
+    return run_id, int(seq)
+
+
+class RunStream:
+    """
+    Frames produced by one graph run, kept in a bounded ring buffer.
+
+    The run is driven by its own task, so it keeps going when a client
+    drops; any number of subscribers (possibly different users sharing a
+    single-flight run) can attach and replay from an event id.
+    When the last subscriber leaves, the run is cancelled unless someone
+    reattaches within the disconnect grace period.
+    """
+
+    def __init__(
+        self,
+        run_context: RunContext,
+        user_id: str,
+        buffer_size: int,
+        disconnect_grace: float,
+    ):
+        self.run_context = run_context
+        self.run_id = run_context.run_id
+        self.user_ids = {user_id}
+        self.flight_key: Optional[str] = None
+        self.succeeded = False
+        self.frames: deque[tuple[int, str]] = deque(maxlen=buffer_size)
+        self.last_seq = 0
+        self.done = False
+        self.finished_at: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+        self.disconnect_grace = disconnect_grace
+        self.subscribers = 0
+        self._cancel_handle: Optional[asyncio.TimerHandle] = None
+        self._signal = asyncio.Event()
+
+    def publish(self, frame: str):
+        """Assign the next event id to a frame and wake up subscribers."""
+        self.last_seq += 1
+        event_id = format_event_id(self.run_id, self.last_seq)
+        self.frames.append((self.last_seq, f"id: {event_id}\n{frame}"))
+        self._notify()
+
+    def finish(self):
+        self.done = True
+        self.finished_at = time.monotonic()
+        if self._cancel_handle is not None:
+            self._cancel_handle.cancel()
+            self._cancel_handle = None
+        self._notify()
+
+    def cancel(self, reason: str):
+        """Cancel the run: flag worker threads, then cancel the run task."""
+        if self.done:
+            return
+        logger.info(f"Cancelling run {self.run_id}: {reason}")
+        self.run_context.cancel_token.cancel(reason)
+        if self.task is not None:
+            self.task.cancel()
+
+    def _notify(self):
+        self._signal.set()
+        self._signal = asyncio.Event()
+
+    def _attach(self):
+        self.subscribers += 1
+        if self._cancel_handle is not None:
+            self._cancel_handle.cancel()
+            self._cancel_handle = None
+
+    def _detach(self):
+        self.subscribers -= 1
+        if self.subscribers == 0 and not self.done:
+            self._cancel_handle = asyncio.get_running_loop().call_later(
+                self.disconnect_grace, self.cancel, "client_disconnected"
+            )
+
+    async def subscribe(
+        self,
+        after_seq: int = 0,
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Yield every frame after ``after_seq``, then follow the live run.
+
+        If ``after_seq`` has already fallen out of the ring buffer, replay
+        starts from the oldest frame still retained. ``is_disconnected`` is
+        polled while waiting for frames so a dead client is noticed even when
+        the run is quiet.
+        """
+        cursor = after_seq
+        if self.frames and self.frames[0][0] > cursor + 1:
+            logger.warning(
+                f"Run {self.run_id}: frames {cursor + 1}..{self.frames[0][0] - 1} "
+                "were evicted before replay"
+            )
+
+        self._attach()
+        try:
+            while True:
+                signal = self._signal
+                for seq, frame in list(self.frames):
+                    if seq > cursor:
+                        cursor = seq
+                        yield frame
+                if self.done:
+                    return
+                try:
+                    await asyncio.wait_for(signal.wait(), CHAT_DISCONNECT_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    if is_disconnected is not None and await is_disconnected():
+                        return
+        finally:
+            self._detach()
+
+
+class StreamRegistry:
+    """Process-local registry of running and recently finished chat runs."""
+
+    def __init__(
+        self,
+        buffer_size: int,
+        retention_seconds: float,
+        disconnect_grace: float,
+        replay_window: float,
+    ):
+        self.buffer_size = buffer_size
+        self.retention_seconds = retention_seconds
+        self.disconnect_grace = disconnect_grace
+        self.replay_window = replay_window
+        self._runs: dict[str, RunStream] = {}
+        self._flights: dict[str, RunStream] = {}
+
+    def start(
+        self,
+        frames: AsyncIterator[str],
+        user_id: str,
+        run_context: RunContext,
+        flight_key: Optional[str] = None,
+    ) -> RunStream:
+        """
+        Start driving ``frames`` in the background and register the run.
+
+        With a ``flight_key`` the run becomes the leader that later identical
+        requests join through :meth:`join_flight`.
+        """
+        self._evict_expired()
+
+        run = RunStream(
+            run_context, user_id, self.buffer_size, self.disconnect_grace
+        )
+        self._runs[run.run_id] = run
+        if flight_key is not None:
+            run.flight_key = flight_key
+            self._flights[flight_key] = run
+            singleflight.inc(result="leader")
+        run.task = asyncio.create_task(self._drive(run, frames))
+        return run
+
+    def join_flight(
+        self, flight_key: Optional[str], user_id: str
+    ) -> Optional[RunStream]:
+        """
+        Return the run already serving ``flight_key`` so the caller can
+        subscribe from the first frame, or ``None`` if there is none.
+
+        Finished runs are reused only within the replay window, only if they
+        completed successfully and only while their first frame is still in
+        the ring buffer.
+        """
+        if flight_key is None:
+            return None
+        run = self._flights.get(flight_key)
+        if run is None:
+            return None
+
+        if run.done:
+            fresh = time.monotonic() - run.finished_at <= self.replay_window
+            complete = not run.frames or run.frames[0][0] == 1
+            if not (run.succeeded and fresh and complete):
+                del self._flights[flight_key]
+                return None
+            singleflight.inc(result="replayed")
+        else:
+            singleflight.inc(result="joined")
+
+        run.user_ids.add(user_id)
+        return run
+
+    def get(self, run_id: str) -> Optional[RunStream]:
+        self._evict_expired()
+        return self._runs.get(run_id)
+
+    async def _drive(self, run: RunStream, frames: AsyncIterator[str]):
+        try:
+            async for frame in frames:
+                run.publish(frame)
+            run.succeeded = True
+        except asyncio.CancelledError:
+            saved = record_cancelled_run(run.run_context)
+            logger.info(
+                f"Run {run.run_id} cancelled "
+                f"({run.run_context.cancel_token.reason}), ~{saved} tokens saved"
+            )
+        except Exception as e:
+            logger.error(f"Run {run.run_id} failed: {e}")
+            # Subscribers must not mistake a failed run for a finished one
+            run.publish(error_encoder.encode("error", str(e)))
+        finally:
+            await frames.aclose()
+            run.finish()
+
+    def _evict_expired(self):
+        now = time.monotonic()
+        expired = [
+            run_id
+            for run_id, run in self._runs.items()
+            if run.done and now - run.finished_at > self.retention_seconds
+        ]
+        for run_id in expired:
+            run = self._runs.pop(run_id)
+            if run.flight_key and self._flights.get(run.flight_key) is run:
+                del self._flights[run.flight_key]
+
+
+stream_registry = StreamRegistry(
+    buffer_size=CHAT_STREAM_BUFFER_FRAMES,
+    retention_seconds=CHAT_STREAM_RETENTION_SECONDS,
+    disconnect_grace=CHAT_DISCONNECT_GRACE_SECONDS,
+    replay_window=CHAT_SINGLEFLIGHT_REPLAY_SECONDS,
+)
+
+__all__ = [
+    "RunStream",
+    "StreamRegistry",
+    "stream_registry",
+    "parse_event_id",
+    "singleflight_key",
+]
@@ -0,0 +1,183 @@
+import asyncio
+from typing import Literal
+from fastapi import WebSocket, WebSocketDisconnect
+from pydantic import ValidationError
+from src.core.configs import WS_CHAT_MAX_STREAMS, WS_CHAT_OUTBOX_SIZE
+from src.core.utility.logging_utils import get_logger
+from src.model.routes.chat_models import ChatSocketMessage
+from src.tools.chat_runner.encoder import WebSocketFrameEncoder
+from src.tools.chat_runner.run_context import RunContext, record_cancelled_run
+from src.tools.chat_runner.admission import AdmissionRejected, admission_controller
+from src.tools.chat_runner.runner import run_graph
+
+logger = get_logger(__name__)
+
+# Close code sent to a connection that was replaced by a newer one from the
+# same device (4000-4999 is reserved for applications).
+CLOSE_REPLACED = 4000
+
+# Open sessions, one per (user_id, device_id).
+_sessions: dict[tuple[str, str], "ChatSocketSession"] = {}
+
+
+class ChatSocketSession:
+    """
+    One authenticated ``/ws/chat`` connection multiplexing several chat runs.
+
+    Each ``chat`` message starts a ``run_graph`` stream tagged with the
+    client's ``request_id``; frames carry the same ``response`` / ``quiz``
+    types as the SSE endpoint plus ``request_id``. A stream ends with a
+    ``done``, ``cancelled`` or ``error`` frame.
+
+    At most ``WS_CHAT_OUTBOX_SIZE`` stream frames wait for the socket, so a
+    slow client holds back its streams. The frame ending a stream skips that
+    bound and is never dropped.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        user_id: str,
+        user_type: Literal["user", "teacher"],
+        device_id: str,
+    ):
+        self.websocket = websocket
+        self.user_id = user_id
+        self.user_type = user_type
+        self.device_id = device_id
+        self.streams: dict[str, tuple[asyncio.Task, RunContext]] = {}
+        # (frame, holds an outbox slot)
+        self.outbox: asyncio.Queue[tuple[str, bool]] = asyncio.Queue()
+        self._outbox_slots = asyncio.Semaphore(WS_CHAT_OUTBOX_SIZE)
+
+    async def serve(self):
+        """Run the session until the client disconnects or is replaced."""
+        key = (self.user_id, self.device_id)
+        previous = _sessions.get(key)
+        _sessions[key] = self
+        if previous is not None:
+            await previous.close(CLOSE_REPLACED, "Replaced by a newer connection")
+
+        writer = asyncio.create_task(self._write_loop())
+        try:
+            while True:
+                await self._handle(await self.websocket.receive_text())
+        except (WebSocketDisconnect, RuntimeError):
+            # RuntimeError: the socket was closed server-side (replaced)
+            pass
+        finally:
+            for task, run_context in list(self.streams.values()):
+                run_context.cancel_token.cancel("client_disconnected")
+                task.cancel()
+            writer.cancel()
+            if _sessions.get(key) is self:
+                del _sessions[key]
+
+    async def close(self, code: int, reason: str):
+        try:
+            await self.websocket.close(code=code, reason=reason)
+        except Exception as e:
+            logger.debug(f"Closing replaced websocket failed: {e}")
+
+    async def _write_loop(self):
+        while True:
+            frame, holds_slot = await self.outbox.get()
+            try:
+                await self.websocket.send_text(frame)
+            finally:
+                if holds_slot:
+                    self._outbox_slots.release()
+
+    async def _send(self, frame: str):
+        """Queue a frame, waiting while the outbox is full."""
+        await self._outbox_slots.acquire()
+        self.outbox.put_nowait((frame, True))
+
+    @staticmethod
+    def _control_frame(
+        request_id: str, frame_type: str, content: str = "", **extra
+    ) -> str:
+        encoder = WebSocketFrameEncoder(fields={"request_id": request_id})
+        return encoder.encode_payload({"type": frame_type, "content": content, **extra})
+
+    async def _reject(self, request_id: str, reason: str):
+        """Answer a message that starts no stream with an ``error`` frame."""
+        await self._send(self._control_frame(request_id, "error", reason))
+
+    def _end_stream(self, request_id: str, frame_type: str, content: str = "", **extra):
+        """Queue the frame ending a stream; it does not wait for an outbox slot."""
+        self.outbox.put_nowait(
+            (self._control_frame(request_id, frame_type, content, **extra), False)
+        )
+
+    async def _handle(self, raw: str):
+        try:
+            message = ChatSocketMessage.model_validate_json(raw)
+        except ValidationError as e:
+            await self._reject("", f"Invalid message: {e}")
+            return
+
+        if message.type == "cancel":
+            stream = self.streams.get(message.request_id)
+            if stream is not None:
+                stream[1].cancel_token.cancel("client_cancelled")
+                stream[0].cancel()
+            return
+
+        if message.request_id in self.streams:
+            await self._reject(message.request_id, "Duplicate request_id")
+            return
+        if not message.query:
+            await self._reject(message.request_id, "Missing query")
+            return
+        if len(self.streams) >= WS_CHAT_MAX_STREAMS:
+            await self._reject(message.request_id, "Too many open streams")
+            return
+
+        run_context = RunContext()
+        task = asyncio.create_task(self._run_stream(message, run_context))
+        self.streams[message.request_id] = (task, run_context)
+
+    async def _run_stream(self, message: ChatSocketMessage, run_context: RunContext):
+        request_id = message.request_id
+        try:
+            ticket = await admission_controller.acquire(self.user_id)
+        except AdmissionRejected as e:
+            self._end_stream(
+                request_id,
+                "error",
+                f"Too many chat requests ({e.reason})",
+                retry_after=e.retry_after,
+            )
+            self.streams.pop(request_id, None)
+            return
+        except asyncio.CancelledError:
+            self.streams.pop(request_id, None)
+            self._end_stream(request_id, "cancelled")
+            return
+
+        try:
+            async for frame in run_graph(
+                user_id=self.user_id,
+                query=message.query,
+                lecture_id=message.lecture_id,
+                video_url=message.video_url,
+                user_type=self.user_type,
+                run_context=run_context,
+                encoder=WebSocketFrameEncoder(fields={"request_id": request_id}),
+            ):
+                await self._send(frame)
+            self._end_stream(request_id, "done")
+        except asyncio.CancelledError:
+            saved = record_cancelled_run(run_context)
+            logger.info(f"Stream {request_id} cancelled, ~{saved} tokens saved")
+            self._end_stream(request_id, "cancelled")
+        except Exception as e:
+            logger.error(f"Stream {request_id} failed: {e}")
+            self._end_stream(request_id, "error", str(e))
+        finally:
+            ticket.release()
+            self.streams.pop(request_id, None)
+
+
+__all__ = ["ChatSocketSession"]
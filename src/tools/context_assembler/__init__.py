@@ -0,0 +1,10 @@
+from .assembler import AssembledContext, ContextAssembler, assemble_context
+from .tokens import count_tokens, truncate_tokens
+
+__all__ = [
+    "AssembledContext",
+    "ContextAssembler",
+    "assemble_context",
+    "count_tokens",
+    "truncate_tokens",
+]
@@ -0,0 +1,210 @@
+"""Fit the context attached to a prompt into a per-model token budget."""
+
+import json
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Optional
+from src.core.configs import RESPONSE_CONTEXT_BUDGETS
+from src.tools.context_assembler.tokens import count_tokens, truncate_tokens
+
+_WORD = re.compile(r"\w+")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+|\n+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by do does for from how i in is it me my of on or "
+    "the this to was what when where which who why with you your".split()
+)
+
+
+def terms(text: str) -> list[str]:
+    return [w for w in _WORD.findall(text.lower()) if w not in _STOPWORDS]
+
+
+@dataclass
+class AssembledContext:
+    """Rendered, trimmed context sources plus their token counts."""
+
+    texts: dict[str, str] = field(default_factory=dict)
+    tokens_before: dict[str, int] = field(default_factory=dict)
+    tokens_after: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def total_before(self) -> int:
+        return sum(self.tokens_before.values())
+
+    @property
+    def total_after(self) -> int:
+        return sum(self.tokens_after.values())
+
+
+def split_spans(text: str, model: str, span_tokens: int = 120) -> list[str]:
+    """Group sentences of ``text`` into spans of roughly ``span_tokens``."""
+    spans, current, size = [], [], 0
+    for sentence in _SENTENCE_END.split(text):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        current.append(sentence)
+        size += count_tokens(sentence, model)
+        if size >= span_tokens:
+            spans.append(" ".join(current))
+            current, size = [], 0
+    if current:
+        spans.append(" ".join(current))
+    return spans
+
+
+def rank_by_relevance(query: str, passages: list[str]) -> list[int]:
+    """Indices of ``passages``, most query-relevant first (BM25-style scoring)."""
+    query_terms = set(terms(query))
+    if not query_terms or not passages:
+        return list(range(len(passages)))
+
+    counts = [Counter(terms(passage)) for passage in passages]
+    average = sum(sum(c.values()) for c in counts) / len(counts) or 1
+    document_frequency = Counter(t for c in counts for t in query_terms if t in c)
+
+    def score(i: int) -> float:
+        length = sum(counts[i].values())
+        total = 0.0
+        for term in query_terms:
+            tf = counts[i].get(term, 0)
+            if not tf:
+                continue
+            df = document_frequency[term]
+            idf = math.log(1 + (len(passages) - df + 0.5) / (df + 0.5))
+            total += idf * tf * 2.2 / (tf + 1.2 * (0.25 + 0.75 * length / average))
+        return total
+
+    return sorted(range(len(passages)), key=lambda i: (-score(i), i))
+
+
+def select_passages(
+    query: str, passages: list[str], budget: int, model: str, keep_order: bool
+) -> list[str]:
+    """
+    Pick the most relevant ``passages`` that fit in ``budget`` tokens. With
+    ``keep_order`` the picks are returned in their original order.
+    """
+    picked, used = [], 0
+    for i in rank_by_relevance(query, passages):
+        cost = count_tokens(passages[i], model) + 1
+        if used + cost > budget:
+            continue
+        picked.append(i)
+        used += cost
+    if keep_order:
+        picked.sort()
+    return [passages[i] for i in picked]
+
+
+def _normalize(text: str) -> str:
+    return " ".join(_WORD.findall(text.lower()))
+
+
+def render_search_results(results: list[dict]) -> list[str]:
+    """One line per result, dropping repeated URLs and duplicate snippets."""
+    lines, seen = [], set()
+    for result in results:
+        url = result.get("url") or ""
+        snippet = _normalize(result.get("snippet") or "")
+        if (url and url in seen) or (snippet and snippet in seen):
+            continue
+        seen.update(key for key in (url, snippet) if key)
+        title = result.get("title", "")
+        lines.append(f"- {title}: {result.get('snippet', '')} ({url})")
+    return lines
+
+
+def render_videos(value: dict) -> list[str]:
+    return [
+        f"- {video.get('title', '')} ({video.get('url', '')})"
+        for video in value.get("videos") or []
+    ]
+
+
+class ContextAssembler:
+    """Renders the context sources of a prompt, trimmed into ``budget`` tokens."""
+
+    def __init__(self, model: str, budget: int):
+        self.model = model
+        self.budget = budget
+
+    def _passages(self, name: str, value: Any) -> tuple[list[str], bool, str]:
+        """Split a source into ``(passages, keep_order, separator)``."""
+        if name == "search_results" and isinstance(value, list):
+            return render_search_results(value), False, "\n"
+        if isinstance(value, dict) and "transcript" in value:
+            transcript = split_spans(value.get("transcript") or "", self.model)
+            return render_videos(value) + transcript, True, "\n"
+        if isinstance(value, str):
+            return split_spans(value, self.model), True, " "
+        return [], True, ""
+
+    @staticmethod
+    def render(name: str, value: Any) -> str:
+        """Untrimmed prompt text of a source."""
+        if isinstance(value, str):
+            return value
+        if name == "search_results" and isinstance(value, list):
+            return "\n".join(render_search_results(value))
+        if isinstance(value, dict) and "transcript" in value:
+            return "\n".join(render_videos(value) + [value.get("transcript") or ""])
+        return json.dumps(value, ensure_ascii=False)
+
+    def assemble(self, query: str, sources: dict[str, Any]) -> AssembledContext:
+        context = AssembledContext()
+        rendered = {
+            name: self.render(name, value)
+            for name, value in sources.items()
+            if value is not None
+        }
+        for name, text in rendered.items():
+            context.tokens_before[name] = count_tokens(text, self.model)
+
+        # Water-filling: smallest sources first, each capped at a fair share
+        # of what is left.
+        shares: dict[str, int] = {}
+        remaining = self.budget
+        order = sorted(rendered, key=context.tokens_before.get)
+        for position, name in enumerate(order):
+            fair = remaining // (len(order) - position)
+            shares[name] = min(context.tokens_before[name], fair)
+            remaining -= shares[name]
+
+        for name, text in rendered.items():
+            if context.tokens_before[name] > shares[name]:
+                text = self._trim(name, sources[name], text, query, shares[name])
+            context.texts[name] = text
+            context.tokens_after[name] = count_tokens(text, self.model)
+        return context
+
+    def _trim(self, name: str, value: Any, text: str, query: str, budget: int) -> str:
+        passages, keep_order, separator = self._passages(name, value)
+        if not passages:
+            return truncate_tokens(text, budget, self.model)
+        return separator.join(
+            select_passages(query, passages, budget, self.model, keep_order)
+        )
+
+
+def assemble_context(
+    query: str, sources: dict[str, Any], model: str, budget: Optional[int] = None
+) -> AssembledContext:
+    """Render and trim ``sources`` into ``budget`` tokens for ``model``."""
+    if budget is None:
+        budget = RESPONSE_CONTEXT_BUDGETS.get(
+            model, RESPONSE_CONTEXT_BUDGETS.get("default", 4000)
+        )
+    return ContextAssembler(model, budget).assemble(query, sources)
+
+
+__all__ = [
+    "AssembledContext",
+    "ContextAssembler",
+    "assemble_context",
+    "rank_by_relevance",
+    "render_search_results",
+    "split_spans",
+]
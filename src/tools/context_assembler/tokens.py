@@ -0,0 +1,46 @@
+"""Fast local token counting, with tiktoken when it is available."""
+
+import math
+from functools import lru_cache
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+
+@lru_cache(maxsize=None)
+def _encoding(model: str):
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+def count_tokens(text: str, model: str = "gpt-4o") -> int:
+    """Number of tokens ``text`` takes for ``model``."""
+    if not text:
+        return 0
+    encoding = _encoding(model)
+    if encoding is None:
+        # About four characters per token for English text.
+        return math.ceil(len(text) / 4)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_tokens(text: str, limit: int, model: str = "gpt-4o") -> str:
+    """Cut ``text`` down to at most ``limit`` tokens."""
+    if limit <= 0:
+        return ""
+    encoding = _encoding(model)
+    if encoding is None:
+        return text[: limit * 4]
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= limit:
+        return text
+    return encoding.decode(tokens[:limit])
+
+
+__all__ = ["count_tokens", "truncate_tokens"]
@@ -0,0 +1,17 @@
+from .classifier import (
+    IntentClassifier,
+    IntentPrediction,
+    classify_quiz_intent,
+    load_classifier,
+    log_labelled_query,
+    train_from_log,
+)
+
+__all__ = [
+    "IntentClassifier",
+    "IntentPrediction",
+    "classify_quiz_intent",
+    "load_classifier",
+    "log_labelled_query",
+    "train_from_log",
+]
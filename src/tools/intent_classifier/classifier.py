@@ -0,0 +1,274 @@
+"""Local intent classifier: regex rules plus a hashed n-gram linear model."""
+
+import json
+import math
+import os
+import random
+import re
+import threading
+import zlib
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+INTENTS = ("schedule", "course_planner", "other")
+
+# (intent, pattern, confidence). A query matching rules of a single intent
+# gets that intent with the highest confidence among them; conflicting
+# matches defer to the model.
+RULES = [
+    (
+        "schedule",
+        re.compile(
+            r"^(please )?(remind|schedule|notify|alert|wake)\b|\b(remind me|"
+            r"notify me|(set|create|add) (a |an |my )?(reminder|alarm)|every (day|"
+            r"morning|evening|night|week|monday|tuesday|wednesday|thursday|friday|"
+            r"saturday|sunday)|daily at|tomorrow at|at \d{1,2}(:\d{2})? ?(am|pm)|"
+            r"in \d+ (minutes?|hours?|days?))\b"
+        ),
+        0.95,
+    ),
+    # The bare words are often about a course schedule: below the fast path
+    ("schedule", re.compile(r"\b(remind(er|ers)?|schedule[sd]?|alarms?)\b"), 0.6),
+    (
+        "course_planner",
+        re.compile(
+            r"\b(study plan|learning (path|plan|roadmap)|roadmap|curriculum|"
+            r"syllabus|course plan|plan (a|my) (course|study|studies)|"
+            r"how (do|should|can) i (start )?(learn|learning|master)|"
+            r"(want|going) to learn)\b"
+        ),
+        0.93,
+    ),
+    (
+        "other",
+        re.compile(
+            r"^(what|who|why|when|where|which|explain|define|describe|"
+            r"summari[sz]e|tell me about|how does|how do .* work|"
+            r"difference between|hi|hello|hey|thanks|thank you)\b"
+        ),
+        0.85,
+    ),
+]
+
+# Quiz intent of lecture questions: "quiz" to take a quiz on the lecture,
+# "answer" for a question about it.
+QUIZ_RULES = [
+    (
+        "quiz",
+        re.compile(
+            r"\b(quiz(zes)?|test me|test my (knowledge|understanding)|mcqs?|"
+            r"multiple[- ]choice|practice (questions|test)|"
+            r"ask me (some |a few )?questions)\b"
+        ),
+        0.95,
+    ),
+    (
+        "answer",
+        re.compile(
+            r"^(what|who|why|when|where|which|how|explain|define|describe|"
+            r"summari[sz]e|tell me|can you explain|difference between)\b"
+        ),
+        0.85,
+    ),
+]
+
+_TOKEN = re.compile(r"\w+")
+
+# Serializes appends and rotation of the training log across threads
+_log_lock = threading.Lock()
+
+
+@dataclass
+class IntentPrediction:
+    intent: str
+    confidence: float
+    source: str  # "rule", "model" or "none"
+
+
+def extract_features(query: str, buckets: int) -> list[int]:
+    """Hash word unigrams and bigrams of ``query`` into ``buckets`` slots."""
+    tokens = _TOKEN.findall(query.lower())
+    grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    return [zlib.crc32(gram.encode("utf-8")) % buckets for gram in grams]
+
+
+def _softmax(scores: list[float]) -> list[float]:
+    top = max(scores)
+    exps = [math.exp(score - top) for score in scores]
+    total = sum(exps)
+    return [value / total for value in exps]
+
+
+class HashedLinearModel:
+    """Multinomial logistic regression over hashed n-gram features."""
+
+    def __init__(
+        self,
+        labels: tuple[str, ...] = INTENTS,
+        buckets: int = 1 << 18,
+        weights: Optional[dict[int, list[float]]] = None,
+        bias: Optional[list[float]] = None,
+    ):
+        self.labels = labels
+        self.buckets = buckets
+        self.weights = weights or {}
+        self.bias = bias or [0.0] * len(labels)
+
+    def predict_proba(self, query: str) -> list[float]:
+        scores = list(self.bias)
+        for feature in extract_features(query, self.buckets):
+            row = self.weights.get(feature)
+            if row is not None:
+                for i, weight in enumerate(row):
+                    scores[i] += weight
+        return _softmax(scores)
+
+    def predict(self, query: str) -> tuple[str, float]:
+        probs = self.predict_proba(query)
+        best = max(range(len(probs)), key=probs.__getitem__)
+        return self.labels[best], probs[best]
+
+    def fit(
+        self,
+        samples: Iterable[tuple[str, str]],
+        epochs: int = 10,
+        learning_rate: float = 0.5,
+        seed: int = 0,
+    ) -> "HashedLinearModel":
+        """Train with plain SGD on ``(query, intent)`` pairs."""
+        data = [
+            (extract_features(query, self.buckets), self.labels.index(intent))
+            for query, intent in samples
+            if intent in self.labels
+        ]
+        rng = random.Random(seed)
+        for _ in range(epochs):
+            rng.shuffle(data)
+            for features, target in data:
+                scores = list(self.bias)
+                for feature in features:
+                    row = self.weights.get(feature)
+                    if row is not None:
+                        for i, weight in enumerate(row):
+                            scores[i] += weight
+                probs = _softmax(scores)
+                for i, prob in enumerate(probs):
+                    gradient = learning_rate * ((1.0 if i == target else 0.0) - prob)
+                    self.bias[i] += gradient
+                    for feature in features:
+                        row = self.weights.setdefault(feature, [0.0] * len(self.labels))
+                        row[i] += gradient
+        return self
+
+    def save(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "labels": list(self.labels),
+                    "buckets": self.buckets,
+                    "bias": self.bias,
+                    "weights": {str(k): v for k, v in self.weights.items()},
+                },
+                f,
+            )
+
+    @classmethod
+    def load(cls, path: str) -> "HashedLinearModel":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(
+            labels=tuple(data["labels"]),
+            buckets=data["buckets"],
+            weights={int(k): v for k, v in data["weights"].items()},
+            bias=data["bias"],
+        )
+
+
+def match_rules(rules: list, text: str) -> Optional[IntentPrediction]:
+    """The prediction of ``rules`` if ``text`` matches rules of exactly one intent."""
+    matched = {}
+    for intent, rule, conf in rules:
+        if rule.search(text):
+            matched[intent] = max(conf, matched.get(intent, 0.0))
+    if len(matched) != 1:
+        return None
+    intent, confidence = next(iter(matched.items()))
+    return IntentPrediction(intent, confidence, "rule")
+
+
+class IntentClassifier:
+    """Rules first, then the linear model if one has been trained."""
+
+    def __init__(self, model: Optional[HashedLinearModel] = None):
+        self.model = model
+
+    def classify(self, query: str) -> IntentPrediction:
+        text = query.strip().lower()
+        prediction = match_rules(RULES, text)
+        if prediction is not None:
+            return prediction
+
+        if self.model is not None:
+            intent, confidence = self.model.predict(text)
+            return IntentPrediction(intent, confidence, "model")
+
+        return IntentPrediction("other", 0.0, "none")
+
+
+def classify_quiz_intent(query: str) -> IntentPrediction:
+    """Whether a lecture question asks for a quiz ("quiz") or an answer ("answer")."""
+    prediction = match_rules(QUIZ_RULES, query.strip().lower())
+    return prediction or IntentPrediction("answer", 0.0, "none")
+
+
+def load_classifier(model_path: str) -> IntentClassifier:
+    """Build a classifier, using the trained model at ``model_path`` if present."""
+    model = HashedLinearModel.load(model_path) if os.path.exists(model_path) else None
+    return IntentClassifier(model)
+
+
+def log_labelled_query(
+    log_path: str, query: str, intent: str, max_bytes: Optional[int] = None
+):
+    """
+    Append an LLM-labelled query to the training log (JSON lines). Blocking.
+    A log over ``max_bytes`` is rotated to ``<log_path>.1``, replacing the
+    previous one.
+    """
+    line = json.dumps({"query": query, "intent": intent}) + "\n"
+    with _log_lock:
+        try:
+            if max_bytes is not None and os.path.getsize(log_path) >= max_bytes:
+                os.replace(log_path, log_path + ".1")
+        except FileNotFoundError:
+            pass
+        with open(log_path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+
+def train_from_log(log_path: str, model_path: str, epochs: int = 10) -> int:
+    """
+    Train a model on the labelled query log, and its rotated predecessor,
+    and save it; returns sample count.
+    """
+    rotated = log_path + ".1"
+    samples = []
+    for path in ([rotated] if os.path.exists(rotated) else []) + [log_path]:
+        with open(path, "r", encoding="utf-8") as f:
+            samples += [json.loads(line) for line in f if line.strip()]
+    HashedLinearModel().fit(
+        ((s["query"], s["intent"]) for s in samples), epochs=epochs
+    ).save(model_path)
+    return len(samples)
+
+
+__all__ = [
+    "INTENTS",
+    "IntentPrediction",
+    "HashedLinearModel",
+    "IntentClassifier",
+    "classify_quiz_intent",
+    "load_classifier",
+    "log_labelled_query",
+    "train_from_log",
+]
@@ -0,0 +1,25 @@
+"""
+Train the local intent model from the labelled query log.
+
+    python -m src.tools.intent_classifier.train [--log intent_log.jsonl]
+        [--out intent_model.json] [--epochs 10]
+"""
+
+import argparse
+from src.core.configs import INTENT_LOG_PATH, INTENT_MODEL_PATH
+from src.tools.intent_classifier.classifier import train_from_log
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--log", default=INTENT_LOG_PATH)
+    parser.add_argument("--out", default=INTENT_MODEL_PATH)
+    parser.add_argument("--epochs", type=int, default=10)
+    args = parser.parse_args()
+
+    count = train_from_log(args.log, args.out, epochs=args.epochs)
+    print(f"Trained intent model on {count} samples -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,8 @@
 import os
 from typing import Optional
 import httpx
+from src.tools.chat_runner.run_context import CancelToken, RunCancelled
+from src.tools.youtube_transcriber.worker_pool import get_ytdlp_pool
 
 
 async def web_search(query: str, max_results: int = 5) -> list[dict]:
@@ -69,7 +71,30 @@ async def web_search(query: str, max_results: int = 5) -> list[dict]:
         return []
 
 
-async def search_youtube_videos(query: str, max_results: int = 3) -> list[dict]:
+def _extract_youtube_search(
+    search_query: str, cancel_token: Optional[CancelToken] = None
+) -> Optional[dict]:
+    """Run a blocking yt-dlp search; meant to be called from a worker thread."""
+    import yt_dlp
+
+    ydl_opts = {
+        "quiet": True,
+        "no_warnings": True,
+        "extract_flat": True,
+    }
+
+    if cancel_token is not None:
+        cancel_token.raise_if_cancelled()
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        result = ydl.extract_info(search_query, download=False)
+    if cancel_token is not None:
+        cancel_token.raise_if_cancelled()
+    return result
+
+
+async def search_youtube_videos(
+    query: str, max_results: int = 3, cancel_token: Optional[CancelToken] = None
+) -> list[dict]:
     """
     Search for YouTube videos related to the query.
     Returns video URLs and metadata.
@@ -77,6 +102,7 @@ async def search_youtube_videos(query: str, max_results: int = 3) -> list[dict]:
     Args:
         query: Search query
         max_results: Max videos to return
+        cancel_token: Cancels the yt-dlp worker thread when the run is cancelled
 
     Returns:
         List of video data with url, title, description
@@ -85,36 +111,31 @@ async def search_youtube_videos(query: str, max_results: int = 3) -> list[dict]:
         # Use YouTube Data API or yt-dlp search
         search_query = f"ytsearch{max_results}:{query}"
 
-        import yt_dlp
-
-        ydl_opts = {
-            "quiet": True,
-            "no_warnings": True,
-            "extract_flat": True,
-        }
-
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            result = ydl.extract_info(search_query, download=False)
+        result = await get_ytdlp_pool().run(
+            "search", _extract_youtube_search, search_query, cancel_token=cancel_token
+        )
 
-            if not result or "entries" not in result:
-                return []
+        if not result or "entries" not in result:
+            return []
 
-            videos = []
-            for entry in result["entries"][:max_results]:
-                if entry:
-                    videos.append(
-                        {
-                            "title": entry.get("title", "Unknown"),
-                            "url": f"https://www.youtube.com/watch?v={entry.get('id', '')}",
-                            "description": entry.get("description", "")[
-                                :200
-                            ],  # Truncate
-                            "duration": entry.get("duration", 0),
-                        }
-                    )
+        videos = []
+        for entry in result["entries"][:max_results]:
+            if entry:
+                videos.append(
+                    {
+                        "title": entry.get("title", "Unknown"),
+                        "url": f"https://www.youtube.com/watch?v={entry.get('id', '')}",
+                        "description": entry.get("description", "")[
+                            :200
+                        ],  # Truncate
+                        "duration": entry.get("duration", 0),
+                    }
+                )
 
-            return videos
+        return videos
 
+    except RunCancelled:
+        raise
     except Exception as e:
         from src import get_logger
 
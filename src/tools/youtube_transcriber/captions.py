@@ -0,0 +1,224 @@
+"""Caption parsing and chunking for transcript retrieval."""
+
+import html
+import re
+from array import array
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Union
+
+_TIMING = re.compile(
+    r"(?:(\d+):)?(\d{2}):(\d{2})[,.](\d{3})\s*-->\s*"
+    r"(?:(\d+):)?(\d{2}):(\d{2})[,.](\d{3})"
+)
+_TAG = re.compile(r"<[^>]*>")
+
+
+@dataclass
+class Cue:
+    start: float
+    end: float
+    text: str
+
+
+@dataclass
+class TranscriptChunk:
+    index: int
+    start: float
+    end: float
+    text: str
+
+
+class Segments:
+    """
+    Timestamped caption segments in flat arrays: start and end times in
+    seconds, and offsets into one string holding the text of every segment,
+    separated by single spaces, so that string is also the plain transcript.
+    Iterating yields :class:`Cue` objects.
+    """
+
+    __slots__ = ("starts", "ends", "offsets", "text")
+
+    def __init__(self, starts: array, ends: array, pieces: list[str]):
+        self.starts = starts
+        self.ends = ends
+        self.text = " ".join(pieces)
+        # offsets[i] is where segment i starts; the last entry closes the last
+        self.offsets = array("L", [0])
+        position = 0
+        for piece in pieces:
+            position += len(piece) + 1
+            self.offsets.append(position)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def span_text(self, first: int, stop: int) -> str:
+        """Text of segments ``first`` up to, not including, ``stop``."""
+        return self.text[self.offsets[first] : self.offsets[stop] - 1]
+
+    def __getitem__(self, i: int) -> Cue:
+        if not -len(self) <= i < len(self):
+            raise IndexError(i)
+        i %= len(self)
+        return Cue(self.starts[i], self.ends[i], self.span_text(i, i + 1))
+
+    def __iter__(self) -> Iterator[Cue]:
+        for i in range(len(self)):
+            yield Cue(self.starts[i], self.ends[i], self.span_text(i, i + 1))
+
+
+def _seconds(hours: str, minutes: str, seconds: str, millis: str) -> float:
+    return (
+        int(hours or 0) * 3600 + int(minutes) * 60 + int(seconds) + int(millis) / 1000
+    )
+
+
+def parse_captions(source: Union[str, Iterable[str]]) -> Segments:
+    """
+    Parse SRT or WebVTT captions into segments in a single pass. ``source``
+    is the caption text or any iterable of its lines, such as an open file
+    or a streamed response.
+
+    Cue numbers, headers, notes and markup are dropped. YouTube's
+    auto-generated captions roll: each cue repeats the previous line. A
+    repeated line is kept once, a line that grows the previous one only adds
+    its new words, and a cue with nothing new extends the previous segment.
+    """
+    if isinstance(source, str):
+        source = source.splitlines()
+
+    starts, ends, pieces = array("d"), array("d"), []
+    # Timings are only converted for cues that are kept: `timing` is the
+    # match of the cue being read, `tail` that of the last cue since the
+    # previous segment that had nothing new and extends it
+    timing = tail = None
+    kept: list[str] = []
+    last_line = ""
+
+    def close_cue():
+        nonlocal tail
+        if kept:
+            close_tail()
+            groups = timing.groups()
+            starts.append(_seconds(*groups[:4]))
+            ends.append(_seconds(*groups[4:]))
+            pieces.append(" ".join(kept))
+        elif pieces:
+            tail = timing
+
+    def close_tail():
+        nonlocal tail
+        if tail is not None:
+            ends[-1] = max(ends[-1], _seconds(*tail.groups()[4:]))
+            tail = None
+
+    for line in source:
+        line = line.strip()
+        if not line:
+            if timing is not None:
+                close_cue()
+                timing, kept = None, []
+            continue
+        if "-->" in line:
+            match = _TIMING.search(line)
+            if match:
+                if timing is not None:
+                    close_cue()
+                timing, kept = match, []
+                continue
+        if timing is None:
+            # Cue number, WEBVTT header, NOTE or STYLE block
+            continue
+        if "<" in line:
+            line = _TAG.sub("", line).strip()
+        if "&" in line:
+            line = html.unescape(line)
+        if not line or line == last_line:
+            continue
+        if last_line and line.startswith(last_line + " "):
+            kept.append(line[len(last_line) + 1 :])
+        else:
+            kept.append(line)
+        last_line = line
+
+    if timing is not None:
+        close_cue()
+    close_tail()
+    return Segments(starts, ends, pieces)
+
+
+def chunk_segments(segments: Segments, max_chars: int) -> list[TranscriptChunk]:
+    """Group consecutive segments into chunks of about ``max_chars`` characters."""
+    chunks, first, size = [], 0, 0
+    offsets = segments.offsets
+    for i in range(len(segments)):
+        size += offsets[i + 1] - offsets[i]
+        if size >= max_chars:
+            chunks.append(_make_chunk(len(chunks), segments, first, i + 1))
+            first, size = i + 1, 0
+    if first < len(segments):
+        chunks.append(_make_chunk(len(chunks), segments, first, len(segments)))
+    return chunks
+
+
+def _make_chunk(
+    index: int, segments: Segments, first: int, stop: int
+) -> TranscriptChunk:
+    return TranscriptChunk(
+        index=index,
+        start=segments.starts[first],
+        end=segments.ends[stop - 1],
+        text=segments.span_text(first, stop),
+    )
+
+
+def format_timestamp(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes}:{seconds:02d}"
+
+
+def render_chunks(chunks: list[TranscriptChunk]) -> str:
+    """Chunks as prompt text, each prefixed with its time range."""
+    return "\n".join(
+        f"[{format_timestamp(chunk.start)}-{format_timestamp(chunk.end)}] {chunk.text}"
+        for chunk in chunks
+    )
+
+
+def plain_text(segments: Segments) -> str:
+    """The transcript as plain text, without timings."""
+    return segments.text
+
+
+def coarse_timestamps(segments: Segments, interval: float = 60.0) -> str:
+    """
+    The transcript as plain text in lines of about ``interval`` seconds, each
+    starting with a ``[m:ss]`` timestamp.
+    """
+    lines, first, marker, next_mark = [], 0, "", None
+    for i in range(len(segments)):
+        start = segments.starts[i]
+        if next_mark is None or start >= next_mark:
+            if i:
+                lines.append(f"{marker} {segments.span_text(first, i)}")
+            first, marker = i, f"[{format_timestamp(start)}]"
+            next_mark = (start // interval + 1) * interval
+    if len(segments):
+        lines.append(f"{marker} {segments.span_text(first, len(segments))}")
+    return "\n".join(lines)
+
+
+__all__ = [
+    "Cue",
+    "TranscriptChunk",
+    "Segments",
+    "parse_captions",
+    "chunk_segments",
+    "format_timestamp",
+    "render_chunks",
+    "plain_text",
+    "coarse_timestamps",
+]
@@ -1,13 +1,20 @@
 import re
 import os
+import tempfile
 from typing import Optional
 from pydantic import BaseModel
 import yt_dlp
+from src.core.configs import CAPTION_FETCH_MODE
+from src.core.utility.logging_utils import get_logger
+from src.tools.chat_runner.run_context import CancelToken, RunCancelled
+from src.tools.youtube_transcriber.transcript_cache import get_transcript_cache
+from src.tools.youtube_transcriber.worker_pool import get_ytdlp_pool
 
-# --- Setup ---
+logger = get_logger(__name__)
 
-# Create directories
-os.makedirs("captions", exist_ok=True)
+# Caption formats the parser reads, in order of preference
+CAPTION_FORMATS = ("srt", "vtt")
+CAPTION_READ_CHUNK_BYTES = 64 * 1024
 
 
 # --- Pydantic Models ---
@@ -38,10 +45,25 @@ def extract_video_id(url: str) -> str:
     raise ValueError("Invalid YouTube URL format")
 
 
+def cancel_hook(cancel_token: Optional[CancelToken]):
+    """yt-dlp progress hook that aborts the download once the run is cancelled."""
+
+    def hook(_progress: dict):
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+
+    return hook
+
+
 def download_captions_srt(
-    video_url: str, language_code: str = "en", output_dir: str = "captions"
+    video_url: str,
+    language_code: str = "en",
+    output_dir: str = "captions",
+    cancel_token: Optional[CancelToken] = None,
 ):
     """Downloads the best available .srt caption file."""
+    if cancel_token is not None:
+        cancel_token.raise_if_cancelled()
     os.makedirs(output_dir, exist_ok=True)
     output_template = os.path.join(output_dir, "%(id)s.%(lang)s.%(ext)s")
 
@@ -54,12 +76,15 @@ def download_captions_srt(
         "outtmpl": output_template,
         "quiet": True,
         "no_warnings": True,
+        "progress_hooks": [cancel_hook(cancel_token)],
     }
 
     try:
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
             info = ydl.extract_info(video_url, download=True)
             video_id = info.get("id")
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
 
             if not video_id:
                 return None
@@ -68,37 +93,137 @@ def download_captions_srt(
             if os.path.exists(expected_file):
                 return expected_file
 
-            # Fallback check
-            for file in os.listdir(output_dir):
-                if file.startswith(video_id) and file.endswith(".srt"):
-                    return os.path.join(output_dir, file)
+            # yt-dlp records where it wrote each track, e.g. when no .srt
+            # was offered and another format was downloaded instead
+            track = (info.get("requested_subtitles") or {}).get(language_code)
+            caption_file = (track or {}).get("filepath")
+            if caption_file and os.path.exists(caption_file):
+                return caption_file
 
             return None
 
+    except RunCancelled:
+        raise
     except Exception as e:
-        print(f"Error downloading captions: {e}")
+        logger.error(f"Error downloading captions: {e}")
         return None
 
 
-async def get_transcript(video_url: str, language_code: Optional[str] = "en"):
+def fetch_captions(
+    video_url: str,
+    language_code: str = "en",
+    cancel_token: Optional[CancelToken] = None,
+) -> Optional[str]:
+    """Download the captions of a video to a scratch directory and read them."""
+    with tempfile.TemporaryDirectory(prefix="captions-") as output_dir:
+        caption_file = download_captions_srt(
+            video_url, language_code, output_dir, cancel_token=cancel_token
+        )
+        if not caption_file or not os.path.exists(caption_file):
+            return None
+
+        # Read SRT file
+        with open(caption_file, "r", encoding="utf-8") as f:
+            return f.read()
+
+
+def select_caption_track(info: dict, language_code: str) -> Optional[dict]:
     """
-    Get transcript from YouTube video using captions only.
+    The caption track of ``language_code`` in a yt-dlp info dict, preferring
+    uploaded subtitles over automatic captions, or ``None``.
     """
+    for source in ("subtitles", "automatic_captions"):
+        tracks = (info.get(source) or {}).get(language_code) or []
+        for ext in CAPTION_FORMATS:
+            for track in tracks:
+                if track.get("ext") == ext and track.get("url"):
+                    return track
+    return None
+
+
+def read_captions(
+    video_url: str,
+    language_code: str = "en",
+    cancel_token: Optional[CancelToken] = None,
+) -> Optional[str]:
+    """Read the captions of a video from its track URL, without any file."""
+    if cancel_token is not None:
+        cancel_token.raise_if_cancelled()
+
+    ydl_opts = {
+        "skip_download": True,
+        "quiet": True,
+        "no_warnings": True,
+    }
+
+    try:
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            info = ydl.extract_info(video_url, download=False)
+            track = select_caption_track(info, language_code)
+            if track is None:
+                return None
+
+            parts = []
+            # yt-dlp's opener, so proxy and cookie settings apply
+            with ydl.urlopen(track["url"]) as response:
+                while True:
+                    if cancel_token is not None:
+                        cancel_token.raise_if_cancelled()
+                    chunk = response.read(CAPTION_READ_CHUNK_BYTES)
+                    if not chunk:
+                        break
+                    parts.append(chunk)
+            return b"".join(parts).decode("utf-8", errors="replace")
+
+    except RunCancelled:
+        raise
+    except Exception as e:
+        logger.error(f"Error downloading captions: {e}")
+        return None
+
+
+# How get_transcript downloads captions: through a scratch file written by
+# yt-dlp, or read from the track URL in memory
+CAPTION_FETCHERS = {
+    "file": fetch_captions,
+    "memory": read_captions,
+}
+
+
+async def get_transcript(
+    video_url: str,
+    language_code: Optional[str] = "en",
+    cancel_token: Optional[CancelToken] = None,
+    timeout: Optional[float] = None,
+    fetch_mode: Optional[str] = None,
+):
+    """
+    Get transcript from YouTube video using captions only, through the
+    transcript cache and the yt-dlp pool.
+    """
+    if cancel_token is not None:
+        cancel_token.raise_if_cancelled()
     try:
         video_id = extract_video_id(video_url)
     except ValueError as e:
         raise RuntimeError(str(e))
 
-    # Download captions
     language = language_code or "en"
-    caption_file = download_captions_srt(video_url, language)
+    mode = fetch_mode or CAPTION_FETCH_MODE
+    if mode not in CAPTION_FETCHERS:
+        raise ValueError(f"Unknown caption fetch mode: {mode}")
 
-    if not caption_file or not os.path.exists(caption_file):
-        raise RuntimeError(f"No captions available for language: {language}")
+    async def download() -> Optional[str]:
+        return await get_ytdlp_pool().run(
+            "captions", CAPTION_FETCHERS[mode], video_url, language, timeout=timeout
+        )
+
+    transcript_text = await get_transcript_cache().get_or_fetch(
+        video_id, language, download
+    )
 
-    # Read SRT file
-    with open(caption_file, "r", encoding="utf-8") as f:
-        transcript_text = f.read()
+    if transcript_text is None:
+        raise RuntimeError(f"No captions available for language: {language}")
 
     return transcript_text
 
@@ -0,0 +1,259 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Awaitable, Callable, Optional
+from src.core.configs import (
+    TRANSCRIPT_CACHE_DIR,
+    TRANSCRIPT_CACHE_MAX_BYTES,
+    TRANSCRIPT_CACHE_MEMORY_ENTRIES,
+    TRANSCRIPT_CACHE_TTL_SECONDS,
+)
+from src.core.utility.logging_utils import get_logger
+from src.core.utility.metrics import metrics
+from src.core.utility.tasks import spawn_detached
+from src.core.utility.ttl_cache import TTLCache
+
+logger = get_logger(__name__)
+
+lookups = metrics.counter(
+    "transcript_cache_lookups_total", "Transcript lookups by tier (memory, disk, miss)"
+)
+shared_fetches = metrics.counter(
+    "transcript_cache_shared_fetches_total",
+    "Transcript requests that joined a download already in flight",
+)
+evictions = metrics.counter(
+    "transcript_cache_evictions_total", "Transcripts evicted from disk by reason"
+)
+disk_bytes = metrics.gauge(
+    "transcript_cache_disk_bytes", "Bytes of transcripts stored in the disk cache"
+)
+
+_cache: Optional["TranscriptCache"] = None
+
+
+class TranscriptStore:
+    """Content-addressed on-disk transcript store; blocking, use from threads."""
+
+    MANIFEST = "manifest.json"
+
+    def __init__(self, directory: str, max_bytes: int, ttl: float):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._entries: dict[str, dict] = self._load_manifest()
+        disk_bytes.set(self._total_bytes())
+
+    @staticmethod
+    def key(video_id: str, language: str) -> str:
+        return f"{video_id}:{language}"
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.directory, f"{digest}.srt")
+
+    def _load_manifest(self) -> dict[str, dict]:
+        path = os.path.join(self.directory, self.MANIFEST)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Transcript cache manifest unreadable, starting empty: {e}")
+            return {}
+
+    def _save_manifest(self):
+        path = os.path.join(self.directory, self.MANIFEST)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(self._entries, f)
+        os.replace(path + ".tmp", path)
+
+    def _total_bytes(self) -> int:
+        blobs = {entry["hash"]: entry["size"] for entry in self._entries.values()}
+        return sum(blobs.values())
+
+    def _drop(self, key: str, reason: str):
+        """Forget ``key`` and delete its file unless another entry shares it."""
+        entry = self._entries.pop(key)
+        evictions.inc(reason=reason)
+        if all(other["hash"] != entry["hash"] for other in self._entries.values()):
+            try:
+                os.remove(self._blob_path(entry["hash"]))
+            except FileNotFoundError:
+                pass
+
+    def get(self, video_id: str, language: str) -> Optional[str]:
+        key = self.key(video_id, language)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.time() - entry["stored_at"] > self.ttl:
+                self._drop(key, "ttl")
+                self._save_manifest()
+                disk_bytes.set(self._total_bytes())
+                return None
+            try:
+                with open(self._blob_path(entry["hash"]), "r", encoding="utf-8") as f:
+                    text = f.read()
+            except FileNotFoundError:
+                self._drop(key, "missing")
+                self._save_manifest()
+                return None
+            # Kept in memory only; persisted with the next write
+            entry["last_access"] = time.time()
+            return text
+
+    def put(self, video_id: str, language: str, text: str):
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        key = self.key(video_id, language)
+        with self._lock:
+            path = self._blob_path(digest)
+            if not os.path.exists(path):
+                with open(path + ".tmp", "wb") as f:
+                    f.write(data)
+                os.replace(path + ".tmp", path)
+            if key in self._entries and self._entries[key]["hash"] != digest:
+                self._drop(key, "replaced")
+            now = time.time()
+            self._entries[key] = {
+                "hash": digest,
+                "size": len(data),
+                "stored_at": now,
+                "last_access": now,
+            }
+            self._evict()
+            self._save_manifest()
+            disk_bytes.set(self._total_bytes())
+
+    def _evict(self):
+        now = time.time()
+        for key in [
+            key
+            for key, entry in self._entries.items()
+            if now - entry["stored_at"] > self.ttl
+        ]:
+            self._drop(key, "ttl")
+        by_access = sorted(self._entries, key=lambda k: self._entries[k]["last_access"])
+        while by_access and self._total_bytes() > self.max_bytes:
+            self._drop(by_access.pop(0), "size")
+
+
+class TranscriptCache:
+    """In-memory LRU over a :class:`TranscriptStore`, sharing in-flight downloads."""
+
+    def __init__(
+        self,
+        directory: str = TRANSCRIPT_CACHE_DIR,
+        max_bytes: int = TRANSCRIPT_CACHE_MAX_BYTES,
+        ttl: float = TRANSCRIPT_CACHE_TTL_SECONDS,
+        memory_entries: int = TRANSCRIPT_CACHE_MEMORY_ENTRIES,
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._memory = TTLCache(ttl=ttl, stale_ttl=ttl, max_entries=memory_entries)
+        self._store: Optional[TranscriptStore] = None
+        # (video_id, language) -> running download and the number of waiters
+        self._in_flight: dict[tuple[str, str], tuple[asyncio.Task, list[int]]] = {}
+
+    async def _disk(self) -> TranscriptStore:
+        if self._store is None:
+            store = await asyncio.to_thread(
+                TranscriptStore, self.directory, self.max_bytes, self.ttl
+            )
+            # Another request may have opened the store in the meantime
+            if self._store is None:
+                self._store = store
+        return self._store
+
+    async def get(self, video_id: str, language: str) -> Optional[str]:
+        """The cached transcript, from memory or disk, or ``None``."""
+        key = (video_id, language)
+        text, _ = self._memory.get(key)
+        if text is not None:
+            lookups.inc(tier="memory")
+            return text
+
+        try:
+            store = await self._disk()
+            text = await asyncio.to_thread(store.get, video_id, language)
+        except OSError as e:
+            logger.warning(f"Transcript disk cache unavailable: {e}")
+            text = None
+        if text is not None:
+            lookups.inc(tier="disk")
+            self._memory.set(key, text)
+            return text
+
+        lookups.inc(tier="miss")
+        return None
+
+    async def put(self, video_id: str, language: str, text: str):
+        self._memory.set((video_id, language), text)
+        try:
+            store = await self._disk()
+            await asyncio.to_thread(store.put, video_id, language, text)
+        except OSError as e:
+            logger.warning(f"Could not store transcript of {video_id}: {e}")
+
+    async def _fetch_and_store(
+        self,
+        video_id: str,
+        language: str,
+        fetch: Callable[[], Awaitable[Optional[str]]],
+    ) -> Optional[str]:
+        text = await fetch()
+        if text is not None:
+            await self.put(video_id, language, text)
+        return text
+
+    async def get_or_fetch(
+        self,
+        video_id: str,
+        language: str,
+        fetch: Callable[[], Awaitable[Optional[str]]],
+    ) -> Optional[str]:
+        """The cached transcript, or the stored result of a shared ``fetch()``."""
+        text = await self.get(video_id, language)
+        if text is not None:
+            return text
+
+        key = (video_id, language)
+        if key in self._in_flight:
+            shared_fetches.inc()
+            task, waiters = self._in_flight[key]
+        else:
+            # Detached: the download is shared by every run asking for it
+            task = spawn_detached(self._fetch_and_store(video_id, language, fetch))
+            waiters = [0]
+            self._in_flight[key] = (task, waiters)
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+
+        waiters[0] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if waiters[0] == 1:
+                task.cancel()
+            raise
+        finally:
+            waiters[0] -= 1
+
+
+def get_transcript_cache() -> TranscriptCache:
+    """Return the process-wide transcript cache, creating it on first use."""
+    global _cache
+
+    if _cache is None:
+        _cache = TranscriptCache()
+    return _cache
+
+
+__all__ = ["TranscriptStore", "TranscriptCache", "get_transcript_cache"]
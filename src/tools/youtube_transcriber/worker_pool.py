@@ -0,0 +1,184 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+from src.core.configs import YTDLP_JOB_TIMEOUT, YTDLP_MAX_QUEUE, YTDLP_MAX_WORKERS
+from src.core.utility.metrics import metrics
+from src.tools.chat_runner.run_context import CancelToken, RunCancelled
+
+queue_depth = metrics.gauge(
+    "ytdlp_queue_depth", "yt-dlp jobs waiting for a worker thread"
+)
+active_jobs = metrics.gauge("ytdlp_active_jobs", "yt-dlp jobs currently running")
+queue_wait = metrics.histogram(
+    "ytdlp_queue_wait_seconds", "Time yt-dlp jobs waited for a worker thread"
+)
+job_seconds = metrics.histogram(
+    "ytdlp_job_seconds", "Time from submitting a yt-dlp job to its result"
+)
+jobs = metrics.counter("ytdlp_jobs_total", "yt-dlp jobs by kind and outcome")
+
+T = TypeVar("T")
+
+_pool: Optional["YtDlpPool"] = None
+
+
+class YtDlpPoolBusy(RuntimeError):
+    """Raised when the yt-dlp queue is full and a job is rejected outright."""
+
+
+class JobCancelToken(CancelToken):
+    """Cancel token of a single pool job, also cancelled with its run's token."""
+
+    def __init__(self, parent: Optional[CancelToken] = None):
+        super().__init__()
+        self.parent = parent
+
+    @property
+    def cancelled(self) -> bool:
+        return super().cancelled or (self.parent is not None and self.parent.cancelled)
+
+    def raise_if_cancelled(self):
+        if self.parent is not None:
+            self.parent.raise_if_cancelled()
+        super().raise_if_cancelled()
+
+
+class YtDlpPool:
+    """
+    Bounded pool of worker threads for blocking yt-dlp calls, so network
+    and disk I/O of caption downloads never runs on the event loop.
+
+    At most ``max_workers`` jobs run at once and at most ``max_queue`` wait
+    for a worker; beyond that jobs are rejected with ``YtDlpPoolBusy``
+    instead of piling up. A job that times out, or whose caller is
+    cancelled, is dropped from the queue if it has not started yet, and
+    otherwise aborted through its cancel token at yt-dlp's next progress
+    hook.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = YTDLP_MAX_WORKERS,
+        max_queue: int = YTDLP_MAX_QUEUE,
+        job_timeout: float = YTDLP_JOB_TIMEOUT,
+    ):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.job_timeout = job_timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="yt-dlp"
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+
+    def _move(self, queued: int = 0, running: int = 0):
+        with self._lock:
+            self._queued += queued
+            self._running += running
+            queue_depth.set(self._queued)
+            active_jobs.set(self._running)
+
+    def _submit(
+        self, fn: Callable[..., T], args: tuple, job_token: JobCancelToken
+    ) -> Future:
+        submitted = time.monotonic()
+
+        def job() -> T:
+            self._move(queued=-1, running=1)
+            queue_wait.observe(time.monotonic() - submitted)
+            try:
+                job_token.raise_if_cancelled()
+                return fn(*args, cancel_token=job_token)
+            finally:
+                self._move(running=-1)
+
+        with self._lock:
+            if self._queued >= self.max_queue:
+                raise YtDlpPoolBusy(
+                    f"yt-dlp queue is full ({self._queued} jobs waiting)"
+                )
+            self._queued += 1
+            queue_depth.set(self._queued)
+
+        future = self._executor.submit(job)
+        # A job cancelled before a worker picked it up never runs `job`
+        future.add_done_callback(
+            lambda done: self._move(queued=-1) if done.cancelled() else None
+        )
+        return future
+
+    async def run(
+        self,
+        kind: str,
+        fn: Callable[..., T],
+        *args,
+        cancel_token: Optional[CancelToken] = None,
+        timeout: Optional[float] = None,
+    ) -> T:
+        """
+        Run ``fn(*args, cancel_token=...)`` on a worker thread and return its
+        result. ``fn`` receives a token that is cancelled with
+        ``cancel_token``, on timeout and when the awaiting task is cancelled.
+
+        ``timeout`` (default ``job_timeout``) covers the wait for a worker as
+        well as the job itself; ``kind`` labels the job's metrics.
+        """
+        timeout = self.job_timeout if timeout is None else timeout
+        job_token = JobCancelToken(cancel_token)
+        started = time.monotonic()
+        try:
+            future = self._submit(fn, args, job_token)
+        except YtDlpPoolBusy:
+            jobs.inc(kind=kind, outcome="rejected")
+            raise
+
+        outcome = "error"
+        try:
+            result = await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+            outcome = "ok"
+            return result
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            job_token.cancel("timed out")
+            raise TimeoutError(f"yt-dlp {kind} job timed out after {timeout:g}s")
+        except (asyncio.CancelledError, RunCancelled):
+            outcome = "cancelled"
+            job_token.cancel("cancelled")
+            raise
+        finally:
+            jobs.inc(kind=kind, outcome=outcome)
+            job_seconds.observe(time.monotonic() - started, kind=kind)
+
+    def shutdown(self):
+        """Stop the workers; queued jobs are cancelled, running ones finish."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def get_ytdlp_pool() -> YtDlpPool:
+    """Return the process-wide yt-dlp pool, creating it on first use."""
+    global _pool
+
+    if _pool is None:
+        _pool = YtDlpPool()
+    return _pool
+
+
+def close_ytdlp_pool():
+    """Shut the yt-dlp pool down; a later job starts a new one."""
+    global _pool
+
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
+
+
+__all__ = [
+    "YtDlpPoolBusy",
+    "JobCancelToken",
+    "YtDlpPool",
+    "get_ytdlp_pool",
+    "close_ytdlp_pool",
+]
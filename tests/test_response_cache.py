@@ -0,0 +1,59 @@
+import asyncio
+import os
+
+os.environ.setdefault("CREDENTIALS", "{}")
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+from qdrant_client import QdrantClient, models  # noqa: E402
+from src.services.qdrant.response_cache import (  # noqa: E402
+    SemanticResponseCache,
+    lecture_scope,
+    response_scope,
+)
+
+VECTOR = [1.0] + [0.0] * 1535
+
+
+def make_cache() -> SemanticResponseCache:
+    cache = SemanticResponseCache(QdrantClient(":memory:"), collection_name="test")
+    cache.ensure_collection()
+    return cache
+
+
+def count(cache: SemanticResponseCache, scope: str) -> int:
+    return cache.client.count(
+        cache.collection_name,
+        count_filter=models.Filter(
+            must=[
+                models.FieldCondition(key="scope", match=models.MatchValue(value=scope))
+            ]
+        ),
+        exact=True,
+    ).count
+
+
+def test_invalidate_scope_drops_only_that_scope():
+    cache = make_cache()
+    old, new = lecture_scope("lecture-1", "v1"), lecture_scope("lecture-1", "v2")
+
+    async def run():
+        await cache.store("what is a gradient", old, "old", VECTOR, "lecture-1")
+        await cache.store("what is a gradient", new, "new", VECTOR, "lecture-1")
+        await cache.invalidate_scope(old)
+
+    asyncio.run(run())
+    assert count(cache, old) == 0
+    assert count(cache, new) == 1
+
+
+def test_ensure_collection_is_idempotent():
+    cache = make_cache()
+    cache.ensure_collection()
+    assert cache.client.collection_exists(cache.collection_name)
+
+
+def test_lecture_chat_without_material_has_no_scope():
+    state = {"lecture_id": "lecture-1", "yt_scraped_data": None}
+    assert response_scope(state) is None
+    assert response_scope({"video_url": "abc", "yt_scraped_data": None}) is None
+    assert response_scope({"yt_scraped_data": None}) is not None